@@ -0,0 +1,228 @@
+import argparse
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
+
+try:
+    from .editions import PRIMARY_EDITION, edition_path  # if run as a module
+    from .json_codec import FINAL_FIELDS, TAG_FIELDS, coerce_list, dumps, read_json, to_final_schema
+    from .problem_record import CATEGORICAL_FIELDS
+    from .results_repository import ResultsRepository
+    from .results_writer import RESULTS_FILE, _record_key, atomic_write_json
+except ImportError:
+    from editions import PRIMARY_EDITION, edition_path  # if run directly from backend/
+    from json_codec import FINAL_FIELDS, TAG_FIELDS, coerce_list, dumps, read_json, to_final_schema
+    from problem_record import CATEGORICAL_FIELDS
+    from results_repository import ResultsRepository
+    from results_writer import RESULTS_FILE, _record_key, atomic_write_json
+
+# Parquet dataset for notebooks, written after each pipeline run (needs pyarrow)
+ANALYTICS_DIR = os.environ.get("ANALYTICS_DIR", "analytics")
+ANALYTICS_EXPORT = os.environ.get("ANALYTICS_EXPORT", "1") != "0"
+# Directory levels of the dataset: analytics/edition=<edition>/theme=<theme>/part-*.parquet
+PARTITION_FIELDS = ['edition', 'theme']
+# PS IDs in the dataset per edition, with their theme partition and a digest of their exported
+# columns (files starting with '_' are skipped by dataset readers)
+MANIFEST_NAME = '_exported.json'
+
+
+def _category(value) -> Optional[str]:
+    """One categorical value; a tag list such as ['Easy', 'Med'] becomes 'Easy, Med'."""
+    if isinstance(value, list):
+        value = ', '.join(coerce_list(value))
+    return str(value) if value not in (None, '') else None
+
+
+def arrow_schema():
+    """Categorical columns are dictionary-encoded and tag columns are lists of strings."""
+    fields = []
+    for name in FINAL_FIELDS + ['edition']:
+        if name in TAG_FIELDS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        elif name in PARTITION_FIELDS:
+            # Stored in the directory names rather than in the files
+            fields.append(pa.field(name, pa.string()))
+        elif name in CATEGORICAL_FIELDS:
+            fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    fields.append(pa.field('submission_count', pa.int64()))
+    return pa.schema(fields)
+
+
+def _partition_theme(record: Dict) -> Optional[str]:
+    """The theme partition a record is written to (as columns() stores it)."""
+    return _category(to_final_schema(record)['theme'])
+
+
+def _digest(record: Dict) -> str:
+    """Fingerprint of everything the dataset stores for a record."""
+    count = record.get('submission_count')
+    data = dumps([to_final_schema(record), count if isinstance(count, int) and not isinstance(count, bool) else None], indent=None)
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def columns(records: Iterable[Dict], edition: str) -> Dict[str, List]:
+    """Column lists (final schema plus edition and submission_count) for a batch of records."""
+    cols: Dict[str, List] = {name: [] for name in FINAL_FIELDS + ['edition', 'submission_count']}
+    for record in records:
+        final = to_final_schema(record)
+        for name in FINAL_FIELDS:
+            value = final[name]
+            if name in TAG_FIELDS:
+                cols[name].append(value)
+            elif name in CATEGORICAL_FIELDS:
+                cols[name].append(_category(value))
+            else:
+                cols[name].append(value if isinstance(value, str) else str(value))
+        cols['edition'].append(edition)
+        count = record.get('submission_count')
+        cols['submission_count'].append(count if isinstance(count, int) and not isinstance(count, bool) else None)
+    return cols
+
+
+class AnalyticsExporter:
+    """
+    Columnar Parquet copy of the classified problems for analytics.
+
+    The dataset is hive-partitioned by edition and theme
+    (analytics/edition=sih2025/theme=.../part-*.parquet), so
+    pyarrow.dataset / pandas.read_parquet can load one edition or theme
+    without reading the rest. update() appends part files for PS IDs that
+    are not in the dataset yet. It rewrites the theme partitions of
+    exported problems that changed since (a re-classified 'modified'
+    problem, a refreshed submission count) or that were removed. The
+    manifest (see MANIFEST_NAME) records each exported ID's partition and
+    digest.
+    """
+
+    def __init__(self, root: str = ANALYTICS_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    @staticmethod
+    def available() -> bool:
+        return pa is not None
+
+    def _manifest(self) -> Dict:
+        try:
+            return read_json(self.manifest_path)
+        except (OSError, ValueError):
+            return {'editions': {}}
+
+    def exported(self, edition: str) -> Optional[Dict[str, Dict]]:
+        """PS ID -> {'theme', 'digest'} for the edition, or None if it has no usable manifest entry."""
+        entries = self._manifest().get('editions', {}).get(edition)
+        # Manifests written before digests were kept hold a bare list of PS IDs
+        return entries if isinstance(entries, dict) else None
+
+    def _write(self, records: List[Dict], edition: str, replace: bool = False) -> None:
+        """Write records as new part files; replace=True first deletes the partitions they go to."""
+        table = pa.Table.from_pydict(columns(records, edition), schema=arrow_schema())
+        partitioning = ds.partitioning(pa.schema([pa.field(name, pa.string()) for name in PARTITION_FIELDS]),
+                                       flavor='hive')
+        ds.write_dataset(table, self.root, format='parquet', partitioning=partitioning,
+                         basename_template=f"part-{time.strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+                         existing_data_behavior='delete_matching' if replace else 'overwrite_or_ignore')
+
+    def _save_exported(self, edition: str, records: Dict[str, Dict]) -> None:
+        manifest = self._manifest()
+        manifest.setdefault('editions', {})[edition] = {
+            key: {'theme': _partition_theme(record), 'digest': _digest(record)} for key, record in records.items()}
+        manifest['updated_at'] = time.time()
+        atomic_write_json(self.manifest_path, manifest)
+
+    def _require(self) -> None:
+        if not self.available():
+            raise RuntimeError("pyarrow is not installed; pip install pyarrow to export Parquet")
+
+    def update(self, records: Iterable[Dict], edition: str = PRIMARY_EDITION) -> Tuple[int, int]:
+        """Bring the edition's data up to date with records; returns (records appended, records rewritten)."""
+        self._require()
+        current = {_record_key(r): r for r in records if isinstance(r, dict)}
+        exported = self.exported(edition)
+        if exported is None:
+            return self.rebuild(current.values(), edition), 0
+        changed = {key for key, record in current.items()
+                   if key in exported and exported[key].get('digest') != _digest(record)}
+        removed = set(exported) - set(current)
+        themes = {exported[key].get('theme') for key in changed | removed}
+        themes |= {_partition_theme(current[key]) for key in changed}
+        rewritten: List[Dict] = []
+        if themes:
+            rewritten = [r for r in current.values() if _partition_theme(r) in themes]
+            if {_partition_theme(r) for r in rewritten} != themes:
+                # A theme lost its last problem; its partition has nothing to be replaced with
+                return 0, self.rebuild(current.values(), edition)
+            self._write(rewritten, edition, replace=True)
+        new = [r for key, r in current.items() if key not in exported and _partition_theme(r) not in themes]
+        if new:
+            self._write(new, edition)
+        if new or rewritten:
+            self._save_exported(edition, current)
+        return len(new), len(rewritten)
+
+    def rebuild(self, records: Iterable[Dict], edition: str = PRIMARY_EDITION) -> int:
+        """Replace an edition's part of the dataset with the given records; returns how many were written."""
+        self._require()
+        current = {_record_key(r): r for r in records if isinstance(r, dict)}
+        shutil.rmtree(os.path.join(self.root, f"edition={edition}"), ignore_errors=True)
+        if current:
+            self._write(list(current.values()), edition)
+        self._save_exported(edition, current)
+        return len(current)
+
+
+def export_analytics(records: Iterable[Dict], edition: str = PRIMARY_EDITION, root: str = ANALYTICS_DIR) -> int:
+    """Pipeline stage: add new problems to the Parquet dataset and rewrite changed ones (skipped without pyarrow)."""
+    if not ANALYTICS_EXPORT:
+        return 0
+    exporter = AnalyticsExporter(root)
+    if not exporter.available():
+        print("ℹ️  pyarrow not installed; skipping the Parquet analytics export")
+        return 0
+    try:
+        added, rewritten = exporter.update(records, edition)
+        print(f"📊 Analytics dataset in {root}: {added} new problems appended, {rewritten} rewritten in changed partitions")
+        return added + rewritten
+    except Exception as e:
+        print(f"⚠️  Analytics export failed: {e}")
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export classified problems to a partitioned Parquet dataset')
+    parser.add_argument('--edition', type=str, default=PRIMARY_EDITION, help=f"Edition to export (default: {PRIMARY_EDITION})")
+    parser.add_argument('--results-file', type=str, help='Results file to read (default: the edition\'s results file)')
+    parser.add_argument('--output', type=str, default=ANALYTICS_DIR, help=f"Dataset directory (default: {ANALYTICS_DIR})")
+    parser.add_argument('--rebuild', action='store_true', help='Rewrite all of the edition\'s data instead of only new and changed PS IDs')
+    args = parser.parse_args()
+
+    exporter = AnalyticsExporter(args.output)
+    if not exporter.available():
+        print("❌ pyarrow is not installed. Install with: pip install pyarrow")
+        return
+    results_file = args.results_file or edition_path(RESULTS_FILE, args.edition)
+    repository = ResultsRepository.for_path(results_file)
+    if not repository.exists():
+        print(f"❌ Results file not found: {results_file}")
+        return
+    if args.rebuild:
+        count = exporter.rebuild(repository.stream(), args.edition)
+        print(f"✅ Rebuilt {args.output} for {args.edition} with {count} problems")
+    else:
+        added, rewritten = exporter.update(repository.stream(), args.edition)
+        print(f"✅ Updated {args.output} from {results_file}: {added} new problems, {rewritten} rewritten")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+try:
+    from .json_codec import dumps, loads, read_json  # if run as a module
+    from .results_writer import ResultsJournal, atomic_write_bytes, atomic_write_json, is_ndjson, write_records
+except ImportError:
+    from json_codec import dumps, loads, read_json  # if run directly from backend/
+    from results_writer import ResultsJournal, atomic_write_bytes, atomic_write_json, is_ndjson, write_records
+
+# Backup location and how many deltas may be chained before a full copy is stored again
+BACKUP_DIR = os.environ.get("BACKUP_DIR", "backups")
+BACKUP_FULL_EVERY = int(os.environ.get("BACKUP_FULL_EVERY", "20"))
+
+
+def _serialize(records: List[Dict]) -> bytes:
+    """Canonical bytes of a results list (the layout results.json is written in)."""
+    return dumps(records, indent=2)
+
+
+def _record_key(record: Dict) -> str:
+    return str(record.get('ps_id') or record.get('ps_code') or f"alt:{record.get('title', '')}")
+
+
+def _apply_patch(record: Dict, patch: Dict) -> Dict:
+    patched = {k: v for k, v in record.items() if k not in patch.get('unset', [])}
+    patched.update(patch.get('set', {}))
+    return patched
+
+
+def _diff_record(old: Dict, new: Dict) -> Optional[Dict]:
+    """Field-level patch turning old into new, or None if the patch would not reproduce new exactly."""
+    patch = {'set': {k: v for k, v in new.items() if k not in old or old[k] != v},
+             'unset': [k for k in old if k not in new]}
+    patched = _apply_patch(old, patch)
+    # Key order is part of the serialized bytes
+    return patch if list(patched) == list(new) else None
+
+
+class BackupStore:
+    """
+    Content-addressed, deduplicated backups of results.json.
+
+    Every version is identified by the SHA-256 of its contents, so backing
+    up an unchanged file stores nothing new. A new version is stored as a
+    gzip-compressed record-level delta against the previous one: new records,
+    field patches for changed ones and the record order. Every BACKUP_FULL_EVERY
+    versions a full copy starts a new chain. index.json lists the backups.
+    """
+
+    def __init__(self, backup_dir: str = BACKUP_DIR):
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, 'objects')
+        self.index_path = os.path.join(backup_dir, 'index.json')
+
+    # -------------------- Index and objects --------------------
+    def entries(self) -> List[Dict]:
+        """Backups, oldest first."""
+        try:
+            return read_json(self.index_path)
+        except (OSError, ValueError):
+            return []
+
+    def _save_entries(self, entries: List[Dict]) -> None:
+        atomic_write_json(self.index_path, entries)
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, f"{sha256}.json.gz")
+
+    def _read_object(self, sha256: str) -> Dict:
+        with open(self._object_path(sha256), 'rb') as f:
+            return loads(gzip.decompress(f.read()))
+
+    def _write_object(self, sha256: str, obj: Dict) -> int:
+        data = gzip.compress(dumps(obj, indent=None), compresslevel=9)
+        atomic_write_bytes(self._object_path(sha256), data)
+        return len(data)
+
+    def _chain_length(self, sha256: str) -> int:
+        length = 0
+        while True:
+            obj = self._read_object(sha256)
+            if obj['type'] == 'full':
+                return length
+            sha256, length = obj['base'], length + 1
+
+    def resolve(self, ref: str) -> Dict:
+        """Backup entry for a ref: 'latest', an index into `list`, or a SHA-256 prefix."""
+        entries = self.entries()
+        if not entries:
+            raise LookupError(f"No backups in {self.backup_dir}")
+        if ref == 'latest':
+            return entries[-1]
+        if ref.isdigit() and len(ref) < 6:
+            return entries[int(ref)]
+        matches = {e['sha256'] for e in entries if e['sha256'].startswith(ref)}
+        if len(matches) != 1:
+            raise LookupError(f"{'Ambiguous' if matches else 'Unknown'} backup reference: {ref}")
+        return next(e for e in reversed(entries) if e['sha256'] in matches)
+
+    def load(self, sha256: str) -> List[Dict]:
+        """Rebuild the records of a stored version by applying its delta chain."""
+        obj = self._read_object(sha256)
+        if obj['type'] == 'full':
+            return obj['records']
+        base = {_record_key(r): r for r in self.load(obj['base'])}
+        for key, patch in obj['patches'].items():
+            base[key] = _apply_patch(base[key], patch)
+        base.update(obj['records'])
+        return [base[key] for key in obj['order']]
+
+    # -------------------- Commands --------------------
+    def create(self, records: List[Dict], source: str = 'results.json', created_at: Optional[float] = None) -> Dict:
+        """Back up a results list; returns its index entry (stores nothing new if the content is known)."""
+        content = _serialize(records)
+        sha256 = hashlib.sha256(content).hexdigest()
+        entries = self.entries()
+        entry = {'sha256': sha256, 'created_at': created_at if created_at is not None else time.time(),
+                 'source': source, 'records': len(records), 'bytes': len(content), 'stored_bytes': 0}
+        if entries and entries[-1]['sha256'] == sha256:
+            return {**entries[-1], 'kind': 'unchanged', 'stored_bytes': 0}
+
+        if not os.path.exists(self._object_path(sha256)):
+            keys = [_record_key(r) for r in records]
+            parent = entries[-1]['sha256'] if entries else None
+            obj = {'type': 'full', 'records': records}
+            # Duplicate keys cannot be expressed as a keyed delta
+            if parent and len(set(keys)) == len(keys) and self._chain_length(parent) + 1 < BACKUP_FULL_EVERY:
+                previous = {_record_key(r): r for r in self.load(parent)}
+                obj = {'type': 'delta', 'base': parent, 'order': keys, 'patches': {}, 'records': {}}
+                for key, record in zip(keys, records):
+                    old = previous.get(key)
+                    if old == record:
+                        continue
+                    patch = _diff_record(old, record) if old is not None else None
+                    if patch is not None:
+                        obj['patches'][key] = patch
+                    else:
+                        obj['records'][key] = record
+            entry['stored_bytes'] = self._write_object(sha256, obj)
+            entry['kind'] = obj['type']
+        else:
+            entry['kind'] = 'duplicate'
+        entries.append(entry)
+        self._save_entries(entries)
+        return entry
+
+    def create_from_file(self, results_path: str = 'results.json') -> Optional[Dict]:
+        """Back up results.json as it currently reads (including pending journal changes)."""
+        if not os.path.exists(results_path):
+            return None
+        return self.create(ResultsJournal(results_path).load(), source=os.path.basename(results_path))
+
+    def restore(self, ref: str, output_path: str = 'results.json') -> Dict:
+        """Write a backed-up version to output_path; returns its index entry."""
+        entry = self.resolve(ref)
+        content = _serialize(self.load(entry['sha256']))
+        if hashlib.sha256(content).hexdigest() != entry['sha256']:
+            raise ValueError(f"Backup {entry['sha256'][:12]} failed its checksum")
+        if is_ndjson(output_path):
+            write_records(output_path, self.load(entry['sha256']))
+        else:
+            atomic_write_bytes(output_path, content)
+        # Pending journal changes belong to the file that was just replaced
+        ResultsJournal(output_path).clear()
+        return entry
+
+    def prune(self, keep: int = 10, older_than_days: Optional[float] = None) -> int:
+        """Drop all but the newest `keep` backups (optionally only those older than N days); returns objects removed."""
+        entries = self.entries()
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        kept = [e for i, e in enumerate(entries)
+                if i >= len(entries) - keep or (cutoff is not None and e['created_at'] >= cutoff)]
+        # The oldest kept version becomes a full copy, so the chain behind it can go
+        if kept and self._read_object(kept[0]['sha256'])['type'] == 'delta':
+            self._write_object(kept[0]['sha256'], {'type': 'full', 'records': self.load(kept[0]['sha256'])})
+        # A kept delta still needs every object down to its full copy
+        live = set()
+        for e in kept:
+            sha256 = e['sha256']
+            while sha256 not in live:
+                live.add(sha256)
+                obj = self._read_object(sha256)
+                if obj['type'] == 'full':
+                    break
+                sha256 = obj['base']
+        removed = 0
+        for path in glob.glob(os.path.join(self.objects_dir, '*.json.gz')):
+            if os.path.basename(path)[:-len('.json.gz')] not in live:
+                os.remove(path)
+                removed += 1
+        self._save_entries(kept)
+        return removed
+
+
+def _legacy_timestamp(path: str) -> float:
+    match = re.search(r'backup_(\d{8}_\d{6})$', path)
+    return time.mktime(time.strptime(match.group(1), '%Y%m%d_%H%M%S')) if match else os.path.getmtime(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deduplicated backups of results.json')
+    sub = parser.add_subparsers(dest='command', required=True)
+    create = sub.add_parser('create', help='Back up a results file')
+    create.add_argument('results_file', nargs='?', default='results.json')
+    sub.add_parser('list', help='List backups')
+    restore = sub.add_parser('restore', help="Restore a backup ('latest', a list index or a SHA-256 prefix)")
+    restore.add_argument('ref')
+    restore.add_argument('--output', default='results.json', help='File to write (default: results.json)')
+    prune = sub.add_parser('prune', help='Delete old backups')
+    prune.add_argument('--keep', type=int, default=10, help='Newest backups to keep (default: 10)')
+    prune.add_argument('--older-than', type=float, default=None, help='Only delete backups older than this many days')
+    legacy = sub.add_parser('import-legacy', help='Import results.json.backup_* copies, oldest first')
+    legacy.add_argument('pattern', nargs='?', default='results.json.backup_*')
+    args = parser.parse_args()
+
+    store = BackupStore()
+    if args.command == 'create':
+        entry = store.create_from_file(args.results_file)
+        if entry is None:
+            print(f"❌ Results file not found: {args.results_file}")
+        else:
+            print(f"💾 Backup {entry['sha256'][:12]} ({entry['kind']}, {entry['stored_bytes']} bytes stored)")
+    elif args.command == 'list':
+        entries = store.entries()
+        for i, e in enumerate(entries):
+            print(f"{i:>3}  {e['sha256'][:12]}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e['created_at']))}  "
+                  f"{e['records']:>5} records  {e.get('kind', ''):<9} {e['bytes'] / 1024:>7.0f} KB -> {e['stored_bytes'] / 1024:.1f} KB  {e['source']}")
+        total = sum(e['bytes'] for e in entries)
+        stored = sum(os.path.getsize(p) for p in glob.glob(os.path.join(store.objects_dir, '*.json.gz')))
+        print(f"📦 {len(entries)} backups, {total / 1024:.0f} KB of results stored in {stored / 1024:.0f} KB")
+    elif args.command == 'restore':
+        entry = store.restore(args.ref, args.output)
+        print(f"✅ Restored backup {entry['sha256'][:12]} ({entry['records']} records) to {args.output}")
+    elif args.command == 'prune':
+        removed = store.prune(keep=args.keep, older_than_days=args.older_than)
+        print(f"🧹 Removed {removed} backup objects; {len(store.entries())} backups kept")
+    elif args.command == 'import-legacy':
+        for path in sorted(glob.glob(args.pattern), key=_legacy_timestamp):
+            records = read_json(path)
+            entry = store.create(records, source=os.path.basename(path), created_at=_legacy_timestamp(path))
+            print(f"📥 {path} -> {entry['sha256'][:12]} ({entry['kind']}, {entry['stored_bytes']} bytes)")
+
+
+if __name__ == "__main__":
+    main()
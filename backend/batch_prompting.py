@@ -0,0 +1,87 @@
+import json
+from typing import Callable, Dict, List, Tuple
+
+# Keys every classification must have (besides ps_id)
+CLASSIFICATION_KEYS = ['summary', 'difficulty', 'technology', 'stakeholders', 'impact_area',
+                       'data_resource_type', 'solution_type']
+LIST_KEYS = ['technology', 'stakeholders', 'impact_area', 'data_resource_type']
+
+
+def strip_code_fences(text: str) -> str:
+    """Model output without the ```json fences some models wrap it in."""
+    text = text.strip()
+    if "```" in text:
+        if "```json" in text:
+            text = text.split("```json")[-1].split("```")[0].strip()
+        else:
+            text = text.split("```")[-2].strip()
+    return text
+
+
+def pack_problems(problems: List[Dict], item_tokens: Callable[[Dict], int], overhead_tokens: int,
+                  input_budget: int, output_per_item: int, output_budget: int, max_items: int) -> List[List[Dict]]:
+    """Split problems into consecutive groups that each fit one request.
+
+    A group grows while the shared prompt (overhead_tokens) plus its
+    problems stays within input_budget, the expected answers stay within
+    output_budget, and it has at most max_items problems. A problem too
+    large for any group goes alone.
+    """
+    max_items = max(1, min(max_items, output_budget // max(1, output_per_item)))
+    groups: List[List[Dict]] = []
+    group: List[Dict] = []
+    used = overhead_tokens
+    for problem in problems:
+        tokens = item_tokens(problem)
+        if group and (len(group) >= max_items or used + tokens > input_budget):
+            groups.append(group)
+            group, used = [], overhead_tokens
+        group.append(problem)
+        used += tokens
+    if group:
+        groups.append(group)
+    return groups
+
+
+def is_valid_classification(item) -> bool:
+    """Whether one answered item has every classification key with a usable type."""
+    if not isinstance(item, dict) or not item.get('ps_id'):
+        return False
+    if any(key not in item for key in CLASSIFICATION_KEYS):
+        return False
+    if not isinstance(item['summary'], str) or not item['summary'].strip():
+        return False
+    for key in LIST_KEYS:
+        if not isinstance(item[key], list) or not all(isinstance(v, str) for v in item[key]):
+            return False
+    return all(isinstance(item[key], (str, list)) for key in ('difficulty', 'solution_type'))
+
+
+def parse_batch_response(text: str, problems: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Match a batched answer to its problems; returns (valid classifications, problems to retry alone).
+
+    The answer should be a JSON array of objects keyed by ps_id; an object
+    mapping ps_id -> classification is accepted too. Items for unknown or
+    repeated PS IDs are ignored, and a problem whose item is missing or
+    invalid is returned for a single retry.
+    """
+    by_id = {str(p.get('ps_id')): p for p in problems}
+    try:
+        data = json.loads(strip_code_fences(text or ''))
+    except ValueError:
+        return [], list(problems)
+    if isinstance(data, dict):
+        items = data.get('results') if isinstance(data.get('results'), list) else \
+            [dict(v, ps_id=k) for k, v in data.items() if isinstance(v, dict)]
+    else:
+        items = data if isinstance(data, list) else []
+    results: Dict[str, Dict] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        ps_id = str(item.get('ps_id', ''))
+        if ps_id in by_id and ps_id not in results and is_valid_classification(item):
+            # Same ps_id value (and type) as the problem, like single classifications
+            results[ps_id] = dict(item, ps_id=by_id[ps_id].get('ps_id'))
+    missing = [p for key, p in by_id.items() if key not in results]
+    return list(results.values()), missing
@@ -0,0 +1,89 @@
+import argparse
+import html
+import json
+import re
+import sys
+import time
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from html_parsers import available_backends, get_parser_backend
+from scraper import SIHScraper
+
+# Ways a description's line breaks and inline markup show up in the listing modals
+VARIANTS = [
+    lambda text: text.replace('\n', '<br>'),
+    lambda text: text.replace('\n', '<br/>'),
+    lambda text: text.replace('\n\n', '<br />\r\n<br />'),
+    lambda text: text.replace('\n\n', '<br><br class="gap">').replace('•', '<b>&bull;</b>&nbsp;'),
+    lambda text: '<p>' + text.replace('\n\n', '</p><!-- para <br> --><p>') + '</p>',
+    lambda text: text.replace('\n', '<br>').replace('. ', '.<template><p>row<br>copy</p></template> '),
+]
+
+
+def legacy_clean_html_text(element) -> str:
+    """The previous implementation: serialize, regex-replace <br>, re-parse with html.parser."""
+    if not element:
+        return ""
+    html_content = str(element)
+    html_content = re.sub(r'<br\s*/?>', '\n', html_content)
+    soup = BeautifulSoup(html_content, 'html.parser')
+    text = soup.get_text()
+    text = re.sub(r'\n+', '\n\n', text)
+    return text.strip()
+
+
+def build_fragments(records: List[Dict]) -> str:
+    """One style-2 description div per record and markup variant."""
+    divs = []
+    for record in records:
+        escaped = html.escape(str(record.get('description') or ''), quote=False)
+        for variant in VARIANTS:
+            divs.append(f'<div class="style-2">{variant(escaped)}</div>')
+    return '<html><body>' + '\n'.join(divs) + '</body></html>'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Golden check and micro-benchmark for SIHScraper.clean_html_text')
+    parser.add_argument('--results-file', type=str, default='results.json', help='Records whose descriptions are used as input')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per implementation (best time is reported)')
+    args = parser.parse_args()
+
+    with open(args.results_file, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    page = build_fragments(records)
+
+    scraper = SIHScraper(use_cache=False)
+    failures = 0
+    for name in available_backends():
+        elements = get_parser_backend(name).parse(page).find_all('div', class_='style-2')
+        expected = [legacy_clean_html_text(el) for el in elements]
+        actual = [scraper.clean_html_text(el) for el in elements]
+        mismatches = [i for i, (a, b) in enumerate(zip(expected, actual)) if a != b]
+        failures += len(mismatches)
+        status = '✅ identical' if not mismatches else f'❌ {len(mismatches)} mismatches'
+        print(f"{name:<12} {len(elements)} descriptions: {status}")
+        for i in mismatches[:3]:
+            print(f"   #{i}: expected {expected[i][:80]!r}")
+            print(f"   #{i}:   actual {actual[i][:80]!r}")
+
+        timings = {}
+        for label, fn in (('re-parse', legacy_clean_html_text), ('tree walk', scraper.clean_html_text)):
+            best = None
+            for _ in range(max(1, args.repeat)):
+                start = time.perf_counter()
+                for el in elements:
+                    fn(el)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = best
+        print(f"{'':<12} re-parse {timings['re-parse'] * 1000:.1f} ms, tree walk {timings['tree walk'] * 1000:.1f} ms "
+              f"({timings['re-parse'] / timings['tree walk']:.1f}x faster)")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
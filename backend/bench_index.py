@@ -0,0 +1,83 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bench_records import write_dataset
+from problem_store import _numeric_id
+from results_index import ResultsIndex
+from results_writer import ResultsJournal, iter_records, write_records
+from synthetic_listing import load_corpus
+
+
+def scan_get(path: str, num: int):
+    """A single-record read without an index: parse lines until the PS ID turns up."""
+    for record in iter_records(path):
+        if _numeric_id(record.get('ps_id')) == num:
+            return record
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-record and range reads of an NDJSON results file, full scan vs offset index')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic records (default: 100000)')
+    parser.add_argument('--lookups', type=int, default=1000, help='Random single-record reads through the index (default: 1000)')
+    parser.add_argument('--corpus', type=str, default='results.json', help='Records whose text and tags are reused')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    directory = tempfile.mkdtemp(prefix='sih_index_')
+    array_path = os.path.join(directory, f"records_{args.count}.json")
+    path = os.path.join(directory, f"records_{args.count}.ndjson")
+    write_dataset(array_path, args.count, load_corpus(args.corpus, rng), rng)
+    write_records(path, iter_records(array_path))
+    os.remove(array_path)
+    print(f"🧪 {args.count} synthetic records, {os.path.getsize(path) / (1024 * 1024):.0f} MB of NDJSON ({path})")
+
+    index = ResultsIndex(path)
+    start = time.perf_counter()
+    index.rebuild()
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    len(index)
+    open_time = time.perf_counter() - start
+
+    ids = [30000 + rng.randrange(args.count) for _ in range(args.lookups)]
+    start = time.perf_counter()
+    found = [index.get(num) for num in ids]
+    indexed = (time.perf_counter() - start) / len(ids)
+    sample = ids[:5]
+    start = time.perf_counter()
+    scanned = [scan_get(path, num) for num in sample]
+    scan = (time.perf_counter() - start) / len(sample)
+    ok = all(r is not None for r in found) and scanned == found[:5]
+
+    low = 30000 + args.count // 2
+    start = time.perf_counter()
+    window = list(index.range(low, low + 99))
+    range_time = time.perf_counter() - start
+    ok = ok and [_numeric_id(r['ps_id']) for r in window] == list(range(low, min(low + 100, 30000 + args.count)))
+
+    # Pending journal entries are overlaid on every read; that must not cost a pass over the file
+    ResultsJournal(path).append([{'op': 'set', 'ps_id': found[0]['ps_id'], 'fields': {'submission_count': -1}}])
+    start = time.perf_counter()
+    journaled = [index.get(num) for num in ids]
+    with_journal = (time.perf_counter() - start) / len(ids)
+    ok = ok and journaled[0]['submission_count'] == -1 and journaled[1:] == [
+        r if r['ps_id'] != found[0]['ps_id'] else dict(r, submission_count=-1) for r in found[1:]]
+
+    print(f"{'index build (one scan)':<28} {build:>10.3f} s")
+    print(f"{'index open (mmap)':<28} {open_time * 1000:>10.3f} ms")
+    print(f"{'get, full scan':<28} {scan * 1000:>10.3f} ms")
+    print(f"{'get, index':<28} {indexed * 1000:>10.3f} ms  ({scan / indexed:.0f}x)")
+    print(f"{'range of 100 PS IDs, index':<28} {range_time * 1000:>10.3f} ms")
+    print(f"{'get, index + journal':<28} {with_journal * 1000:>10.3f} ms  {'✅' if ok else '❌'}")
+    index.close()
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import json_codec
+from bench_records import write_dataset
+from json_codec import BACKENDS, available_backends, to_final_schema
+from synthetic_listing import load_corpus
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_file(path: str, label: str, repeat: int) -> None:
+    with open(path, 'rb') as f:
+        data = f.read()
+    records = json.loads(data)
+    reference = json.dumps(records, indent=2, ensure_ascii=False).encode('utf-8')
+    normalized = [to_final_schema(r) for r in records]
+    print(f"\n📄 {label}: {len(records)} records, {len(data) / (1024 * 1024):.1f} MB")
+    print(f"{'backend':>10} {'load (s)':>9} {'dump (s)':>9} {'typed load (s)':>15}  same bytes")
+    for name in available_backends():
+        backend = BACKENDS[name]
+        json_codec._backend = backend
+        load = best_of(lambda: backend.loads(data), repeat)
+        dump = best_of(lambda: backend.dumps(records, indent=2), repeat)
+        typed = best_of(lambda: json_codec.decode_final_records(data), repeat)
+        same = backend.dumps(records, indent=2) == reference
+        schema_ok = [{k: v for k, v in r.items() if k != 'submission_count'} for r in json_codec.decode_final_records(data)] == normalized
+        print(f"{name:>10} {load:>9.3f} {dump:>9.3f} {typed:>15.3f}  {'✅' if same else '❌'}{'' if schema_ok else ' (schema mismatch)'}")
+    json_codec._backend = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load/dump timings of the JSON backends on results.json and a synthetic file')
+    parser.add_argument('--results', type=str, default='results.json', help='Real results file to time')
+    parser.add_argument('--count', type=int, default=100000, help='Records in the synthetic file (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs (default: 3)')
+    args = parser.parse_args()
+
+    print(f"🧩 JSON backends available: {', '.join(available_backends())}")
+    if os.path.exists(args.results):
+        bench_file(args.results, args.results, args.repeat)
+    if args.count:
+        path = os.path.join(tempfile.mkdtemp(prefix='sih_json_'), f"records_{args.count}.json")
+        write_dataset(path, args.count, load_corpus(args.results, random.Random(0)), random.Random(0))
+        # Same layout as results.json
+        with open(path, 'rb') as f:
+            records = json.loads(f.read())
+        with open(path, 'wb') as f:
+            f.write(json.dumps(records, indent=2, ensure_ascii=False).encode('utf-8'))
+        del records
+        bench_file(path, f"synthetic ({args.count})", args.repeat)
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from model_pool import ModelPool
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+# Body of a generateContent response with one classification, as the REST API returns it
+MOCK_RESPONSE = json.dumps({
+    "candidates": [{
+        "content": {"parts": [{"text": json.dumps({
+            "summary": "Mock summary.", "difficulty": "Med", "technology": ["Web Development"],
+            "stakeholders": ["Citizens"], "impact_area": ["Accessibility"], "data_resource_type": [],
+            "solution_type": "Web Solutions"})}], "role": "model"},
+        "finishReason": "STOP",
+    }],
+}).encode('utf-8')
+
+
+class MockGeminiHandler(BaseHTTPRequestHandler):
+    """POST /v1beta/models/<model>:generateContent with keep-alive; new connections pay handshake_sec first."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, keep-alive replies stall on delayed ACKs
+    disable_nagle_algorithm = True
+    handshake_sec = 0.0
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+        # Stands in for the TCP + TLS handshake with the real API
+        time.sleep(self.handshake_sec)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(MOCK_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(MOCK_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(handshake_sec: float) -> ThreadingHTTPServer:
+    MockGeminiHandler.handshake_sec = handshake_sec
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockGeminiHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_calls(call: Callable[[int], None], count: int, workers: int) -> float:
+    """Mean seconds per call with `workers` threads making `count` calls."""
+    def timed(i: int) -> float:
+        start = time.perf_counter()
+        call(i)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(timed, range(count))) / count
+
+
+def new_model(model: str, **generation_config):
+    # Same factory as server.new_model
+    return genai.GenerativeModel(model, generation_config=genai.types.GenerationConfig(**generation_config))
+
+
+def bench_handles(count: int) -> float:
+    """Cost of building a model handle per call vs taking it from the pool, with no request; returns the saving per call."""
+    config = dict(temperature=0.2, max_output_tokens=1024)
+    pool = ModelPool(new_model)
+    start = time.perf_counter()
+    for _ in range(count):
+        new_model('gemini-2.0-flash-lite', **config)
+    per_call = (time.perf_counter() - start) / count
+    start = time.perf_counter()
+    for _ in range(count):
+        pool.get('gemini-2.0-flash-lite', **config)
+    pooled = (time.perf_counter() - start) / count
+    print(f"{'model handle per call':<28} {per_call * 1e6:>10.1f} µs")
+    print(f"{'model handle from pool':<28} {pooled * 1e6:>10.1f} µs  ({len(pool)} handle built)")
+    return per_call - pooled
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-request cost of Gemini model handles built per call vs taken from ModelPool, '
+                                                 'through genai against a local mock endpoint')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per mode (default: 300)')
+    parser.add_argument('--workers', type=int, default=10, help='Concurrent workers (default: 10)')
+    parser.add_argument('--handshake-ms', type=float, default=30, help='Simulated cost of opening a connection (default: 30)')
+    args = parser.parse_args()
+
+    if genai is None:
+        print("❌ google-generativeai is not installed; this benchmark calls the mock endpoint through it")
+        sys.exit(1)
+
+    server = start_mock_server(args.handshake_ms / 1000)
+    # The REST transport honours an http:// endpoint, so genai's own client talks to the mock server
+    genai.configure(api_key='mock-key', transport='rest',
+                    client_options={'api_endpoint': f"http://127.0.0.1:{server.server_address[1]}"})
+    config = dict(temperature=0.2, max_output_tokens=1024)
+    prompt = 'Classify this problem statement.'
+    print(f"🧪 {args.requests} requests, {args.workers} workers, {args.handshake_ms:g} ms per new connection")
+
+    handle_saving = bench_handles(10000)
+
+    def per_call(_):
+        # What every request did before ModelPool
+        new_model('gemini-2.0-flash-lite', **config).generate_content(prompt)
+
+    pool = ModelPool(new_model)
+
+    def pooled(_):
+        pool.get('gemini-2.0-flash-lite', **config).generate_content(prompt)
+
+    # Open the client's keep-alive connections first, so neither mode pays the handshakes
+    time_calls(pooled, args.workers * 2, args.workers)
+    results = {}
+    for label, call in [('model built per call', per_call), ('model from ModelPool', pooled)]:
+        before = MockGeminiHandler.connections
+        results[label] = time_calls(call, args.requests, args.workers)
+        opened = MockGeminiHandler.connections - before
+        print(f"{label:<28} {results[label] * 1000:>10.2f} ms per request  {opened} connections opened")
+    server.shutdown()
+    # Both modes go through genai's one shared client, so connection reuse is the same in each;
+    # the pool saves the handle build, which is small next to a request's round trip
+    print(f"✅ ModelPool saves {handle_saving * 1e6:.1f} µs of handle building per request "
+          f"({handle_saving / results['model from ModelPool'] * 100:.2f}% of a request here)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+
+from html_parsers import available_backends
+from scraper import SIHScraper
+
+
+def _strip_volatile(problems: List[Dict]) -> List[Dict]:
+    """Drop per-run timestamps so records from different backends can be compared."""
+    return [{k: v for k, v in p.items() if k not in ('scraped_at', 'scraped_date')} for p in problems]
+
+
+def peak_parse_memory(scraper: SIHScraper, content: bytes) -> int:
+    """Peak Python heap allocated while parsing (C-level allocations, e.g. lexbor's, are not seen)."""
+    tracemalloc.start()
+    soup = scraper.parse_html(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del soup
+    return peak
+
+
+def benchmark_backend(name: str, content: bytes, repeat: int) -> Dict:
+    """Time parse and extraction for one backend; best of `repeat` runs."""
+    scraper = SIHScraper(parser=name)
+    parse_times, extract_times = [], []
+    problems, counts = [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = scraper.parse_html(content)
+        parsed = time.perf_counter()
+        # The extraction helpers log every record; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            problems = scraper.extract_problems(soup)
+            counts = scraper.parse_submission_counts(soup)
+            scraper.parse_row_submission_counts(soup)
+        done = time.perf_counter()
+        parse_times.append(parsed - start)
+        extract_times.append(done - parsed)
+    return {
+        'backend': name,
+        'peak_mb': peak_parse_memory(scraper, content) / (1024 * 1024),
+        'parse': min(parse_times),
+        'extract': min(extract_times),
+        'problems': problems,
+        'counts': counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends on a saved SIH listing page')
+    parser.add_argument('html_file', help='Saved listing page (e.g. a copy of https://sih.gov.in/sih2025PS)')
+    parser.add_argument('--fetch', action='store_true', help='Download the live listing page into html_file first')
+    parser.add_argument('--url', type=str, default='https://sih.gov.in/sih2025PS', help='Listing URL used with --fetch')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per backend (best time is reported)')
+    args = parser.parse_args()
+
+    if args.fetch:
+        response = SIHScraper().session.get(args.url, timeout=30)
+        response.raise_for_status()
+        with open(args.html_file, 'wb') as f:
+            f.write(response.content)
+        print(f"💾 Saved {len(response.content)} bytes from {args.url} to {args.html_file}")
+
+    if not os.path.exists(args.html_file):
+        print(f"❌ Listing page not found: {args.html_file} (use --fetch to download it)")
+        return
+
+    with open(args.html_file, 'rb') as f:
+        content = f.read()
+
+    print(f"📄 {args.html_file}: {len(content) / 1024:.0f} KB, best of {args.repeat} runs")
+    results = [benchmark_backend(name, content, max(1, args.repeat)) for name in available_backends()]
+    baseline = next((r for r in results if r['backend'] == 'html.parser'), results[-1])
+
+    print(f"{'backend':<12} {'parse (s)':>10} {'extract (s)':>12} {'total (s)':>10} {'speedup':>8} {'peak MB':>8} {'problems':>9} {'counts':>7}  same-as-{baseline['backend']}")
+    baseline_total = baseline['parse'] + baseline['extract']
+    for r in results:
+        total = r['parse'] + r['extract']
+        same = (_strip_volatile(r['problems']) == _strip_volatile(baseline['problems'])
+                and r['counts'] == baseline['counts'])
+        print(f"{r['backend']:<12} {r['parse']:>10.4f} {r['extract']:>12.4f} {total:>10.4f} "
+              f"{baseline_total / total:>7.1f}x {r['peak_mb']:>8.1f} {len(r['problems']):>9} {len(r['counts']):>7}  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
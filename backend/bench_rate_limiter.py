@@ -0,0 +1,111 @@
+import argparse
+import heapq
+import random
+import sys
+from typing import List, Tuple
+
+from rate_limiter import RateLimiter
+
+
+class SimulatedClock:
+    """Time that only moves when the simulation says so."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def max_in_window(times: List[float], amounts: List[float], window: float = 60.0) -> float:
+    """Largest total amount sent in any half-open window [t, t + window)."""
+    best, total, start = 0.0, 0.0, 0
+    for end in range(len(times)):
+        total += amounts[end]
+        # 1e-6 absorbs float rounding of evenly spaced send times
+        while times[end] - times[start] >= window - 1e-6:
+            total -= amounts[start]
+            start += 1
+        best = max(best, total)
+    return best
+
+
+def simulate_batches(count: int, batch_size: int, interval: float, latency: Tuple[float, float],
+                     rng: random.Random) -> float:
+    """The old scheme: send a batch at once, wait for all of it, then sleep a fixed interval. Returns the end time."""
+    now = 0.0
+    for i in range(0, count, batch_size):
+        now += max(rng.uniform(*latency) for _ in range(min(batch_size, count - i)))
+        if i + batch_size < count:
+            now += interval
+    return now
+
+
+def simulate_limiter(count: int, rpm: float, tpm: int, workers: int, latency: Tuple[float, float],
+                     failure_rate: float, rng: random.Random):
+    """Workers pull problems continuously; every attempt, retries included, goes through one RateLimiter."""
+    clock = SimulatedClock()
+    limiter = RateLimiter(rpm, tpm, clock=clock, sleep=lambda seconds: None)
+    queue = [(0, i) for i in range(count)]  # (attempt, problem)
+    free: List[Tuple[float, int]] = [(0.0, w) for w in range(workers)]
+    sends: List[float] = []
+    tokens: List[float] = []
+    done = 0
+    while queue:
+        clock.now, worker = heapq.heappop(free)
+        attempt, problem = queue.pop(0)
+        size = rng.randint(1500, 4000)
+        sent = clock.now + limiter.reserve(size)
+        sends.append(sent)
+        tokens.append(size)
+        finished = sent + rng.uniform(*latency)
+        if rng.random() < failure_rate and attempt < 2:
+            # Backoff, then the retry queues up behind the remaining problems
+            finished += 2.0 ** attempt
+            queue.append((attempt + 1, problem))
+        else:
+            done += 1
+        heapq.heappush(free, (finished, worker))
+    return sends, tokens, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulated-clock check of the Gemini rate limiter vs fixed batches')
+    parser.add_argument('--count', type=int, default=600, help='Problems to classify (default: 600)')
+    parser.add_argument('--rpm', type=float, default=30, help='Requests per minute (default: 30)')
+    parser.add_argument('--tpm', type=int, default=1000000, help='Tokens per minute (default: 1000000)')
+    parser.add_argument('--workers', type=int, default=10, help='Concurrent requests (default: 10)')
+    parser.add_argument('--latency', type=float, nargs=2, default=[2.0, 15.0], help='Request latency range in seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.1, help='Share of attempts that fail and are retried')
+    args = parser.parse_args()
+    rng = random.Random(0)
+    latency = tuple(args.latency)
+
+    old_end = simulate_batches(args.count, int(args.rpm), 60.0, latency, rng)
+    print(f"🧪 {args.count} problems, {args.rpm:g} RPM, {args.tpm} TPM, {args.workers} workers, latency {latency[0]:g}-{latency[1]:g}s")
+    print(f"{'fixed batches':<24} {old_end / 60:>8.1f} min  {args.count * 60 / old_end:>6.2f} RPM (no retries)")
+
+    ok = True
+    for label, tpm in [('token bucket', args.tpm), ('token bucket, tight TPM', int(args.rpm * 2000))]:
+        sends, tokens, done = simulate_limiter(args.count, args.rpm, tpm, args.workers, latency, args.failure_rate, rng)
+        span = sends[-1] - sends[0]
+        achieved = (len(sends) - 1) * 60 / span
+        peak_requests = max_in_window(sends, [1] * len(sends))
+        peak_tokens = max_in_window(sends, tokens)
+        # A token burst is one average request's share of the budget (RateLimiter with burst=1)
+        within = peak_requests <= args.rpm and peak_tokens <= tpm + tpm / args.rpm
+        exact = abs(achieved - args.rpm) < 1e-6
+        if tpm == args.tpm:
+            ok = ok and within and exact
+        else:
+            ok = ok and within
+        print(f"{label:<24} {sends[-1] / 60:>8.1f} min  {achieved:>6.2f} RPM over {len(sends)} attempts ({len(sends) - done} retries), "
+              f"peak {peak_requests:g} req / {peak_tokens:g} tokens per minute  {'✅' if within else '❌'}")
+    if not ok:
+        print('❌ Rate limit check failed')
+        sys.exit(1)
+    print('✅ Sustains the configured RPM without exceeding it')
+
+
+if __name__ == "__main__":
+    main()
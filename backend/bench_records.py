@@ -0,0 +1,96 @@
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from problem_record import CATEGORICAL_FIELDS, FINAL_FIELDS, records_from_dicts, records_to_dicts
+from problem_store import TAG_FIELDS
+from synthetic_listing import load_corpus
+
+
+def synthetic_record(i: int, corpus: List[Dict], vocab: Dict[str, List[str]], rng: random.Random) -> Dict:
+    """A final-schema record with unique text and categorical/tag values drawn from the corpus."""
+    base = rng.choice(corpus)
+    record = {
+        'ps_id': f"SIH{30000 + i}",
+        'title': f"{base.get('title', '')} ({i})",
+        'summary': f"{base.get('summary', '')} #{i}",
+        'description': f"{base.get('description', '')} #{i}",
+    }
+    for field in ['difficulty'] + TAG_FIELDS + CATEGORICAL_FIELDS[1:]:
+        values = vocab[field] or ['']
+        if field in TAG_FIELDS:
+            record[field] = rng.sample(values, min(len(values), rng.randint(1, 4)))
+        else:
+            record[field] = rng.choice(values)
+    record['submission_count'] = rng.randint(0, 400)
+    return {field: record[field] for field in FINAL_FIELDS + ['submission_count']}
+
+
+def write_dataset(path: str, count: int, corpus: List[Dict], rng: random.Random) -> None:
+    vocab: Dict[str, List[str]] = {}
+    for field in CATEGORICAL_FIELDS + TAG_FIELDS:
+        values = set()
+        for r in corpus:
+            value = r.get(field)
+            values.update(value if isinstance(value, list) else [value] if value else [])
+        vocab[field] = sorted(values)
+    # One record per line inside the array, so the whole dataset is never held as dicts here
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i in range(count):
+            f.write(('' if i == 0 else ',\n') + json.dumps(synthetic_record(i, corpus, vocab, rng), ensure_ascii=False))
+        f.write('\n]')
+
+
+def measure(load) -> Tuple[int, float, object]:
+    """Memory still allocated after load() returns (the result is kept alive), and the time it took."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory of results held as dicts vs ProblemRecord objects')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic records (default: 100000)')
+    parser.add_argument('--corpus', type=str, default='results.json', help='Records whose text and tags are reused')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = load_corpus(args.corpus, rng)
+    path = os.path.join(tempfile.mkdtemp(prefix='sih_records_'), f"records_{args.count}.json")
+    write_dataset(path, args.count, corpus, rng)
+    print(f"🧪 {args.count} synthetic records, {os.path.getsize(path) / (1024 * 1024):.0f} MB of JSON ({path})")
+
+    def load_dicts():
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_records():
+        return records_from_dicts(load_dicts())
+
+    dict_bytes, dict_time, dicts = measure(load_dicts)
+    record_bytes, record_time, records = measure(load_records)
+    lossless = records_to_dicts(records) == dicts
+    del dicts, records
+
+    print(f"{'':>16} {'MB':>8} {'load (s)':>9}")
+    print(f"{'dicts':>16} {dict_bytes / (1024 * 1024):>8.1f} {dict_time:>9.2f}")
+    print(f"{'ProblemRecord':>16} {record_bytes / (1024 * 1024):>8.1f} {record_time:>9.2f}")
+    print(f"💾 {100 * (1 - record_bytes / dict_bytes):.0f}% less memory; round trip {'✅ lossless' if lossless else '❌ differs'}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: peak RSS is not reported
+
+from page_snapshot import ListingSnapshot
+from scraper import SIHScraper
+from synthetic_listing import load_corpus, write_listing
+from updatesubmission import SubmissionUpdater
+
+BENCH_URL = 'https://sih.gov.in/sih2025PS'
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(fn):
+    # The scraper logs every record; send it to /dev/null so terminal speed is not measured
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+
+
+def run_size(page_path: str, parser: str) -> Dict:
+    """Benchmark one listing page; meant to run in its own process so peak RSS is per size."""
+    with open(page_path, 'rb') as f:
+        content = f.read()
+    # scrape_sih_problems records a watermark in scraper_state.json; keep it out of the real one
+    os.chdir(tempfile.mkdtemp(prefix='sih_bench_'))
+
+    scraper = SIHScraper(parser=parser, use_cache=False, archive=False)
+    snapshot = ListingSnapshot(BENCH_URL, content, scraper=scraper)
+    _, parse = timed(lambda: snapshot.document)
+    problems, scrape = timed(lambda: scraper.scrape_sih_problems(BENCH_URL, snapshot=snapshot))
+    header_counts, header = timed(lambda: scraper.parse_submission_counts(snapshot.document))
+    row_counts, rows = timed(lambda: scraper.parse_row_submission_counts(snapshot.document))
+    updater_counts, updater = timed(
+        lambda: SubmissionUpdater(parser=parser, archive=False).scrape_submission_counts(BENCH_URL, snapshot=snapshot))
+    return {
+        'parser': scraper.parser.name,
+        'bytes': len(content),
+        'problems': len(problems),
+        'parse': parse,
+        'scrape': scrape,
+        'header_counts': header,
+        'row_counts': rows,
+        'updater_counts': updater,
+        'counts_found': [len(header_counts), len(row_counts), len(updater_counts)],
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SIHScraper on synthetic listing pages of increasing size')
+    parser.add_argument('--sizes', type=str, default='1000,10000', help='Comma-separated problem counts (e.g. 1000,10000,100000)')
+    parser.add_argument('--parser', type=str, default=None, help='HTML parser backend (default: auto)')
+    parser.add_argument('--corpus', type=str, default='results.json', help='Records whose text fills the synthetic modals')
+    parser.add_argument('--pages-dir', type=str, default=None, help='Keep generated pages here and reuse them (default: temporary)')
+    parser.add_argument('--run-size', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        print(json.dumps(run_size(args.run_size, args.parser)))
+        return
+
+    pages_dir = args.pages_dir or tempfile.mkdtemp(prefix='sih_pages_')
+    os.makedirs(pages_dir, exist_ok=True)
+    corpus = load_corpus(args.corpus, random.Random(0))
+    script = os.path.abspath(__file__)
+    parser_name = args.parser or 'auto'
+
+    print(f"{'problems':>9} {'MB':>7} {'parse (s)':>10} {'scrape (s)':>11} {'records/s':>10} "
+          f"{'hdr cnt (s)':>12} {'row cnt (s)':>12} {'updater (s)':>12} {'peak RSS MB':>12}  counts")
+    for size in [int(s) for s in args.sizes.split(',') if s.strip()]:
+        page_path = os.path.join(pages_dir, f"listing_{size}.html")
+        if not os.path.exists(page_path):
+            write_listing(page_path, size, corpus)
+        # A fresh interpreter per size, so peak RSS is not inherited from the previous one
+        proc = subprocess.run([sys.executable, script, '--run-size', os.path.abspath(page_path)]
+                              + (['--parser', args.parser] if args.parser else []),
+                              capture_output=True, text=True, cwd=os.path.dirname(script))
+        if proc.returncode != 0:
+            print(f"❌ {size} problems failed:\n{proc.stderr.strip()}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        parser_name = r['parser']
+        total = r['parse'] + r['scrape']
+        ok = '✅' if r['problems'] == size and all(c == size for c in r['counts_found']) else '❌'
+        print(f"{size:>9} {r['bytes'] / (1024 * 1024):>7.1f} {r['parse']:>10.3f} {r['scrape']:>11.3f} "
+              f"{r['problems'] / total:>10.0f} {r['header_counts']:>12.3f} {r['row_counts']:>12.3f} "
+              f"{r['updater_counts']:>12.3f} {r['peak_rss_mb']:>12.1f}  {ok} {r['problems']}/{'/'.join(map(str, r['counts_found']))}")
+    print(f"🧩 parser: {parser_name}, pages in {pages_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import random
+import time
+from typing import Dict, Iterable, List
+
+from tags import TAG_CATEGORY_FIELDS, TAGS, TagIndex
+
+# Tag queries like the ones the frontend sidebar produces: (all_tags, any_tags)
+QUERIES = [
+    ([], ['Blockchain']),
+    ([], ['Farmers', 'Citizens', 'NGOs']),
+    (['Machine Learning (ML)'], ['Satellite Data', 'Image Data']),
+    (['Hard', 'Cybersecurity', 'Government Agencies'], []),
+]
+
+
+def synthetic_records(count: int, rng: random.Random) -> List[Dict]:
+    records = []
+    for i in range(count):
+        record = {'ps_id': f"SIH{30000 + i}"}
+        for category, field in TAG_CATEGORY_FIELDS.items():
+            names = TAGS[category]
+            if field in ('difficulty', 'solution_type'):
+                record[field] = rng.choice(names)
+            else:
+                record[field] = rng.sample(names, rng.randint(1, 4))
+        records.append(record)
+    return records
+
+
+def has_tag(record: Dict, tag: str) -> bool:
+    """The per-record string check of the frontend's filterByTags."""
+    for field in TAG_CATEGORY_FIELDS.values():
+        value = record.get(field)
+        if tag in value if isinstance(value, list) else value == tag:
+            return True
+    return False
+
+
+def string_filter(records: List[Dict], all_tags: Iterable[str], any_tags: Iterable[str]) -> List[Dict]:
+    return [r for r in records
+            if all(has_tag(r, t) for t in all_tags) and (not any_tags or any(has_tag(r, t) for t in any_tags))]
+
+
+def string_facets(records: List[Dict]) -> Dict[str, Dict[str, int]]:
+    return {category: {tag: sum(1 for r in records if has_tag(r, tag)) for tag in names}
+            for category, names in TAGS.items()}
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='String tag checks vs bitset TagIndex on synthetic records')
+    parser.add_argument('--count', type=int, default=100000, help='Synthetic records (default: 100000)')
+    args = parser.parse_args()
+
+    records = synthetic_records(args.count, random.Random(0))
+    start = time.perf_counter()
+    index = TagIndex(records)
+    print(f"🧪 {args.count} records, tag index built in {time.perf_counter() - start:.2f}s")
+
+    print(f"{'query':<60} {'matches':>8} {'strings (s)':>12} {'bitset (s)':>11}")
+    for all_tags, any_tags in QUERIES:
+        expected = string_filter(records, all_tags, any_tags)
+        ok = index.filter(all_tags, any_tags) == expected
+        label = ' AND '.join(all_tags) + (' AND ' if all_tags and any_tags else '') + \
+            (f"({' OR '.join(any_tags)})" if any_tags else '')
+        print(f"{label[:60]:<60} {len(expected):>8} {best_of(lambda: string_filter(records, all_tags, any_tags)):>12.3f} "
+              f"{best_of(lambda: index.filter(all_tags, any_tags)):>11.3f}  {'✅' if ok else '❌'}")
+
+    ok = index.facet_counts() == string_facets(records)
+    print(f"{'facet counts (all tags)':<60} {len(records):>8} {best_of(lambda: string_facets(records), 1):>12.3f} "
+          f"{best_of(index.facet_counts):>11.3f}  {'✅' if ok else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
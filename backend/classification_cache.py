@@ -0,0 +1,236 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .json_codec import dumps, loads  # if run as a module
+    from .tags import TAGS
+except ImportError:
+    from json_codec import dumps, loads  # if run directly from backend/
+    from tags import TAGS
+
+# SQLite file of Gemini classifications reused across runs ("" disables the cache)
+CLASSIFICATION_CACHE_DB = os.environ.get("CLASSIFICATION_CACHE_DB", "classification_cache.db")
+# Least recently used entries are evicted beyond either limit (0 = no limit)
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.environ.get("CLASSIFICATION_CACHE_MAX_ENTRIES", "50000"))
+CLASSIFICATION_CACHE_MAX_MB = float(os.environ.get("CLASSIFICATION_CACHE_MAX_MB", "200"))
+
+# Problem fields that go into the classification prompt (server.format_problem). The PS ID is
+# left out so a renumbered but otherwise identical problem still hits.
+PROMPT_FIELDS = ['title', 'description', 'organization', 'department', 'theme', 'category']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classifications (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    vocabulary TEXT NOT NULL,
+    ps_id TEXT,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_classifications_last_used ON classifications(last_used);
+CREATE INDEX IF NOT EXISTS idx_classifications_ps_id ON classifications(ps_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _normalize(value) -> str:
+    """Field text as the cache sees it: NFC, with runs of whitespace collapsed."""
+    if value is None:
+        return ''
+    return ' '.join(unicodedata.normalize('NFC', str(value)).split())
+
+
+def vocabulary_hash(tags: Dict = TAGS) -> str:
+    """SHA-256 of the tag vocabulary; changing any category or tag invalidates every entry."""
+    return hashlib.sha256(dumps(dict(sorted(tags.items())), indent=None)).hexdigest()
+
+
+def cache_key(problem: Dict, model: str, vocabulary: str) -> str:
+    """SHA-256 of the model, the vocabulary hash and the problem's normalized prompt fields."""
+    parts = [model, vocabulary] + [_normalize(problem.get(name)) for name in PROMPT_FIELDS]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """
+    Disk cache of Gemini classifications keyed by problem content, model and tag vocabulary.
+
+    A problem whose prompt fields are unchanged gets its earlier
+    classification back without a request, so re-runs (or a reset
+    incremental watermark) only send new or edited problems. Entries are
+    evicted least recently used first once the cache grows past
+    max_entries or max_mb. Hit and miss counts are kept per instance and
+    in total (in the meta table).
+    """
+
+    def __init__(self, path: str = CLASSIFICATION_CACHE_DB, model: str = '', tags: Dict = TAGS,
+                 max_entries: int = CLASSIFICATION_CACHE_MAX_ENTRIES, max_mb: float = CLASSIFICATION_CACHE_MAX_MB):
+        self.path = path
+        self.model = model
+        self.vocabulary = vocabulary_hash(tags)
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def key(self, problem: Dict) -> str:
+        return cache_key(problem, self.model, self.vocabulary)
+
+    def _count_meta(self, key: str, amount: int) -> None:
+        if amount:
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                              "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + ?",
+                              (key, str(amount), amount))
+
+    def lookup(self, problems: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Split problems into (cached classifications, problems to classify)."""
+        found: List[Dict] = []
+        missing: List[Dict] = []
+        now = time.time()
+        with self.conn:
+            for problem in problems:
+                key = self.key(problem)
+                row = self.conn.execute('SELECT data FROM classifications WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    missing.append(problem)
+                    continue
+                self.conn.execute('UPDATE classifications SET last_used = ?, hits = hits + 1 WHERE key = ?', (now, key))
+                # Attach the current ps_id, as a fresh classification would
+                found.append(dict(loads(row[0]), ps_id=problem.get('ps_id')))
+            self.hits += len(found)
+            self.misses += len(missing)
+            self._count_meta('hits', len(found))
+            self._count_meta('misses', len(missing))
+        return found, missing
+
+    def store(self, problems: List[Dict], classifications: List[Dict]) -> int:
+        """Cache the classifications of the given problems (matched by ps_id); returns how many were stored."""
+        by_id = {c.get('ps_id'): c for c in classifications if isinstance(c, dict)}
+        now = time.time()
+        stored = 0
+        with self.conn:
+            for problem in problems:
+                classification = by_id.get(problem.get('ps_id'))
+                if classification is None:
+                    continue
+                data = dumps(classification, indent=None)
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO classifications (key, model, vocabulary, ps_id, data, size, created_at, last_used) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (self.key(problem), self.model, self.vocabulary, str(problem.get('ps_id') or ''),
+                     data.decode('utf-8'), len(data), now, now))
+                stored += 1
+        if stored:
+            self.evict()
+        return stored
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond max_entries / max_bytes; returns how many were dropped."""
+        removed = 0
+        with self.conn:
+            if self.max_entries > 0:
+                removed += self.conn.execute(
+                    'DELETE FROM classifications WHERE key IN (SELECT key FROM classifications '
+                    'ORDER BY last_used DESC, created_at DESC LIMIT -1 OFFSET ?)', (self.max_entries,)).rowcount
+            if self.max_bytes > 0:
+                removed += self.conn.execute(
+                    'DELETE FROM classifications WHERE key IN (SELECT key FROM ('
+                    'SELECT key, SUM(size) OVER (ORDER BY last_used DESC, created_at DESC, key) AS running '
+                    'FROM classifications) WHERE running > ?)', (self.max_bytes,)).rowcount
+        return removed
+
+    def invalidate(self, ps_ids: Optional[List[str]] = None, model: Optional[str] = None,
+                   stale_vocabulary: bool = False) -> int:
+        """Delete entries for these PS IDs / this model / an older tag vocabulary (everything if no filter); returns the count."""
+        where, params = [], []
+        if ps_ids:
+            where.append(f"ps_id IN ({','.join('?' * len(ps_ids))})")
+            params.extend(str(p) for p in ps_ids)
+        if model:
+            where.append('model = ?')
+            params.append(model)
+        if stale_vocabulary:
+            where.append('vocabulary != ?')
+            params.append(self.vocabulary)
+        sql = 'DELETE FROM classifications' + (f" WHERE {' AND '.join(where)}" if where else '')
+        with self.conn:
+            return self.conn.execute(sql, params).rowcount
+
+    def stats(self) -> Dict:
+        entries, size = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM classifications').fetchone()
+        totals = dict(self.conn.execute("SELECT key, CAST(value AS INTEGER) FROM meta WHERE key IN ('hits', 'misses')"))
+        hits, misses = totals.get('hits', 0), totals.get('misses', 0)
+        return {
+            'entries': entries,
+            'bytes': size,
+            'models': dict(self.conn.execute('SELECT model, COUNT(*) FROM classifications GROUP BY model')),
+            'stale_vocabulary': self.conn.execute('SELECT COUNT(*) FROM classifications WHERE vocabulary != ?',
+                                                  (self.vocabulary,)).fetchone()[0],
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or invalidate the Gemini classification cache')
+    parser.add_argument('--db', type=str, default=CLASSIFICATION_CACHE_DB, help=f"Cache database (default: {CLASSIFICATION_CACHE_DB})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='Entries, size and hit/miss counts')
+    invalidate = sub.add_parser('invalidate', help='Delete cached classifications')
+    invalidate.add_argument('--ps-id', type=str, nargs='+', help='Only these PS IDs')
+    invalidate.add_argument('--model', type=str, help='Only classifications made by this model')
+    invalidate.add_argument('--stale', action='store_true', help='Only classifications made with an older tag vocabulary')
+    invalidate.add_argument('--all', action='store_true', help='Delete every entry')
+    evict = sub.add_parser('evict', help='Apply the size limits now')
+    evict.add_argument('--max-entries', type=int, default=CLASSIFICATION_CACHE_MAX_ENTRIES)
+    evict.add_argument('--max-mb', type=float, default=CLASSIFICATION_CACHE_MAX_MB)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Cache not found: {args.db}")
+        return
+    if args.command == 'evict':
+        cache = ClassificationCache(args.db, max_entries=args.max_entries, max_mb=args.max_mb)
+    else:
+        cache = ClassificationCache(args.db)
+    try:
+        if args.command == 'stats':
+            stats = cache.stats()
+            print(f"🗄️  {args.db}: {stats['entries']} classifications, {stats['bytes'] / 1024:.1f} KB")
+            for model, count in sorted(stats['models'].items()):
+                print(f"   {model or '(no model)'}: {count}")
+            print(f"   {stats['stale_vocabulary']} made with an older tag vocabulary")
+            print(f"🎯 {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate'] * 100:.1f}% hit rate)")
+        elif args.command == 'invalidate':
+            if not (args.ps_id or args.model or args.stale or args.all):
+                print("❌ Give --ps-id, --model, --stale or --all")
+                return
+            removed = cache.invalidate(args.ps_id, args.model, args.stale)
+            print(f"🗑️  Removed {removed} cached classifications")
+        else:
+            print(f"🗑️  Evicted {cache.evict()} cached classifications")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+# classify(problem) -> classification dict, or None if it failed
+Classifier = Callable[[Dict], Awaitable[Optional[Dict]]]
+# classify_batch(problems) -> (classifications, problems left to classify one by one)
+BatchClassifier = Callable[[List[Dict]], Awaitable[Tuple[List[Dict], List[Dict]]]]
+
+
+class ClassificationEngine:
+    """
+    Runs an async classifier over a whole job with a fixed number of requests in flight.
+
+    `concurrency` workers pull problems from one queue for the entire job,
+    so a slow response only holds up its own worker and there is no batch
+    barrier; throughput is set by the rate limiter the classifier draws
+    from. Failed problems (None or an exception) are retried with
+    exponential backoff. Results are collected as they complete, and
+    run_sync() returns them even when the run is cancelled with Ctrl-C.
+
+    With classify_batch, run() can also take groups of problems that are
+    sent as one request each; the problems a group's answer leaves out go
+    back on the queue to be classified (and retried) one by one.
+    """
+
+    def __init__(self, classify: Classifier, classify_batch: Optional[BatchClassifier] = None,
+                 concurrency: int = 10, max_retries: int = 3,
+                 backoff_initial: float = 1.0, backoff_base: float = 2.0, jitter: float = 0.3,
+                 progress_every: int = 30):
+        self.classify = classify
+        self.classify_batch = classify_batch
+        self.concurrency = max(1, int(concurrency))
+        self.max_retries = max(1, int(max_retries))
+        self.backoff_initial = backoff_initial
+        self.backoff_base = backoff_base
+        self.jitter = jitter
+        self.progress_every = max(1, int(progress_every))
+        self.results: List[Dict] = []
+        self.failed: List[Dict] = []
+        self.total = 0
+
+    async def _classify_with_retries(self, problem: Dict) -> Optional[Dict]:
+        for attempt in range(self.max_retries):
+            try:
+                result = await self.classify(problem)
+            except Exception as e:
+                print(f"⚠️  Exception classifying problem {problem.get('ps_id')}: {e}")
+                result = None
+            if result is not None:
+                return result
+            if attempt + 1 < self.max_retries:
+                delay = min(self.backoff_initial * (self.backoff_base ** attempt) + random.uniform(0, self.jitter), 30.0)
+                print(f"⏳ Retry {attempt + 1}/{self.max_retries - 1} for {problem.get('ps_id')} after {delay:.2f}s")
+                await asyncio.sleep(delay)
+        return None
+
+    def _progress(self, count: int) -> None:
+        done = len(self.results) + len(self.failed)
+        if done // self.progress_every != (done - count) // self.progress_every or done == self.total:
+            print(f"✅ {done}/{self.total} problems processed, {len(self.results)} classified successfully")
+
+    async def _run_batch(self, queue: asyncio.Queue, problems: List[Dict]) -> None:
+        try:
+            results, missing = await self.classify_batch(problems)
+        except Exception as e:
+            print(f"⚠️  Exception classifying a batch of {len(problems)} problems: {e}")
+            results, missing = [], problems
+        self.results.extend(results)
+        for problem in missing:
+            queue.put_nowait([problem])
+        self._progress(len(results))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        # Runs until cancelled: a failed batch can put single problems back after the queue ran dry
+        while True:
+            unit = await queue.get()
+            try:
+                if len(unit) > 1:
+                    await self._run_batch(queue, unit)
+                    continue
+                problem = unit[0]
+                result = await self._classify_with_retries(problem)
+                if result is not None:
+                    self.results.append(result)
+                else:
+                    self.failed.append(problem)
+                    print(f"⚠️  Failed to classify problem {problem.get('ps_id')}")
+                self._progress(1)
+            finally:
+                queue.task_done()
+
+    async def run(self, problems: List[Dict], batches: Optional[List[List[Dict]]] = None) -> List[Dict]:
+        """Classify every problem (sent in the given groups, if any); returns the successful classifications in completion order."""
+        self.total += len(problems)
+        units = batches if batches and self.classify_batch is not None else [[problem] for problem in problems]
+        queue: asyncio.Queue = asyncio.Queue()
+        for unit in units:
+            queue.put_nowait(unit)
+        # Sized by problems, not units: the problems of a failed batch come back as units of their own
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(min(self.concurrency, len(problems)))]
+        finished = asyncio.ensure_future(queue.join())
+        try:
+            await asyncio.wait([finished] + workers, return_when=asyncio.FIRST_COMPLETED)
+            # A worker only stops on its own when something unexpected went wrong; surface it
+            for worker in workers:
+                if worker.done():
+                    worker.result()
+        finally:
+            # On cancellation, stop the requests still in flight; finished results stay in self.results
+            for task in [finished] + workers:
+                task.cancel()
+            await asyncio.gather(finished, *workers, return_exceptions=True)
+        return self.results
+
+    def run_sync(self, problems: List[Dict], batches: Optional[List[List[Dict]]] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None) -> List[Dict]:
+        """run() on `loop` (a new event loop if None); Ctrl-C cancels the requests in flight and keeps the completed ones.
+
+        Jobs that share clients bound to an event loop (an async gRPC channel)
+        must all run on the same loop; the caller owns it and closes it.
+        """
+        try:
+            if loop is None:
+                asyncio.run(self.run(problems, batches))
+            else:
+                task = loop.create_task(self.run(problems, batches))
+                try:
+                    loop.run_until_complete(task)
+                except KeyboardInterrupt:
+                    # Let the cancelled requests unwind so the loop can be used again
+                    task.cancel()
+                    loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+                    raise
+        except KeyboardInterrupt:
+            print(f"\n⏹️  Classification interrupted; keeping {len(self.results)} completed results")
+        return list(self.results)
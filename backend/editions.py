@@ -0,0 +1,64 @@
+import asyncio
+import os
+import re
+from typing import Dict, List
+from urllib.parse import urlparse
+
+DEFAULT_URL = "https://sih.gov.in/sih2025PS"
+# Editions scraped by server.py, comma-separated (e.g. ".../sih2024PS,.../sih2025PS")
+EDITION_URLS = [u.strip() for u in os.environ.get("SIH_EDITION_URLS", DEFAULT_URL).split(",") if u.strip()]
+# Concurrent listing downloads allowed against one host
+MAX_CONNECTIONS_PER_HOST = int(os.environ.get("MAX_CONNECTIONS_PER_HOST", "2"))
+
+
+def edition_from_url(url: str) -> str:
+    """Edition key for a listing URL, e.g. 'https://sih.gov.in/sih2025PS' -> 'sih2025'."""
+    match = re.search(r'(sih\d{4})', url, re.IGNORECASE)
+    if match:
+        return match.group(1).lower()
+    path = urlparse(url).path.strip('/') or urlparse(url).netloc
+    return re.sub(r'[^a-z0-9]+', '_', path.lower()).strip('_') or 'default'
+
+
+PRIMARY_EDITION = edition_from_url(DEFAULT_URL)
+
+
+def edition_path(filename: str, edition: str) -> str:
+    """Per-edition partition of a data file; the primary edition keeps the plain name.
+
+    edition_path('results.json', 'sih2024') -> 'results_sih2024.json'
+    """
+    if not edition or edition == PRIMARY_EDITION:
+        return filename
+    root, ext = os.path.splitext(filename)
+    return f"{root}_{edition}{ext}"
+
+
+async def _fetch_all(scraper, urls: List[str], per_host: int) -> Dict[str, object]:
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def fetch_one(url: str):
+        host = urlparse(url).netloc
+        semaphore = semaphores.setdefault(host, asyncio.Semaphore(max(1, per_host)))
+        async with semaphore:
+            print(f"🌐 Fetching {edition_from_url(url)}: {url}")
+            # requests is blocking; each download runs on a worker thread
+            return await asyncio.to_thread(scraper.fetch_listing, url)
+
+    results = await asyncio.gather(*(fetch_one(url) for url in urls), return_exceptions=True)
+    return dict(zip(urls, results))
+
+
+def fetch_editions(scraper, urls: List[str], per_host: int = MAX_CONNECTIONS_PER_HOST) -> Dict[str, object]:
+    """Fetch several edition listing pages concurrently; returns url -> ListingSnapshot.
+
+    At most per_host downloads run against the same host at once. Editions
+    that fail to download are reported and left out of the result.
+    """
+    snapshots = {}
+    for url, result in asyncio.run(_fetch_all(scraper, urls, per_host)).items():
+        if isinstance(result, Exception):
+            print(f"❌ Error fetching {url}: {result}")
+        else:
+            snapshots[url] = result
+    return snapshots
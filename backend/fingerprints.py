@@ -0,0 +1,91 @@
+import hashlib
+import os
+import time
+from typing import Dict, Optional
+
+try:
+    from .html_parsers import MODAL_ID_PATTERN  # if run as a module
+    from .json_codec import read_json
+    from .results_writer import atomic_write_json
+except ImportError:
+    from html_parsers import MODAL_ID_PATTERN  # if run directly from backend/
+    from json_codec import read_json
+    from results_writer import atomic_write_json
+
+
+class FingerprintStore:
+    """
+    Content fingerprints of problem statement modals, keyed by numeric PS ID.
+
+    Each entry is the SHA-256 of the modal's HTML as the parser serializes
+    it, with the positional ViewProblemStatementN ids blanked out so rows
+    added or removed above a modal do not change its hash. A modal whose
+    hash is already known has not changed since it was last extracted and
+    can be skipped; a new hash for a known PS ID means the problem was
+    edited. Serialization differs between parser backends, so entries record
+    the parser variant (and hash format) that made them, and other entries
+    are ignored: switching parsers re-extracts every modal once to set a new
+    baseline instead of reporting them all as modified.
+    """
+
+    # Bumped whenever fingerprint() changes what it hashes
+    FORMAT = 2
+
+    def __init__(self, path: str = 'problem_fingerprints.json', parser: str = ''):
+        self.path = path
+        self.parser = parser
+        self.entries: Dict[str, Dict] = {}
+        self._by_hash: Dict[str, str] = {}
+        self.dirty = False
+        self.load()
+
+    @staticmethod
+    def fingerprint(html: str) -> str:
+        """SHA-256 of a modal's HTML with its positional modal ids removed."""
+        html = MODAL_ID_PATTERN.sub('ViewProblemStatement', html)
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def _current(self, entry: Dict) -> bool:
+        """Whether an entry was made by this parser variant and hash format."""
+        return entry.get('parser', '') == self.parser and entry.get('format', 1) == self.FORMAT
+
+    def load(self) -> None:
+        try:
+            if os.path.exists(self.path):
+                data = read_json(self.path)
+                if isinstance(data, dict):
+                    self.entries = data
+        except Exception as e:
+            print(f"Warning: Failed to load fingerprints from {self.path}: {e}")
+            self.entries = {}
+        self._by_hash = {entry.get('sha256'): ps_id for ps_id, entry in self.entries.items()
+                         if self._current(entry)}
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            atomic_write_json(self.path, self.entries)
+            self.dirty = False
+        except Exception as e:
+            print(f"Warning: Failed to save fingerprints to {self.path}: {e}")
+
+    def ps_id_for(self, fingerprint: str) -> Optional[str]:
+        """PS ID whose current modal has this fingerprint, if any."""
+        return self._by_hash.get(fingerprint)
+
+    def get(self, ps_id: str) -> Optional[str]:
+        entry = self.entries.get(str(ps_id))
+        return entry.get('sha256') if entry and self._current(entry) else None
+
+    def update(self, ps_id: str, fingerprint: str) -> None:
+        ps_id = str(ps_id)
+        previous = self.get(ps_id)
+        if previous == fingerprint:
+            return
+        if previous is not None:
+            self._by_hash.pop(previous, None)
+        self.entries[ps_id] = {'sha256': fingerprint, 'parser': self.parser, 'format': self.FORMAT,
+                               'updated_at': time.time()}
+        self._by_hash[fingerprint] = ps_id
+        self.dirty = True
@@ -0,0 +1,212 @@
+import os
+import re
+from typing import Dict, List, Optional, Union
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+# Order in which backends are tried when no parser is requested explicitly
+PREFERRED_BACKENDS = ['selectolax', 'lxml', 'html.parser']
+
+# Problem statement modals on the listing page have ids like ViewProblemStatement12
+MODAL_ID_PATTERN = re.compile(r'ViewProblemStatement\d+')
+
+
+class ParserBackend:
+    """Base class for HTML parser backends used by the scraper.
+
+    A backend turns raw page bytes into a document that supports the small
+    BeautifulSoup-style API the extraction code relies on: find/find_all
+    (tag name or list of names, attrs with string or compiled regex values,
+    class_), find_parent, get_text, get and str() for the element's HTML.
+    """
+    name = ''
+
+    def is_available(self) -> bool:
+        return True
+
+    def parse(self, content: Union[bytes, str]):
+        raise NotImplementedError
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup with one of its tree builders (html.parser or lxml)."""
+
+    def __init__(self, features: str, module: Optional[str] = None):
+        self.name = features
+        self.features = features
+        self.module = module
+
+    def is_available(self) -> bool:
+        if not self.module:
+            return True
+        try:
+            __import__(self.module)
+            return True
+        except ImportError:
+            return False
+
+    def parse(self, content: Union[bytes, str]):
+        return BeautifulSoup(content, self.features)
+
+
+class LexborElement:
+    """Wrap a selectolax node so it answers the BeautifulSoup calls the scraper makes."""
+    __slots__ = ('node', 'is_document')
+
+    def __init__(self, node, is_document: bool = False):
+        self.node = node
+        self.is_document = is_document
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+    def _selector(self, name, attrs: Dict, class_: Optional[str]) -> str:
+        names = [name] if isinstance(name, str) else list(name or ['*'])
+        suffix = f".{class_}" if class_ else ''
+        for key, value in attrs.items():
+            if isinstance(value, str):
+                escaped = value.replace('"', '\\"')
+                suffix += f'[{key}="{escaped}"]'
+            else:
+                # Regex values are filtered in Python; only require the attribute here
+                suffix += f'[{key}]'
+        return ', '.join(f"{n}{suffix}" for n in names)
+
+    def _matches(self, node, attrs: Dict) -> bool:
+        node_attrs = node.attributes
+        for key, value in attrs.items():
+            if isinstance(value, str):
+                continue
+            actual = node_attrs.get(key)
+            if actual is None or not value.search(actual):
+                return False
+        return True
+
+    def find_all(self, name=None, attrs: Optional[Dict] = None, recursive: bool = True,
+                 class_: Optional[str] = None, **kwargs) -> List['LexborElement']:
+        attrs = dict(attrs or {})
+        attrs.update(kwargs)
+        selector = self._selector(name, attrs, class_)
+        if recursive:
+            nodes = self.node.css(selector)
+            # Unlike find_all, css() on an element also matches the element itself
+            if nodes and not self.is_document and nodes[0].mem_id == self.node.mem_id:
+                nodes = nodes[1:]
+        else:
+            matched = {n.mem_id for n in self.node.css(selector)}
+            nodes = [n for n in self.node.iter() if n.mem_id in matched]
+        return [LexborElement(n) for n in nodes if self._matches(n, attrs)]
+
+    def find(self, name=None, attrs: Optional[Dict] = None, recursive: bool = True,
+             class_: Optional[str] = None, **kwargs) -> Optional['LexborElement']:
+        found = self.find_all(name, attrs, recursive=recursive, class_=class_, **kwargs)
+        return found[0] if found else None
+
+    def find_parent(self, name: str) -> Optional['LexborElement']:
+        parent = self.node.parent
+        while parent is not None:
+            if parent.tag == name:
+                return LexborElement(parent)
+            parent = parent.parent
+        return None
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, key: str, default=None):
+        value = self.node.attributes.get(key)
+        return default if value is None else value
+
+    def text_with_line_breaks(self) -> str:
+        parts = []
+        for node in self.node.traverse(include_text=True):
+            tag = node.tag
+            if tag == '-text':
+                if node.parent is None or node.parent.tag not in ('script', 'style', 'template'):
+                    parts.append(node.text(deep=False))
+            elif tag == 'br' and not node.attributes:
+                parts.append('\n')
+        return ''.join(parts)
+
+    def __str__(self) -> str:
+        return self.node.html or ''
+
+
+class LexborBackend(ParserBackend):
+    """selectolax's lexbor engine: a C HTML5 parser, much faster than html.parser."""
+    name = 'selectolax'
+
+    def is_available(self) -> bool:
+        try:
+            import selectolax.lexbor  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def parse(self, content: Union[bytes, str]):
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(content)
+        return LexborElement(tree.root, is_document=True)
+
+
+BACKENDS: Dict[str, ParserBackend] = {
+    'selectolax': LexborBackend(),
+    'lxml': SoupBackend('lxml', module='lxml'),
+    'html.parser': SoupBackend('html.parser'),
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the parser backends that can be used in this environment."""
+    return [name for name in PREFERRED_BACKENDS if BACKENDS[name].is_available()]
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """Return the requested backend, or the fastest available one.
+
+    The name may also come from the HTML_PARSER environment variable. Unknown
+    or unavailable backends fall back to the stdlib html.parser.
+    """
+    name = (name or os.environ.get('HTML_PARSER') or 'auto').strip().lower()
+    if name == 'auto':
+        return BACKENDS[available_backends()[0]]
+    backend = BACKENDS.get(name)
+    if backend is None:
+        print(f"⚠️  Unknown HTML parser '{name}', using html.parser")
+        return BACKENDS['html.parser']
+    if not backend.is_available():
+        print(f"⚠️  HTML parser '{name}' is not installed, using html.parser")
+        return BACKENDS['html.parser']
+    return backend
+
+
+def text_with_line_breaks(element) -> str:
+    """Text of an element with every attribute-less <br> turned into a newline.
+
+    Walks the already-parsed tree once. The result is the same as the old
+    round trip (str(element), <br> replaced by a newline, re-parsed with
+    html.parser, get_text()): comments, script/style/template strings, <br>
+    tags carrying attributes and anything inside a <template> contribute
+    nothing, with every backend.
+    """
+    if isinstance(element, LexborElement):
+        return element.text_with_line_breaks()
+    parts = []
+    for node in element.descendants:
+        node_type = type(node)
+        if node_type is NavigableString or node_type is CData:
+            parts.append(node)
+        elif node_type is Tag and node.name == 'br' and not node.attrs and not _in_template(node):
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _in_template(node) -> bool:
+    """Whether a BeautifulSoup node sits inside a <template> (whose content is inert)."""
+    parent = node.parent
+    while parent is not None:
+        if parent.name == 'template':
+            return True
+        parent = parent.parent
+    return False
@@ -0,0 +1,208 @@
+import json
+import os
+from typing import Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Order in which JSON libraries are tried when none is requested explicitly
+PREFERRED_BACKENDS = ['orjson', 'msgspec', 'json']
+
+# Fields of the final schema (SIHScraper.normalize_to_final_schema), in output order
+FINAL_FIELDS = ['ps_id', 'title', 'summary', 'description', 'difficulty', 'technology', 'stakeholders',
+                'impact_area', 'data_resource_type', 'solution_type', 'organization', 'department',
+                'category', 'theme']
+# List-valued tag fields of a final record
+TAG_FIELDS = ['technology', 'stakeholders', 'impact_area', 'data_resource_type']
+
+
+class SchemaError(ValueError):
+    """A record does not fit the final schema."""
+
+
+class JsonBackend:
+    """Base class for JSON backends (the stdlib json module).
+
+    dumps() returns UTF-8 bytes. With indent=2 the output is laid out exactly
+    like json.dumps(obj, indent=2, ensure_ascii=False), so files written by
+    any backend are the same bytes, except for floats in exponent notation:
+    orjson writes 1e20 and 1e-7 where json writes 1e+20 and 1e-07 (the same
+    values when read back). With indent=None the output is compact.
+    """
+    name = 'json'
+
+    def is_available(self) -> bool:
+        return True
+
+    def loads(self, data: Union[bytes, str]):
+        return json.loads(data)
+
+    def dumps(self, obj, indent: Optional[int] = 2) -> bytes:
+        separators = None if indent is not None else (',', ':')
+        return json.dumps(obj, indent=indent, ensure_ascii=False, separators=separators).encode('utf-8')
+
+
+class OrjsonBackend(JsonBackend):
+    name = 'orjson'
+
+    def is_available(self) -> bool:
+        return orjson is not None
+
+    def loads(self, data: Union[bytes, str]):
+        return orjson.loads(data)
+
+    def dumps(self, obj, indent: Optional[int] = 2) -> bytes:
+        if indent not in (None, 2):
+            return super().dumps(obj, indent)
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent == 2 else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return super().dumps(obj, indent)
+
+
+class MsgspecBackend(JsonBackend):
+    """msgspec for parsing and compact output; indented output stays with the stdlib for its exact layout."""
+    name = 'msgspec'
+
+    def is_available(self) -> bool:
+        return msgspec is not None
+
+    def loads(self, data: Union[bytes, str]):
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            # Callers catch ValueError, like json.JSONDecodeError (orjson's error is one as well)
+            raise ValueError(str(e)) from e
+
+    def dumps(self, obj, indent: Optional[int] = 2) -> bytes:
+        if indent is not None:
+            return super().dumps(obj, indent)
+        try:
+            return msgspec.json.encode(obj)
+        except TypeError:
+            return super().dumps(obj, indent)
+
+
+BACKENDS = {
+    'orjson': OrjsonBackend(),
+    'msgspec': MsgspecBackend(),
+    'json': JsonBackend(),
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the JSON backends that can be used in this environment."""
+    return [name for name in PREFERRED_BACKENDS if BACKENDS[name].is_available()]
+
+
+def get_json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Return the requested backend, or the fastest available one.
+
+    The name may also come from the JSON_CODEC environment variable. Unknown
+    or unavailable backends fall back to the stdlib json module.
+    """
+    name = (name or os.environ.get('JSON_CODEC') or 'auto').strip().lower()
+    if name == 'auto':
+        return BACKENDS[available_backends()[0]]
+    backend = BACKENDS.get(name)
+    if backend is None:
+        print(f"⚠️  Unknown JSON codec '{name}', using json")
+        return BACKENDS['json']
+    if not backend.is_available():
+        print(f"⚠️  JSON codec '{name}' is not installed, using json")
+        return BACKENDS['json']
+    return backend
+
+
+_backend: Optional[JsonBackend] = None
+
+
+def backend() -> JsonBackend:
+    """The backend used by loads/dumps (chosen once per process)."""
+    global _backend
+    if _backend is None:
+        _backend = get_json_backend()
+    return _backend
+
+
+def loads(data: Union[bytes, str]):
+    return backend().loads(data)
+
+
+def dumps(obj, indent: Optional[int] = 2) -> bytes:
+    return backend().dumps(obj, indent)
+
+
+def read_json(path: str):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+# -------------------- Final schema --------------------
+def coerce_list(value) -> List[str]:
+    """A tag field as a list of non-empty strings (a comma-separated string is split)."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if isinstance(value, str):
+        parts = [p.strip() for p in value.split(',')]
+        return [p for p in parts if p]
+    return []
+
+
+def to_final_schema(record: Dict, strict: bool = False) -> Dict:
+    """A record in the final schema (SIHScraper.normalize_to_final_schema).
+
+    With strict=True, text fields that are not strings and tag fields that
+    are not lists or comma-separated strings raise SchemaError instead of
+    being passed through or dropped.
+    """
+    if not isinstance(record, dict):
+        raise SchemaError(f"Expected a record object, got {type(record).__name__}")
+    final = {}
+    for field in FINAL_FIELDS:
+        value = record.get(field, [] if field in TAG_FIELDS else '')
+        if field in TAG_FIELDS:
+            if strict and value is not None and not isinstance(value, (list, str)):
+                raise SchemaError(f"{record.get('ps_id', '?')}: {field} must be a list, got {type(value).__name__}")
+            final[field] = coerce_list(value)
+        else:
+            if strict and not isinstance(value, str):
+                raise SchemaError(f"{record.get('ps_id', '?')}: {field} must be a string, got {type(value).__name__}")
+            final[field] = value
+    return final
+
+
+def decode_final_records(data: Union[bytes, str], strict: bool = False) -> List[Dict]:
+    """Parse a JSON array of records straight into the final schema.
+
+    Each record comes out as to_final_schema() makes it, plus its
+    submission_count if it has one (as stored in results.json).
+    """
+    raw = loads(data)
+    if not isinstance(raw, list):
+        raise SchemaError(f"Expected a list of records, got {type(raw).__name__}")
+    records = []
+    for item in raw:
+        if not isinstance(item, dict):
+            if strict:
+                raise SchemaError(f"Expected a record object, got {type(item).__name__}")
+            continue
+        record = to_final_schema(item, strict=strict)
+        if 'submission_count' in item:
+            count = item['submission_count']
+            if strict and (not isinstance(count, int) or isinstance(count, bool)):
+                raise SchemaError(f"{record['ps_id'] or '?'}: submission_count must be an integer")
+            record['submission_count'] = count
+        records.append(record)
+    return records
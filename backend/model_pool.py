@@ -0,0 +1,34 @@
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class ModelPool:
+    """
+    One model handle per (model name, generation settings) for the whole process.
+
+    Handles are built by factory(model, **settings) the first time they
+    are asked for and shared by every later call, from any thread or
+    coroutine, so no request pays for building a model and its config.
+    Handles of one client library share that library's connections, which
+    stay open between requests.
+    """
+
+    def __init__(self, factory: Callable[..., Any]):
+        self.factory = factory
+        self.created = 0
+        self._handles: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str, **settings) -> Any:
+        key = (model, tuple(sorted(settings.items())))
+        handle = self._handles.get(key)
+        if handle is None:
+            with self._lock:
+                handle = self._handles.get(key)
+                if handle is None:
+                    handle = self._handles[key] = self.factory(model, **settings)
+                    self.created += 1
+        return handle
+
+    def __len__(self) -> int:
+        return len(self._handles)
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import time
+from typing import Dict, Optional
+
+try:
+    from .json_codec import dumps, read_json  # if run as a module
+    from .results_writer import atomic_write_bytes
+except ImportError:
+    from json_codec import dumps, read_json  # if run directly from backend/
+    from results_writer import atomic_write_bytes
+
+# On-disk cache location and freshness window (seconds) for listing pages.
+# With a TTL of 0 every run revalidates with a conditional GET.
+PAGE_CACHE_DIR = os.environ.get("PAGE_CACHE_DIR", ".page_cache")
+PAGE_CACHE_TTL_SEC = float(os.environ.get("PAGE_CACHE_TTL_SEC", "0"))
+
+
+class CachedPage:
+    """Body of a fetched page plus where it came from ('fresh', 'not-modified' or 'downloaded')."""
+
+    def __init__(self, url: str, content: bytes, fetched_at: float, status: str):
+        self.url = url
+        self.content = content
+        self.fetched_at = fetched_at
+        self.status = status
+        self.sha256 = hashlib.sha256(content).hexdigest()
+
+
+class PageCache:
+    """
+    Conditional-GET cache for listing pages.
+
+    Each URL keeps its last body, its ETag/Last-Modified validators and the
+    extraction results computed from that body. Within the TTL the cached
+    body is used without touching the network; after that the page is
+    revalidated with If-None-Match/If-Modified-Since and a 304 reuses both
+    the body and its cached extraction results, so nothing is re-parsed.
+    """
+
+    def __init__(self, cache_dir: str = PAGE_CACHE_DIR, ttl_seconds: float = PAGE_CACHE_TTL_SEC):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def _read_json(self, path: str) -> Dict:
+        try:
+            if os.path.exists(path):
+                return read_json(path)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cache file {path}: {e}")
+        return {}
+
+    def _write_json(self, path: str, data: Dict) -> None:
+        atomic_write_bytes(path, dumps(data, indent=None))
+
+    def _load_body(self, url: str) -> Optional[bytes]:
+        body_path = self._path(url, '.html')
+        if not os.path.exists(body_path):
+            return None
+        with open(body_path, 'rb') as f:
+            return f.read()
+
+    def fetch(self, session, url: str, force_refresh: bool = False, timeout: int = 30) -> CachedPage:
+        """GET url through the cache; force_refresh skips the TTL and the validators."""
+        meta_path = self._path(url, '.json')
+        meta = {} if force_refresh else self._read_json(meta_path)
+        body = self._load_body(url) if meta else None
+
+        if body is not None and time.time() - meta.get('fetched_at', 0) < self.ttl_seconds:
+            return CachedPage(url, body, meta['fetched_at'], 'fresh')
+
+        headers = {}
+        if body is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, timeout=timeout, headers=headers)
+        now = time.time()
+        if response.status_code == 304 and body is not None:
+            meta['fetched_at'] = now
+            self._write_json(meta_path, meta)
+            return CachedPage(url, body, now, 'not-modified')
+        response.raise_for_status()
+
+        page = CachedPage(url, response.content, now, 'downloaded')
+        atomic_write_bytes(self._path(url, '.html'), response.content)
+        self._write_json(meta_path, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now,
+            'sha256': page.sha256,
+        })
+        return page
+
+    def load_parse_result(self, url: str, sha256: str, variant: str) -> Dict:
+        """Cached extraction results for this exact body and parser variant ({} if none)."""
+        cached = self._read_json(self._path(url, '.extract.json'))
+        if cached.get('sha256') != sha256:
+            return {}
+        return cached.get('results', {}).get(variant, {})
+
+    def save_parse_result(self, url: str, sha256: str, variant: str, **fields) -> None:
+        """Store extraction results for a body; results for an older body are dropped."""
+        path = self._path(url, '.extract.json')
+        cached = self._read_json(path)
+        if cached.get('sha256') != sha256:
+            cached = {'sha256': sha256, 'results': {}}
+        cached['results'].setdefault(variant, {}).update(fields)
+        try:
+            self._write_json(path, cached)
+        except Exception as e:
+            print(f"Warning: Failed to cache parse result for {url}: {e}")
@@ -0,0 +1,54 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .html_parsers import MODAL_ID_PATTERN  # if run as a module
+except ImportError:
+    from html_parsers import MODAL_ID_PATTERN  # if run directly from backend/
+
+# Per-process scraper used by the pool workers (created once by _init_worker)
+_worker_scraper = None
+
+
+def _init_worker(parser_name: str) -> None:
+    global _worker_scraper
+    try:
+        from .scraper import SIHScraper
+    except ImportError:
+        from scraper import SIHScraper
+    _worker_scraper = SIHScraper(parser=parser_name, use_cache=False)
+
+
+def modal_fragment(modal) -> Tuple[str, str, bool]:
+    """Raw HTML a worker needs for one modal: its listing row if it has one, else the modal itself."""
+    table_row = modal.find_parent('tr')
+    if table_row is not None:
+        return str(table_row), modal.get('id', ''), True
+    return str(modal), modal.get('id', ''), False
+
+
+def _extract_fragment(fragment: Tuple[str, str, bool]) -> Tuple[Optional[Dict], Dict]:
+    html, modal_id, is_row = fragment
+    try:
+        # HTML5 parsers drop a bare <tr>, so rows are re-wrapped in a table
+        doc = _worker_scraper.parse_html(f"<table>{html}</table>" if is_row else html)
+        modal = doc.find('div', {'id': modal_id})
+        if modal is None:
+            modal = doc.find('div', {'id': MODAL_ID_PATTERN})
+        if modal is None:
+            return None, {}
+        return _worker_scraper.extract_modal(modal)
+    except Exception as e:
+        print(f"✗ Error extracting problem: {e}")
+        return None, {}
+
+
+def extract_fragments_parallel(fragments: List[Tuple[str, str, bool]], parser_name: str,
+                               workers: int) -> List[Tuple[Optional[Dict], Dict]]:
+    """Extract modal fragments on a process pool; results come back in input order."""
+    if not fragments:
+        return []
+    # A few chunks per worker balances load without paying IPC per modal
+    chunksize = max(1, len(fragments) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(parser_name,)) as executor:
+        return list(executor.map(_extract_fragment, fragments, chunksize=chunksize))
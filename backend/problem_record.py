@@ -0,0 +1,111 @@
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .json_codec import FINAL_FIELDS, TAG_FIELDS  # if run as a module
+except ImportError:
+    from json_codec import FINAL_FIELDS, TAG_FIELDS  # if run directly from backend/
+
+# Fields that take one of a small set of values across all records
+CATEGORICAL_FIELDS = ['difficulty', 'solution_type', 'organization', 'department', 'category', 'theme']
+
+_UNSET = object()
+# Identical tag lists share one tuple (most problems repeat a handful of combinations)
+_shared_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _tag_tuple(values) -> Tuple[str, ...]:
+    values = tuple(_intern(v) for v in values)
+    return _shared_tuples.setdefault(values, values)
+
+
+class ProblemRecord:
+    """
+    Compact, slotted form of a final-schema record.
+
+    Categorical strings (theme, category, organization, ...) and tag values
+    are interned, and tag lists are stored as shared tuples, so a large
+    result set holds each distinct value once. submission_count and any
+    other fields outside the final schema are kept, and fields missing from
+    the dict stay missing, so to_dict() returns a record equal to the one
+    given to from_dict(). ResultsRepository holds its loaded records in
+    this form.
+    """
+
+    __slots__ = tuple(FINAL_FIELDS) + ('submission_count', 'extra')
+
+    def __init__(self, ps_id: str = '', title: str = '', summary: str = '', description: str = '',
+                 difficulty: str = '', technology: Sequence[str] = (), stakeholders: Sequence[str] = (),
+                 impact_area: Sequence[str] = (), data_resource_type: Sequence[str] = (),
+                 solution_type: str = '', organization: str = '', department: str = '',
+                 category: str = '', theme: str = '', submission_count=_UNSET, extra: Optional[Dict] = None):
+        self.ps_id = ps_id
+        self.title = title
+        self.summary = summary
+        self.description = description
+        self.technology = technology
+        self.stakeholders = stakeholders
+        self.impact_area = impact_area
+        self.data_resource_type = data_resource_type
+        for field in TAG_FIELDS:
+            value = getattr(self, field)
+            # Odd values (a bare string, None) are kept as they are so conversion stays lossless
+            if isinstance(value, (list, tuple)):
+                setattr(self, field, _tag_tuple(value))
+        self.difficulty = _intern(difficulty)
+        self.solution_type = _intern(solution_type)
+        self.organization = _intern(organization)
+        self.department = _intern(department)
+        self.category = _intern(category)
+        self.theme = _intern(theme)
+        self.submission_count = submission_count
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> 'ProblemRecord':
+        """Build from a final-schema record (as in results.json)."""
+        fields = {field: record.get(field, _UNSET) for field in FINAL_FIELDS}
+        extra = {k: v for k, v in record.items() if k not in FINAL_FIELDS and k != 'submission_count'}
+        return cls(**fields, submission_count=record.get('submission_count', _UNSET), extra=extra)
+
+    def to_dict(self) -> Dict:
+        """The record in the final schema, followed by submission_count and any extra fields."""
+        record = {}
+        for field in FINAL_FIELDS:
+            value = getattr(self, field)
+            if value is not _UNSET:
+                record[field] = list(value) if isinstance(value, tuple) else value
+        if self.submission_count is not _UNSET:
+            record['submission_count'] = self.submission_count
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def get(self, field: str, default=None):
+        """dict.get() over the record's fields, without converting it."""
+        if field in self.__slots__ and field != 'extra':
+            value = getattr(self, field)
+            return default if value is _UNSET else value
+        return self.extra.get(field, default) if self.extra else default
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ProblemRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        # Missing fields show as None; a title that is not a string is shown as it is
+        title = self.get('title')
+        if isinstance(title, str):
+            title = title[:40]
+        return f"ProblemRecord(ps_id={self.get('ps_id')!r}, title={title!r})"
+
+
+def records_from_dicts(records: Iterable[Dict]) -> List[ProblemRecord]:
+    return [ProblemRecord.from_dict(r) for r in records if isinstance(r, dict)]
+
+
+def records_to_dicts(records: Iterable[ProblemRecord]) -> List[Dict]:
+    return [r.to_dict() for r in records]
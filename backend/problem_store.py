@@ -0,0 +1,275 @@
+import os
+import re
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .json_codec import TAG_FIELDS, dumps, loads  # if run as a module
+    from .results_writer import RESULTS_COMPACT_EVERY, ResultsJournal, append_records, is_ndjson, write_records
+except ImportError:
+    from json_codec import TAG_FIELDS, dumps, loads  # if run directly from backend/
+    from results_writer import RESULTS_COMPACT_EVERY, ResultsJournal, append_records, is_ndjson, write_records
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    id INTEGER PRIMARY KEY,
+    ps_id TEXT NOT NULL UNIQUE,
+    numeric_id INTEGER,
+    title TEXT,
+    organization TEXT,
+    category TEXT,
+    theme TEXT,
+    submission_count INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_problems_numeric_id ON problems(numeric_id);
+CREATE INDEX IF NOT EXISTS idx_problems_theme ON problems(theme);
+CREATE INDEX IF NOT EXISTS idx_problems_category ON problems(category);
+CREATE INDEX IF NOT EXISTS idx_problems_organization ON problems(organization);
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    field TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE(field, name)
+);
+CREATE TABLE IF NOT EXISTS problem_tags (
+    problem_id INTEGER NOT NULL REFERENCES problems(id) ON DELETE CASCADE,
+    tag_id INTEGER NOT NULL REFERENCES tags(id),
+    PRIMARY KEY (problem_id, tag_id)
+);
+CREATE INDEX IF NOT EXISTS idx_problem_tags_tag ON problem_tags(tag_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def store_path_for(results_path: str) -> str:
+    """SQLite file that backs a results file, e.g. results.json -> results.json.db.
+
+    The whole file name is kept so results.json and results.ndjson never share a database.
+    """
+    return results_path + '.db'
+
+
+def _numeric_id(value) -> Optional[int]:
+    match = re.search(r'(\d{3,})', str(value or ''))
+    return int(match.group(1)) if match else None
+
+
+def _record_key(record: Dict) -> str:
+    """Row key: the record's ps_id, or its PS code/title for records without one."""
+    return str(record.get('ps_id') or record.get('ps_code') or f"alt:{record.get('title', '')}")
+
+
+class ProblemStore:
+    """
+    SQLite-backed store for classified problem records (one database per results file).
+
+    Records keep their full JSON in `data`; ps_id, theme, category and
+    organization are indexed columns and the tag lists live in join tables,
+    so single fields can be updated and queried without touching the rest.
+    results.json is an export of this store: small batches of changes are
+    appended to its journal (see ResultsJournal) and compacted into the file
+    every RESULTS_COMPACT_EVERY entries. If the file was changed by something
+    else since the last export (a git pull, a hand edit), it is imported
+    again when the store is opened. An NDJSON results file (results.ndjson)
+    is imported as a stream, and newly added problems are appended to it
+    as lines.
+    """
+
+    def __init__(self, results_path: str = 'results.json', db_path: Optional[str] = None):
+        self.results_path = results_path
+        self.db_path = db_path or store_path_for(results_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        self.journal = ResultsJournal(results_path)
+        # Journal entries for the writes since the last export, and the records among them that were new
+        self._changes: List[Dict] = []
+        self._inserted: List[Dict] = []
+        self.sync_from_json()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def transaction(self):
+        """Context manager that commits the enclosed writes together (or rolls them back)."""
+        return self.conn
+
+    # -------------------- results.json import/export --------------------
+    def _json_stamp(self) -> Optional[str]:
+        try:
+            st = os.stat(self.results_path)
+            return f"{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            return None
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def sync_from_json(self) -> None:
+        """Import results.json if it differs from what this store last exported or imported."""
+        stamp = self._json_stamp()
+        if stamp is None or stamp == self._get_meta('json_stamp'):
+            return
+        imported = 0
+        try:
+            # Streamed: only one record of the file is decoded at a time
+            with self.conn:
+                self.conn.execute('DELETE FROM problem_tags')
+                self.conn.execute('DELETE FROM problems')
+                for record in self.journal.iter_load():
+                    if isinstance(record, dict):
+                        self.upsert(record)
+                        imported += 1
+                self._set_meta('json_stamp', stamp)
+        except Exception as e:
+            print(f"Warning: Could not import {self.results_path} into {self.db_path}: {e}")
+            return
+        finally:
+            self._changes, self._inserted = [], []
+        print(f"📥 Imported {imported} records from {self.results_path} into {self.db_path}")
+
+    def export_json(self, path: Optional[str] = None, compact: bool = False) -> int:
+        """Bring results.json up to date (same layout as before); returns the record count.
+
+        Changes since the last export are appended to the journal while it is
+        small; otherwise the file is rewritten atomically. For an NDJSON file,
+        a batch that only adds problems is appended to it. compact=True leaves
+        no journal behind, so the file is complete on its own (e.g. before it
+        is copied to the frontend). A path other than the results file gets a
+        full copy in its own format.
+        """
+        self.conn.commit()
+        if path and path != self.results_path:
+            return write_records(path, self.iter_records())
+        changes, self._changes = self._changes, []
+        inserted, self._inserted = self._inserted, []
+        base_current = self._json_stamp() is not None and self._json_stamp() == self._get_meta('json_stamp')
+        pending = len(self.journal)
+        if compact and base_current and not changes and not pending:
+            return self.count()
+        if (base_current and is_ndjson(self.results_path) and changes
+                and len(inserted) == len(changes) and not pending):
+            append_records(self.results_path, inserted)
+            with self.conn:
+                self._set_meta('json_stamp', self._json_stamp())
+            return self.count()
+        if (not compact and base_current and RESULTS_COMPACT_EVERY > 0
+                and pending + len(changes) <= RESULTS_COMPACT_EVERY):
+            self.journal.append(changes)
+            return self.count()
+        count = self.journal.compact(self.iter_records())
+        with self.conn:
+            self._set_meta('json_stamp', self._json_stamp())
+        return count
+
+    # -------------------- Reads --------------------
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM problems').fetchone()[0]
+
+    def records(self) -> List[Dict]:
+        """All records in insertion order."""
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator[Dict]:
+        """All records in insertion order, decoded one at a time."""
+        for row in self.conn.execute('SELECT data FROM problems ORDER BY id'):
+            yield loads(row[0])
+
+    def get(self, ps_id: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT data FROM problems WHERE ps_id = ?', (str(ps_id),)).fetchone()
+        return loads(row[0]) if row else None
+
+    def find(self, ps_id: str) -> Optional[Dict]:
+        """Record with this ps_id, or with the same numeric PS ID in another format ('25001' vs 'SIH25001')."""
+        record = self.get(ps_id)
+        num = _numeric_id(ps_id)
+        if record is None and num is not None:
+            row = self.conn.execute('SELECT data FROM problems WHERE numeric_id = ? ORDER BY id LIMIT 1', (num,)).fetchone()
+            record = loads(row[0]) if row else None
+        return record
+
+    def max_numeric_id(self) -> Optional[int]:
+        return self.conn.execute('SELECT MAX(numeric_id) FROM problems').fetchone()[0]
+
+    def submission_counts(self) -> List[Tuple[str, Optional[int], Optional[int]]]:
+        """(ps_id, numeric PS ID, submission_count) for every record, in insertion order."""
+        return self.conn.execute('SELECT ps_id, numeric_id, submission_count FROM problems ORDER BY id').fetchall()
+
+    def search(self, theme: Optional[str] = None, category: Optional[str] = None,
+               organization: Optional[str] = None, tag: Optional[Tuple[str, str]] = None) -> List[Dict]:
+        """Records matching every given filter; tag is a (field, name) pair, e.g. ('technology', 'Blockchain')."""
+        sql, params = 'SELECT p.data FROM problems p', []
+        if tag:
+            sql += ' JOIN problem_tags pt ON pt.problem_id = p.id JOIN tags t ON t.id = pt.tag_id AND t.field = ? AND t.name = ?'
+            params += list(tag)
+        clauses = [(column, value) for column, value in (('theme', theme), ('category', category),
+                                                         ('organization', organization)) if value is not None]
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(f'p.{column} = ?' for column, _ in clauses)
+            params += [value for _, value in clauses]
+        return [loads(row[0]) for row in self.conn.execute(sql + ' ORDER BY p.id', params)]
+
+    # -------------------- Writes --------------------
+    def _set_tags(self, problem_id: int, record: Dict) -> None:
+        self.conn.execute('DELETE FROM problem_tags WHERE problem_id = ?', (problem_id,))
+        for field in TAG_FIELDS:
+            values = record.get(field) or []
+            for name in (values if isinstance(values, list) else [values]):
+                self.conn.execute('INSERT OR IGNORE INTO tags (field, name) VALUES (?, ?)', (field, str(name)))
+                self.conn.execute('INSERT OR IGNORE INTO problem_tags (problem_id, tag_id) '
+                                  'SELECT ?, id FROM tags WHERE field = ? AND name = ?', (problem_id, field, str(name)))
+
+    def upsert(self, record: Dict, match_ps_id: Optional[str] = None) -> bool:
+        """Insert or replace one record (matched by match_ps_id or its own ps_id); returns False if unchanged."""
+        key = _record_key(record)
+        data = dumps(record, indent=None).decode('utf-8')
+        row = self.conn.execute('SELECT id, data FROM problems WHERE ps_id = ?', (str(match_ps_id or key),)).fetchone()
+        columns = (key, _numeric_id(record.get('ps_id') or record.get('ps_code')), record.get('title'),
+                   record.get('organization'), record.get('category'), record.get('theme'),
+                   record.get('submission_count'), data)
+        if row is None:
+            cursor = self.conn.execute('INSERT INTO problems (ps_id, numeric_id, title, organization, category, theme, '
+                                       'submission_count, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', columns)
+            self._set_tags(cursor.lastrowid, record)
+            self._changes.append({'op': 'upsert', 'ps_id': str(match_ps_id or key), 'record': record})
+            self._inserted.append(record)
+            return True
+        problem_id, old_data = row
+        old = loads(old_data)
+        # Compared as values: rows edited by json_set() are stored in SQLite's own layout
+        if old_data == data or old == record:
+            return False
+        self.conn.execute('UPDATE problems SET ps_id = ?, numeric_id = ?, title = ?, organization = ?, category = ?, '
+                          'theme = ?, submission_count = ?, data = ? WHERE id = ?', columns + (problem_id,))
+        if any(old.get(field) != record.get(field) for field in TAG_FIELDS):
+            self._set_tags(problem_id, record)
+        self._changes.append({'op': 'upsert', 'ps_id': str(match_ps_id or key), 'record': record})
+        return True
+
+    def set_submission_count(self, ps_id: str, count: int) -> bool:
+        """Single-row update of one record's submission_count; returns False if it already had that value."""
+        cursor = self.conn.execute(
+            "UPDATE problems SET submission_count = ?, data = json_set(data, '$.submission_count', ?) "
+            "WHERE ps_id = ? AND submission_count IS NOT ?", (count, count, str(ps_id), count))
+        if cursor.rowcount:
+            self._changes.append({'op': 'set', 'ps_id': str(ps_id), 'fields': {'submission_count': count}})
+        return cursor.rowcount > 0
+
+    def rename(self, old_ps_id: str, new_ps_id: str) -> bool:
+        """Change a record's ps_id in place (keeps its position and tags)."""
+        cursor = self.conn.execute(
+            "UPDATE problems SET ps_id = ?, data = json_set(data, '$.ps_id', ?) WHERE ps_id = ?",
+            (str(new_ps_id), str(new_ps_id), str(old_ps_id)))
+        if cursor.rowcount:
+            self._changes.append({'op': 'rename', 'ps_id': str(old_ps_id), 'to': str(new_ps_id)})
+        return cursor.rowcount > 0
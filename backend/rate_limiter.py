@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    A bucket refilled continuously at rate_per_minute, holding at most capacity.
+
+    reserve() always takes the amount, going into debt if the bucket is
+    short, and returns how long the caller has to wait for the debt to be
+    repaid. Callers are served in the order they reserve, and a large
+    amount (more than the capacity) is let through once it has been earned.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, float(capacity))
+        self.clock = clock
+        self.level = self.capacity
+        self.updated = clock()
+
+    def _refill(self, now: float) -> None:
+        # now may be before the last update (a reservation for a later send time); the level is linear in time
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float = 1.0, now: Optional[float] = None) -> float:
+        """Seconds until amount would be available (without taking it)."""
+        now = self.clock() if now is None else now
+        self._refill(now)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def reserve(self, amount: float = 1.0, now: Optional[float] = None) -> float:
+        wait = self.wait_time(amount, now)
+        self.level -= amount
+        return wait
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget shared by every Gemini call.
+
+    Each call (first attempts and retries alike) draws from the same two
+    token buckets right before it is sent, so the limit holds however the
+    calls are spread over threads, and capacity freed by a slow call is
+    used by the next one instead of waiting for a fixed batch interval.
+    burst is how many requests may go out back to back after an idle
+    period; with the default of 1 requests are spaced evenly, which
+    sustains exactly requests_per_minute without ever exceeding it in
+    any one-minute window.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = 0, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+        self.sleep = sleep
+        self.requests = TokenBucket(requests_per_minute, burst, clock)
+        # A burst of tokens is the share of `burst` average-sized requests
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute * burst / requests_per_minute, clock) \
+            if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Take one request (and `tokens` tokens) from the budget; returns the seconds to wait before sending."""
+        with self._lock:
+            now = self.clock()
+            wait = self.requests.wait_time(1, now)
+            if self.tokens is not None and tokens:
+                wait = max(wait, self.tokens.wait_time(tokens, now))
+            # Both buckets are charged at the send time, when each has enough
+            self.requests.reserve(1, now + wait)
+            if self.tokens is not None and tokens:
+                self.tokens.reserve(tokens, now + wait)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request with `tokens` tokens may be sent; returns the seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """acquire() for coroutines: waits without blocking the event loop."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size in tokens (about 4 characters per token for English text)."""
+    return len(text) // 4 + 1
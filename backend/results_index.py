@@ -0,0 +1,278 @@
+import argparse
+import bisect
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    from .json_codec import loads  # if run as a module
+    from .problem_store import _numeric_id, _record_key
+    from .results_writer import RESULTS_FILE, ResultsJournal, atomic_write_bytes, is_ndjson
+except ImportError:
+    from json_codec import loads  # if run directly from backend/
+    from problem_store import _numeric_id, _record_key
+    from results_writer import RESULTS_FILE, ResultsJournal, atomic_write_bytes, is_ndjson
+
+# Index file layout: header (magic, data file mtime_ns, data file size, entry count),
+# then one (numeric PS ID, byte offset, byte length) entry per line, sorted by PS ID
+MAGIC = b'SIHIDX1\0'
+HEADER = struct.Struct('<8sqqq')
+ENTRY = struct.Struct('<qQI')
+
+
+class _Keys:
+    """The PS IDs of an index as a read-only sequence, so bisect can search the mapped file."""
+
+    def __init__(self, buf, count: int):
+        self.buf = buf
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> int:
+        return ENTRY.unpack_from(self.buf, HEADER.size + i * ENTRY.size)[0]
+
+
+class ResultsIndex:
+    """
+    Sidecar index of an NDJSON results file (results.ndjson.idx).
+
+    Maps each numeric PS ID to the byte offset and length of its line, sorted
+    by PS ID. The index is memory-mapped and binary-searched, so reading one
+    record or a range of PS IDs does not parse the rest of the file. It is
+    rebuilt on first use after the results file's mtime or size changes.
+    Pending journal entries (see ResultsJournal) are applied to what is read.
+    """
+
+    def __init__(self, results_path: str = RESULTS_FILE):
+        if not is_ndjson(results_path):
+            raise ValueError(f"{results_path} is not an NDJSON results file; the index needs one record per line")
+        self.results_path = results_path
+        self.path = f"{results_path}.idx"
+        self._file = None
+        self._map = None
+        self._keys: Optional[_Keys] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._overlay = None
+        self._overlay_stamp = None
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._file = self._map = self._keys = self._stamp = None
+
+    def _data_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.results_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_header(self) -> Optional[Tuple[Tuple[int, int], int]]:
+        try:
+            with open(self.path, 'rb') as f:
+                magic, mtime_ns, size, count = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        if magic != MAGIC:
+            return None
+        return (mtime_ns, size), count
+
+    def rebuild(self) -> int:
+        """Scan the results file and write the index; returns the number of indexed records."""
+        self.close()
+        stamp = self._data_stamp()
+        positions: Dict[int, Tuple[int, int]] = {}
+        offset = 0
+        with open(self.results_path, 'rb') as f:
+            for line in f:
+                length = len(line)
+                if line.strip():
+                    try:
+                        record = loads(line)
+                    except ValueError:
+                        if line.endswith(b'\n'):
+                            raise
+                        break  # torn last line
+                    num = _numeric_id(record.get('ps_id') or record.get('ps_code')) if isinstance(record, dict) else None
+                    if num is not None:
+                        # A later line for the same PS ID wins, as on import
+                        positions[num] = (offset, length)
+                offset += length
+        entries = sorted(positions.items())
+        data = bytearray(HEADER.pack(MAGIC, stamp[0], stamp[1], len(entries)))
+        for num, (start, length) in entries:
+            data += ENTRY.pack(num, start, length)
+        atomic_write_bytes(self.path, bytes(data))
+        return len(entries)
+
+    def _ensure(self) -> bool:
+        """Map an up-to-date index; False if there is no results file."""
+        stamp = self._data_stamp()
+        if stamp is None:
+            self.close()
+            return False
+        if self._map is not None and self._stamp == stamp:
+            return True
+        header = self._read_header()
+        if header is None or header[0] != stamp:
+            self.rebuild()
+            header = self._read_header()
+        self.close()
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._keys = _Keys(self._map, header[1])
+        self._stamp = stamp
+        return True
+
+    def __len__(self) -> int:
+        return len(self._keys) if self._ensure() else 0
+
+    def _entry(self, i: int) -> Tuple[int, int, int]:
+        return ENTRY.unpack_from(self._map, HEADER.size + i * ENTRY.size)
+
+    def _locate(self, num: int) -> Optional[Tuple[int, int]]:
+        i = bisect.bisect_left(self._keys, num)
+        if i < len(self._keys) and self._keys[i] == num:
+            return self._entry(i)[1:]
+        return None
+
+    def _read(self, f, offset: int, length: int) -> Dict:
+        f.seek(offset)
+        return loads(f.read(length))
+
+    def _read_file_record(self, num: int) -> Optional[Dict]:
+        position = self._locate(num)
+        if position is None:
+            return None
+        with open(self.results_path, 'rb') as f:
+            return self._read(f, *position)
+
+    # -------------------- Journal overlay --------------------
+    def _journal_overlay(self) -> Tuple[set, Dict[int, Dict]]:
+        """(PS IDs of file records the journal touches, numeric PS ID -> record as the journal leaves it).
+
+        Built once per state of the results file and the journal, so a read
+        costs a stat of the journal. Checking the journal against its base
+        hashes the results file only when that file has changed (see
+        file_sha256).
+        """
+        journal = ResultsJournal(self.results_path)
+        try:
+            st = os.stat(journal.path)
+            stamp = (self._stamp, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return set(), {}
+        if self._overlay is not None and self._overlay_stamp == stamp:
+            return self._overlay
+        touched, records = set(), {}
+        with open(self.results_path, 'rb') as f:
+            for base_key, entries in journal.grouped().items():
+                base_num = _numeric_id(base_key)
+                position = self._locate(base_num) if base_num is not None else None
+                base = self._read(f, *position) if position is not None else None
+                if base is not None and _record_key(base) != base_key:
+                    base = None
+                if base is not None:
+                    touched.add(base_num)
+                record = ResultsJournal._replay(base, entries)
+                num = _numeric_id(record.get('ps_id') or record.get('ps_code')) if record is not None else None
+                if num is not None:
+                    records[num] = record
+        self._overlay, self._overlay_stamp = (touched, records), stamp
+        return self._overlay
+
+    # -------------------- Reads --------------------
+    def get(self, ps_id) -> Optional[Dict]:
+        """Record with this numeric PS ID ('25001' or 'SIH25001'), or None."""
+        num = _numeric_id(ps_id)
+        if num is None or not self._ensure():
+            return None
+        touched, overlay = self._journal_overlay()
+        if num in overlay:
+            return dict(overlay[num])
+        if num in touched:
+            return None  # renamed away by the journal
+        return self._read_file_record(num)
+
+    def range(self, start=None, end=None) -> Iterator[Dict]:
+        """Records whose numeric PS ID is between start and end (inclusive, either may be None), in PS ID order."""
+        if not self._ensure():
+            return
+        low = _numeric_id(start) if start is not None else None
+        high = _numeric_id(end) if end is not None else None
+        touched, overlay = self._journal_overlay()
+        extra = sorted((n, r) for n, r in overlay.items()
+                       if (low is None or n >= low) and (high is None or n <= high))
+        extra_pos = 0
+        i = bisect.bisect_left(self._keys, low) if low is not None else 0
+        with open(self.results_path, 'rb') as f:
+            while i < len(self._keys):
+                num, offset, length = self._entry(i)
+                if high is not None and num > high:
+                    break
+                while extra_pos < len(extra) and extra[extra_pos][0] < num:
+                    yield dict(extra[extra_pos][1])
+                    extra_pos += 1
+                i += 1
+                if num in touched or num in overlay:
+                    continue
+                yield self._read(f, offset, length)
+        for _, record in extra[extra_pos:]:
+            yield dict(record)
+
+    def max_id(self) -> Optional[int]:
+        """Highest numeric PS ID in the results file (journal included)."""
+        if not self._ensure():
+            return None
+        touched, overlay = self._journal_overlay()
+        for i in range(len(self._keys) - 1, -1, -1):
+            num = self._keys[i]
+            if num not in touched:
+                return max([num] + list(overlay))
+        return max(overlay) if overlay else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PS ID offset index of an NDJSON results file')
+    parser.add_argument('command', choices=['status', 'rebuild', 'get', 'range'])
+    parser.add_argument('ids', nargs='*', help='get: PS ID; range: START [END]')
+    parser.add_argument('--results-file', type=str, default=RESULTS_FILE)
+    args = parser.parse_args()
+
+    try:
+        index = ResultsIndex(args.results_file)
+    except ValueError as e:
+        print(f"❌ {e} (set RESULTS_FORMAT=ndjson or use results_writer.py convert)")
+        return
+    if not os.path.exists(args.results_file):
+        print(f"❌ Results file not found: {args.results_file}")
+        return
+    if args.command == 'rebuild':
+        print(f"🗂️  Indexed {index.rebuild()} records of {args.results_file} in {index.path}")
+    elif args.command == 'status':
+        print(f"🗂️  {index.path}: {len(index)} records, highest PS ID {index.max_id()}")
+    elif args.command == 'get':
+        if len(args.ids) != 1:
+            parser.error('get needs one PS ID')
+        record = index.get(args.ids[0])
+        if record is None:
+            print(f"❌ {args.ids[0]} not found")
+        else:
+            print(f"{record.get('ps_id')}: {record.get('title', '')} (Submissions: {record.get('submission_count', 'N/A')})")
+    else:
+        if not 1 <= len(args.ids) <= 2:
+            parser.error('range needs START [END]')
+        count = 0
+        for record in index.range(*args.ids):
+            count += 1
+            print(f"{record.get('ps_id')}: {record.get('title', '')[:70]}")
+        print(f"📋 {count} records")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
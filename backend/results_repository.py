@@ -0,0 +1,235 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .problem_record import ProblemRecord  # if run as a module
+    from .problem_store import ProblemStore, _numeric_id, _record_key
+    from .results_index import ResultsIndex
+    from .results_writer import ResultsJournal, is_ndjson
+except ImportError:
+    from problem_record import ProblemRecord  # if run directly from backend/
+    from problem_store import ProblemStore, _numeric_id, _record_key
+    from results_index import ResultsIndex
+    from results_writer import ResultsJournal, is_ndjson
+
+# One repository per results file for the whole process (see ResultsRepository.for_path)
+_repositories: Dict[str, 'ResultsRepository'] = {}
+_registry_lock = threading.Lock()
+
+
+class ResultsRepository:
+    """
+    In-memory view of a results file, loaded once per process and shared by every module.
+
+    Records are read from the problem store on first use and kept as an
+    ordered ps_id -> ProblemRecord dict (interned categorical values and
+    shared tag tuples) together with the highest numeric PS ID; reads hand
+    out plain dict copies.
+    Changes are applied in memory and queued; flush() writes the queued
+    changes to the store in one transaction and brings results.json up to
+    date, so a run costs one read and one write however many steps it has.
+
+    stream() reads records one at a time without loading them, and writes
+    made before anything is loaded are only queued, so a streaming consumer
+    never holds the whole dataset. For an NDJSON results file, get(), find()
+    and max_numeric_id go through its PS ID offset index (see ResultsIndex)
+    until the records are loaded.
+    """
+
+    def __init__(self, results_path: str = 'results.json'):
+        self.results_path = results_path
+        self._records: Optional[Dict[str, ProblemRecord]] = None
+        self._by_numeric: Dict[int, str] = {}
+        self._max_numeric: Optional[int] = None
+        # Queued changes, as ResultsJournal entries
+        self._pending: List[Dict] = []
+        self._offsets: Optional[ResultsIndex] = None
+
+    @classmethod
+    def for_path(cls, results_path: str = 'results.json') -> 'ResultsRepository':
+        """The process-wide repository for a results file."""
+        key = os.path.abspath(results_path)
+        with _registry_lock:
+            if key not in _repositories:
+                _repositories[key] = cls(results_path)
+            return _repositories[key]
+
+    def exists(self) -> bool:
+        return self._records is not None or os.path.exists(self.results_path)
+
+    def _index(self, key: str, record) -> None:
+        num = _numeric_id(record.get('ps_id') or record.get('ps_code'))
+        if num is not None:
+            self._by_numeric.setdefault(num, key)
+            self._max_numeric = num if self._max_numeric is None else max(self._max_numeric, num)
+
+    def load(self) -> Dict[str, ProblemRecord]:
+        """ps_id -> record, in file order (read from the store on first call only)."""
+        if self._records is None:
+            loaded: Dict[str, ProblemRecord] = {}
+            store = ProblemStore(self.results_path) if os.path.exists(self.results_path) else None
+            try:
+                if self._pending:
+                    # Changes queued before the load are replayed over the stored dicts
+                    records = store.records() if store is not None else []
+                    ResultsJournal.apply(records, [dict(e, record=dict(e['record'])) if e['op'] == 'upsert' else e
+                                                   for e in self._pending])
+                else:
+                    # Streamed, so the full set of dicts is never held at once
+                    records = store.iter_records() if store is not None else []
+                for record in records:
+                    if isinstance(record, dict):
+                        loaded[_record_key(record)] = ProblemRecord.from_dict(record)
+            finally:
+                if store is not None:
+                    store.close()
+            self._records = loaded
+            for key, record in self._records.items():
+                self._index(key, record)
+        return self._records
+
+    @property
+    def loaded(self) -> bool:
+        return self._records is not None
+
+    def _offset_index(self) -> Optional[ResultsIndex]:
+        """The offset index, while it can answer for the repository (NDJSON file, nothing loaded or queued)."""
+        if self.loaded or self._pending or not is_ndjson(self.results_path) or not os.path.exists(self.results_path):
+            return None
+        if self._offsets is None:
+            self._offsets = ResultsIndex(self.results_path)
+        return self._offsets
+
+    def stream(self) -> Iterator[Dict]:
+        """Every record, one at a time: from memory once loaded, otherwise straight from the store."""
+        if self.loaded or self._pending:
+            yield from self.all()
+            return
+        if not os.path.exists(self.results_path):
+            return
+        store = ProblemStore(self.results_path)
+        try:
+            yield from store.iter_records()
+        finally:
+            store.close()
+
+    # -------------------- Reads --------------------
+    def __len__(self) -> int:
+        return len(self.load())
+
+    @property
+    def max_numeric_id(self) -> Optional[int]:
+        index = self._offset_index()
+        if index is not None:
+            return index.max_id()
+        self.load()
+        return self._max_numeric
+
+    def all(self) -> List[Dict]:
+        """Copies of every record; edit them freely and pass them back to upsert()."""
+        return [record.to_dict() for record in self.load().values()]
+
+    def get(self, ps_id: str) -> Optional[Dict]:
+        index = self._offset_index()
+        if index is not None and _numeric_id(ps_id) is not None:
+            record = index.get(ps_id)
+            return record if record is not None and _record_key(record) == str(ps_id) else None
+        record = self.load().get(str(ps_id))
+        return record.to_dict() if record is not None else None
+
+    def find(self, ps_id: str) -> Optional[Dict]:
+        """Record with this ps_id, or with the same numeric PS ID in another format ('25001' vs 'SIH25001')."""
+        index = self._offset_index()
+        if index is not None and _numeric_id(ps_id) is not None:
+            return index.get(ps_id)
+        record = self.get(ps_id)
+        num = _numeric_id(ps_id)
+        if record is None and num is not None and num in self._by_numeric:
+            record = self.get(self._by_numeric[num])
+        return record
+
+    def submission_counts(self) -> List[Tuple[str, Optional[int], Optional[int]]]:
+        """(ps_id, numeric PS ID, submission_count) for every record, in file order."""
+        return [(key, _numeric_id(r.get('ps_id') or r.get('ps_code')), r.get('submission_count'))
+                for key, r in self.load().items()]
+
+    # -------------------- Writes (queued until flush) --------------------
+    def upsert(self, record: Dict, match_ps_id: Optional[str] = None) -> bool:
+        """Insert or replace a record (matched by match_ps_id or its own ps_id); returns False if unchanged.
+
+        Before anything is loaded the write is only queued (and True returned).
+        """
+        key, match = _record_key(record), str(match_ps_id or _record_key(record))
+        if not self.loaded:
+            self._pending.append({'op': 'upsert', 'ps_id': match, 'record': dict(record)})
+            return True
+        records = self.load()
+        if match in records and key == match and records[match].to_dict() == record:
+            return False
+        if match in records and key != match:
+            # Re-keyed record keeps its position
+            self._records = records = {(key if k == match else k): (ProblemRecord.from_dict(record) if k == match else r)
+                                       for k, r in records.items()}
+            self._by_numeric = {n: (key if k == match else k) for n, k in self._by_numeric.items()}
+        else:
+            records[key] = ProblemRecord.from_dict(record)
+        self._index(key, record)
+        self._pending.append({'op': 'upsert', 'ps_id': match, 'record': dict(record)})
+        return True
+
+    def set_submission_count(self, ps_id: str, count: int) -> bool:
+        change = {'op': 'set', 'ps_id': str(ps_id), 'fields': {'submission_count': count}}
+        if not self.loaded:
+            self._pending.append(change)
+            return True
+        record = self.load().get(str(ps_id))
+        if record is None or record.get('submission_count') == count:
+            return False
+        record.submission_count = count
+        self._pending.append(change)
+        return True
+
+    def rename(self, old_ps_id: str, new_ps_id: str) -> bool:
+        records = self.load()
+        if str(old_ps_id) not in records or str(new_ps_id) in records:
+            return False
+        record = ProblemRecord.from_dict(dict(records[str(old_ps_id)].to_dict(), ps_id=str(new_ps_id)))
+        self._records = {(str(new_ps_id) if k == str(old_ps_id) else k): (record if k == str(old_ps_id) else r)
+                         for k, r in records.items()}
+        self._by_numeric = {n: (str(new_ps_id) if k == str(old_ps_id) else k) for n, k in self._by_numeric.items()}
+        self._pending.append({'op': 'rename', 'ps_id': str(old_ps_id), 'to': str(new_ps_id)})
+        return True
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self, compact: bool = False) -> int:
+        """Write queued changes to the store and update results.json; returns how many changes were written.
+
+        With compact=True a pending journal is folded into results.json too
+        (see ProblemStore.export_json), even when nothing is queued.
+        """
+        if not self._pending and not compact:
+            return 0
+        pending, self._pending = self._pending, []
+        written = 0
+        store = ProblemStore(self.results_path)
+        try:
+            with store.transaction():
+                for change in pending:
+                    if change['op'] == 'upsert':
+                        written += store.upsert(change['record'], match_ps_id=change['ps_id'])
+                    elif change['op'] == 'set':
+                        written += store.set_submission_count(change['ps_id'], change['fields']['submission_count'])
+                    else:
+                        try:
+                            written += store.rename(change['ps_id'], change['to'])
+                        except sqlite3.IntegrityError:
+                            print(f"Warning: {change['to']} already exists; leaving {change['ps_id']} as is")
+            store.export_json(compact=compact)
+        finally:
+            store.close()
+        return written
@@ -0,0 +1,368 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .json_codec import dumps, loads, read_json  # if run as a module
+except ImportError:
+    from json_codec import dumps, loads, read_json  # if run directly from backend/
+
+# Journal entries allowed to pile up before they are compacted into results.json (0 = always rewrite)
+RESULTS_COMPACT_EVERY = int(os.environ.get("RESULTS_COMPACT_EVERY", "500"))
+# Results file layout: 'json' (one array, what the frontend reads) or 'ndjson' (one record per line)
+RESULTS_FORMAT = os.environ.get("RESULTS_FORMAT", "json").strip().lower()
+RESULTS_FILE = 'results.ndjson' if RESULTS_FORMAT == 'ndjson' else 'results.json'
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+# Process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _fsync_dir(path: str) -> None:
+    # Makes the rename itself durable; directories cannot be opened on Windows
+    if os.name == 'nt':
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _file_mode(path: str) -> int:
+    """Permissions for a rewritten file: the existing file's, or what open() would give a new one."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_chunks(path: str, chunks: Iterable[bytes]) -> None:
+    """Write a file from a stream of chunks so that readers (and a crash) only ever see the old or the new contents."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600; keep the mode the target has (or would get)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(path)
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Write a file so that readers (and a crash) only ever see the old or the new contents."""
+    atomic_write_chunks(path, [data])
+
+
+def atomic_write_json(path: str, data, indent: Optional[int] = 2) -> None:
+    """json.dump(data, indent=2, ensure_ascii=False) through atomic_write_bytes (see json_codec)."""
+    atomic_write_bytes(path, dumps(data, indent=indent))
+
+
+def _record_key(record: Dict) -> str:
+    return str(record.get('ps_id') or record.get('ps_code') or f"alt:{record.get('title', '')}")
+
+
+# -------------------- Results files (JSON array or NDJSON) --------------------
+def is_ndjson(path: str) -> bool:
+    return path.lower().endswith(NDJSON_SUFFIXES)
+
+
+def _iter_ndjson(path: str) -> Iterator[Dict]:
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                if line.endswith(b'\n'):
+                    raise
+                print(f"Warning: Ignoring torn last line of {path}")
+                return
+
+
+def _iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator:
+    """Elements of a JSON array file, decoded one at a time from fixed-size chunks."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer, pos, eof, started = '', 0, False, False
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path} ends before its closing bracket")
+                chunk = f.read(chunk_size)
+                buffer, pos, eof = chunk, 0, not chunk
+                continue
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError(f"{path} is not a JSON array")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                # The element continues in the next chunk
+                chunk = f.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            yield item
+
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """Records of a results file, one at a time (NDJSON line by line, or the elements of a JSON array)."""
+    return _iter_ndjson(path) if is_ndjson(path) else _iter_json_array(path)
+
+
+def read_records(path: str):
+    """Whole contents of a results file (a list for NDJSON; whatever the file holds for JSON)."""
+    return list(_iter_ndjson(path)) if is_ndjson(path) else read_json(path)
+
+
+def write_records(path: str, records: Iterable[Dict]) -> int:
+    """Atomically write records in the file's format (NDJSON is written as it streams); returns the count."""
+    if not is_ndjson(path):
+        records = list(records)
+        atomic_write_json(path, records)
+        return len(records)
+    count = 0
+
+    def lines():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield dumps(record, indent=None) + b'\n'
+    atomic_write_chunks(path, lines())
+    return count
+
+
+def append_records(path: str, records: Iterable[Dict]) -> int:
+    """Append records to an NDJSON results file; returns the count."""
+    count = 0
+    with open(path, 'ab+') as f:
+        # Drop a torn last line left by a crash mid-append, so the new lines start on their own
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.seek(0)
+                data = f.read()
+                f.truncate(data.rfind(b'\n') + 1)
+                f.seek(0, os.SEEK_END)
+        for record in records:
+            f.write(dumps(record, indent=None) + b'\n')
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+
+# Absolute path -> ((inode, size, mtime), SHA-256); an unchanged file is hashed once per process
+_sha256_cache: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+
+
+def file_sha256(path: str) -> Optional[str]:
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cached = _sha256_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    _sha256_cache[key] = (stamp, digest.hexdigest())
+    return _sha256_cache[key][1]
+
+
+class ResultsJournal:
+    """
+    Append-only change log next to results.json (results.json.journal).
+
+    Small updates (a submission count, a newly classified problem) are
+    appended as one JSON line each instead of rewriting the whole file; the
+    first line records the SHA-256 of the results.json the changes apply to.
+    compact() folds the journal into results.json with an atomic rewrite.
+    A journal whose base no longer matches results.json is stale and ignored.
+
+    Entries: {"op": "set", "ps_id", "fields"}, {"op": "upsert", "ps_id", "record"}
+    (ps_id is the key of the record being replaced) and {"op": "rename", "ps_id", "to"}.
+    The results file may be a JSON array or NDJSON (see is_ndjson).
+    """
+
+    def __init__(self, results_path: str = 'results.json'):
+        self.results_path = results_path
+        self.path = f"{results_path}.journal"
+
+    def _read(self) -> List[Dict]:
+        lines = []
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        lines.append(loads(line))
+                    except ValueError:
+                        break  # torn last line from a crash mid-append; everything before it is intact
+        except OSError:
+            pass
+        return lines
+
+    def entries(self) -> List[Dict]:
+        """Change entries that apply to the current results.json ([] if none or stale)."""
+        lines = self._read()
+        if not lines:
+            return []
+        if lines[0].get('op') != 'base' or lines[0].get('sha256') != file_sha256(self.results_path):
+            print(f"Warning: Ignoring stale journal {self.path} (results.json was replaced)")
+            return []
+        return lines[1:]
+
+    def __len__(self) -> int:
+        return max(0, len(self._read()) - 1)
+
+    def append(self, changes: List[Dict]) -> None:
+        if not changes:
+            return
+        header = [] if os.path.exists(self.path) and self._read() else \
+            [{'op': 'base', 'sha256': file_sha256(self.results_path)}]
+        with open(self.path, 'ab') as f:
+            for entry in header + changes:
+                f.write(dumps(entry, indent=None) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def apply(records: List[Dict], changes: List[Dict]) -> List[Dict]:
+        """Replay journal entries over a list of records (in place); returns the list."""
+        index = {_record_key(r): i for i, r in enumerate(records) if isinstance(r, dict)}
+        for entry in changes:
+            op, key = entry.get('op'), str(entry.get('ps_id'))
+            if op == 'upsert':
+                record = entry['record']
+                if key in index:
+                    position = index.pop(key)
+                    records[position] = record
+                else:
+                    position = len(records)
+                    records.append(record)
+                index[_record_key(record)] = position
+            elif key in index:
+                record = records[index[key]]
+                if op == 'set':
+                    record.update(entry.get('fields') or {})
+                elif op == 'rename':
+                    record['ps_id'] = entry['to']
+                    index[str(entry['to'])] = index.pop(key)
+        return records
+
+    def load(self) -> List[Dict]:
+        """results.json with the journal applied."""
+        records = read_records(self.results_path)
+        if not isinstance(records, list):
+            return records
+        return self.apply(records, self.entries())
+
+    @staticmethod
+    def _replay(record: Optional[Dict], entries: List[Dict]) -> Optional[Dict]:
+        for entry in entries:
+            op = entry.get('op')
+            if op == 'upsert':
+                record = entry['record']
+            elif record is None:
+                continue
+            elif op == 'set':
+                record.update(entry.get('fields') or {})
+            elif op == 'rename':
+                record['ps_id'] = entry['to']
+        return record
+
+    def grouped(self) -> Dict[str, List[Dict]]:
+        """Entries grouped by the key their record has in the results file (renames and re-keyed upserts follow it)."""
+        groups: Dict[str, List[Dict]] = {}
+        origin: Dict[str, str] = {}
+        for entry in self.entries():
+            key = str(entry.get('ps_id'))
+            base_key = origin.pop(key, key)
+            groups.setdefault(base_key, []).append(entry)
+            if entry.get('op') == 'upsert':
+                key = _record_key(entry['record'])
+            elif entry.get('op') == 'rename':
+                key = str(entry['to'])
+            origin[key] = base_key
+        return groups
+
+    def iter_load(self) -> Iterator[Dict]:
+        """Same records as load(), streamed from the results file; only the (small) journal is held in memory."""
+        groups = self.grouped()
+        seen = set()
+        for record in iter_records(self.results_path):
+            key = _record_key(record) if isinstance(record, dict) else None
+            if key in groups and key not in seen:
+                seen.add(key)
+                record = self._replay(record, groups[key])
+            yield record
+        # Records added since the file was written
+        for base_key, entries in groups.items():
+            if base_key not in seen:
+                record = self._replay(None, entries)
+                if record is not None:
+                    yield record
+
+    def compact(self, records: Optional[Iterable[Dict]] = None) -> int:
+        """Rewrite results.json atomically (from records, or base + journal) and drop the journal."""
+        if records is None:
+            records = self.load() if not is_ndjson(self.results_path) else self.iter_load()
+        count = write_records(self.results_path, records)
+        self.clear()
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or compact the results.json change journal, or convert between JSON and NDJSON')
+    parser.add_argument('command', choices=['status', 'compact', 'convert'])
+    parser.add_argument('results_file', nargs='?', default=RESULTS_FILE)
+    parser.add_argument('output', nargs='?', help='convert: file to write (.json for an array, .ndjson/.jsonl for one record per line)')
+    args = parser.parse_args()
+
+    journal = ResultsJournal(args.results_file)
+    if args.command == 'status':
+        print(f"📒 {journal.path}: {len(journal)} pending changes (compacted every {RESULTS_COMPACT_EVERY})")
+    elif args.command == 'compact':
+        count = journal.compact()
+        print(f"✅ Compacted journal into {args.results_file} ({count} records)")
+    else:
+        if not args.output:
+            parser.error('convert needs an output file')
+        count = write_records(args.output, journal.iter_load())
+        print(f"✅ Wrote {count} records from {args.results_file} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,118 @@
 import requests
-from bs4 import BeautifulSoup
-import json
 import re
 import time
 import os
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
+
+try:
+    from .html_parsers import MODAL_ID_PATTERN, get_parser_backend, text_with_line_breaks  # if run as a module
+    from .page_snapshot import ListingSnapshot
+    from .page_cache import PAGE_CACHE_DIR, PAGE_CACHE_TTL_SEC, PageCache
+    from .fingerprints import FingerprintStore
+    from .parallel_extract import extract_fragments_parallel, modal_fragment
+    from .editions import PRIMARY_EDITION, edition_from_url, edition_path
+    from .snapshot_archive import SNAPSHOT_ARCHIVE_DIR, SnapshotArchive
+    from .results_repository import ResultsRepository
+    from .results_writer import RESULTS_FILE, atomic_write_json, is_ndjson, iter_records
+    from .json_codec import SchemaError, coerce_list, decode_final_records, loads, read_json, to_final_schema
+except ImportError:
+    from html_parsers import MODAL_ID_PATTERN, get_parser_backend, text_with_line_breaks  # if run directly from backend/
+    from page_snapshot import ListingSnapshot
+    from page_cache import PAGE_CACHE_DIR, PAGE_CACHE_TTL_SEC, PageCache
+    from fingerprints import FingerprintStore
+    from parallel_extract import extract_fragments_parallel, modal_fragment
+    from editions import PRIMARY_EDITION, edition_from_url, edition_path
+    from snapshot_archive import SNAPSHOT_ARCHIVE_DIR, SnapshotArchive
+    from results_repository import ResultsRepository
+    from results_writer import RESULTS_FILE, atomic_write_json, is_ndjson, iter_records
+    from json_codec import SchemaError, coerce_list, decode_final_records, loads, read_json, to_final_schema
 
 class SIHScraper:
-    def __init__(self):
+    def __init__(self, parser: Optional[str] = None,
+                 use_cache: bool = True, cache_ttl: float = PAGE_CACHE_TTL_SEC, force_refresh: bool = False,
+                 use_fingerprints: bool = True, workers: int = 1, archive: bool = True,
+                 replay: Optional[str] = None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # HTML parser backend (selectolax, lxml or html.parser) used for listing pages
+        self.parser = get_parser_backend(parser)
+        # Conditional-GET cache for listing pages (ETag/Last-Modified) and their parse results
+        self.page_cache = PageCache(PAGE_CACHE_DIR, ttl_seconds=cache_ttl) if use_cache else None
+        self.force_refresh = force_refresh
+        # Incremental runs skip modals whose raw HTML is unchanged since they were last extracted
+        self.use_fingerprints = use_fingerprints
+        # Worker processes for modal extraction (1 = extract serially in this process)
+        self.workers = max(1, int(workers or 1))
+        # Compressed copy of every downloaded listing page, for offline reprocessing
+        self.archive = SnapshotArchive(SNAPSHOT_ARCHIVE_DIR) if archive or replay else None
+        # Archived snapshot (path or 'latest') served instead of the live site
+        self.replay = replay
+
+    def parse_html(self, content):
+        """Parse a listing page with the configured parser backend."""
+        return self.parser.parse(content)
+        
+    def fetch_listing(self, url: str) -> ListingSnapshot:
+        """Download a listing page once; the returned snapshot is parsed lazily and can be shared."""
+        if self.replay:
+            page = self.archive.load(self.replay, url)
+            return ListingSnapshot(page.url, page.content, scraper=self, fetched_at=page.fetched_at,
+                                   status=page.status)
+        if self.page_cache is None:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            snapshot = ListingSnapshot(url, response.content, scraper=self)
+        else:
+            page = self.page_cache.fetch(self.session, url, force_refresh=self.force_refresh)
+            if page.status != 'downloaded':
+                print(f"♻️  Listing page unchanged ({page.status}), using cached copy")
+            snapshot = ListingSnapshot(url, page.content, scraper=self, fetched_at=page.fetched_at,
+                                       cache=self.page_cache, status=page.status)
+        if self.archive is not None and snapshot.status == 'downloaded':
+            self.archive.save(url, snapshot.content, snapshot.fetched_at)
+        return snapshot
         
-    def scrape_sih_problems(self, url: str, start_ps_id: Optional[str] = None, incremental: bool = False) -> List[Dict]:
+    def scrape_sih_problems(self, url: str, start_ps_id: Optional[str] = None, incremental: bool = False,
+                            snapshot: Optional[ListingSnapshot] = None) -> List[Dict]:
         """
-        Scrape all problem statements from SIH website
+        Scrape all problem statements from SIH website (or from an already fetched snapshot)
         """
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find all modal divs that contain problem statements
-            problem_modals = soup.find_all('div', {'id': re.compile(r'ViewProblemStatement\d+')})
-            
-            print(f"Found {len(problem_modals)} problem statement modals")
-            
-            problems = []
+            if snapshot is None:
+                snapshot = self.fetch_listing(url)
+            # Each hackathon edition keeps its own watermark and fingerprints
+            edition = edition_from_url(url)
 
             # Determine filter threshold if start_ps_id or incremental mode is used
             threshold_num: Optional[int] = None
             if start_ps_id:
                 threshold_num = self.extract_numeric_ps_id(start_ps_id)
             if incremental:
-                last_id = self.get_last_scraped_id()
+                last_id = self.get_last_scraped_id(edition)
                 last_num = self.extract_numeric_ps_id(last_id) if last_id else None
                 if last_num is not None:
                     inc_threshold = last_num + 1
                     threshold_num = max(threshold_num or inc_threshold, inc_threshold)
-            for modal in problem_modals:
-                try:
-                    # Find the parent table row that contains the modal for submission count extraction
-                    table_row = modal.find_parent('tr') if modal else None
-                    problem_data = self.extract_problem_data(modal, table_row=table_row)
-                    if problem_data:
-                        # Apply threshold filtering if configured
-                        if threshold_num is not None:
-                            current_num = self.extract_numeric_ps_id(
-                                problem_data.get('ps_id') or problem_data.get('ps_code', '')
-                            )
-                            if current_num is None or current_num < threshold_num:
-                                continue
-                        problems.append(problem_data)
-                        print(f"✓ Extracted: {problem_data['ps_id']} - {problem_data['title'][:50]}... (Submissions: {problem_data.get('submission_count', 'N/A')})")
-                except Exception as e:
-                    print(f"✗ Error extracting problem: {e}")
-                    continue
+
+            if incremental and self.use_fingerprints:
+                # Row PS IDs are cached with the page body, so an unchanged page is not even parsed here
+                page_ids = [int(num) for num in snapshot.row_submission_counts]
+                if (snapshot.status not in ('downloaded', 'replayed') and threshold_num is not None
+                        and page_ids and max(page_ids) < threshold_num):
+                    # Same page as the last fingerprinted run and nothing past the watermark
+                    print("♻️  No problems past the watermark on the unchanged page")
+                    problems = []
+                else:
+                    # Fingerprints depend on how the parser serializes modals; see FingerprintStore
+                    fingerprints = FingerprintStore(edition_path('problem_fingerprints.json', edition),
+                                                    parser=snapshot.parse_variant)
+                    problems = self.extract_changed_problems(snapshot.document, fingerprints, threshold_num=threshold_num)
+                    fingerprints.save()
+            else:
+                # A cached (unchanged) page has no edited modals; the watermark alone decides
+                problems = self.filter_problems(snapshot.problems, threshold_num=threshold_num)
             
             # Update scraper state with the highest PS ID we just saw
             if problems:
@@ -67,7 +122,7 @@ class SIHScraper:
                     if num is not None:
                         max_seen = num if max_seen is None else max(max_seen, num)
                 if max_seen is not None:
-                    self.save_scraper_state({'last_ps_id': str(max_seen), 'updated_at': time.time()})
+                    self.save_edition_watermark(edition, str(max_seen))
             
             return problems
             
@@ -75,6 +130,137 @@ class SIHScraper:
             print(f"Error fetching URL: {e}")
             return []
 
+    def extract_modal(self, modal) -> Tuple[Optional[Dict], Dict]:
+        """Extract one modal and its listing row; returns (problem record or None, row data)."""
+        # Find the parent table row that contains the modal for submission count extraction
+        table_row = modal.find_parent('tr') if modal else None
+        problem_data = self.extract_problem_data(modal, table_row=table_row)
+        if problem_data:
+            return problem_data, problem_data
+        # Keep the row's submission count even when the modal itself is unusable
+        row_data: Dict = {}
+        if table_row:
+            self.extract_row_data(table_row, row_data)
+        return None, row_data
+
+    def extract_modals(self, modals: List) -> List[Tuple[Optional[Dict], Dict]]:
+        """extract_modal for each modal, in order; uses a process pool when self.workers > 1."""
+        if self.workers > 1 and len(modals) >= self.workers * 2:
+            fragments = [modal_fragment(modal) for modal in modals]
+            print(f"⚙️  Extracting {len(fragments)} modals on {self.workers} worker processes")
+            return extract_fragments_parallel(fragments, self.parser.name, self.workers)
+        results = []
+        for modal in modals:
+            try:
+                results.append(self.extract_modal(modal))
+            except Exception as e:
+                print(f"✗ Error extracting problem: {e}")
+                results.append((None, {}))
+        return results
+
+    def extract_listing(self, soup) -> Tuple[List[Dict], Dict[str, int]]:
+        """Extract every problem record and the row-derived ps_id -> submission_count map in one pass."""
+        # Find all modal divs that contain problem statements
+        problem_modals = soup.find_all('div', {'id': MODAL_ID_PATTERN})
+        
+        print(f"Found {len(problem_modals)} problem statement modals")
+        
+        problems: List[Dict] = []
+        counts: Dict[str, int] = {}
+        for problem_data, row_data in self.extract_modals(problem_modals):
+            if problem_data:
+                problems.append(problem_data)
+            num = self.extract_numeric_ps_id(row_data.get('ps_code'))
+            if num is not None and 'submission_count' in row_data:
+                counts[str(num)] = row_data['submission_count']
+        return problems, counts
+
+    def extract_row_counts(self, soup) -> Dict[str, int]:
+        """Row-derived ps_id -> submission_count map (as extract_listing builds it) without extracting any modal."""
+        counts: Dict[str, int] = {}
+        for modal in soup.find_all('div', {'id': MODAL_ID_PATTERN}):
+            table_row = modal.find_parent('tr')
+            if not table_row:
+                continue
+            row_data: Dict = {}
+            self.extract_row_data(table_row, row_data)
+            num = self.extract_numeric_ps_id(row_data.get('ps_code'))
+            if num is not None and 'submission_count' in row_data:
+                counts[str(num)] = row_data['submission_count']
+        return counts
+
+    def extract_changed_problems(self, soup, fingerprints: FingerprintStore, threshold_num: Optional[int] = None) -> List[Dict]:
+        """
+        Extract only problems that are new or whose modal HTML changed since the last run.
+
+        Modals with a known fingerprint are skipped before any field extraction,
+        unless their PS ID is at or above threshold_num (not yet past the watermark).
+        Returned records carry change_type 'new' or 'modified'. A changed modal
+        below the threshold with no stored fingerprint is only recorded as the
+        baseline for later runs.
+        """
+        problem_modals = soup.find_all('div', {'id': MODAL_ID_PATTERN})
+        print(f"Found {len(problem_modals)} problem statement modals")
+
+        candidates = []
+        modal_fingerprints = []
+        skipped = 0
+        for modal in problem_modals:
+            fingerprint = fingerprints.fingerprint(str(modal))
+            known_id = fingerprints.ps_id_for(fingerprint)
+            if known_id is not None and (threshold_num is None or int(known_id) < threshold_num):
+                skipped += 1
+                continue
+            candidates.append(modal)
+            modal_fingerprints.append(fingerprint)
+
+        problems: List[Dict] = []
+        baselined = 0
+        for fingerprint, (problem_data, _) in zip(modal_fingerprints, self.extract_modals(candidates)):
+            if not problem_data:
+                continue
+            num = self.extract_numeric_ps_id(problem_data.get('ps_id') or problem_data.get('ps_code', ''))
+            if num is None:
+                continue
+            previous = fingerprints.get(str(num))
+            fingerprints.update(str(num), fingerprint)
+
+            if threshold_num is None or num >= threshold_num:
+                problem_data['change_type'] = 'new'
+            elif previous is not None and previous != fingerprint:
+                problem_data['change_type'] = 'modified'
+            else:
+                baselined += 1
+                continue
+            problems.append(problem_data)
+            marker = "✎ Modified" if problem_data['change_type'] == 'modified' else "✓ Extracted"
+            print(f"{marker}: {problem_data['ps_id']} - {problem_data['title'][:50]}... (Submissions: {problem_data.get('submission_count', 'N/A')})")
+
+        modified = sum(1 for p in problems if p['change_type'] == 'modified')
+        print(f"🧮 Fingerprints: {len(problems) - modified} new, {modified} modified, {skipped} unchanged (skipped)"
+              + (f", {baselined} recorded as baseline" if baselined else ""))
+        return problems
+
+    def filter_problems(self, problems: List[Dict], threshold_num: Optional[int] = None) -> List[Dict]:
+        """Keep problems whose numeric PS ID is at least threshold_num (all of them if no threshold)."""
+        kept = []
+        for problem_data in problems:
+            # Apply threshold filtering if configured
+            if threshold_num is not None:
+                current_num = self.extract_numeric_ps_id(
+                    problem_data.get('ps_id') or problem_data.get('ps_code', '')
+                )
+                if current_num is None or current_num < threshold_num:
+                    continue
+            kept.append(problem_data)
+            print(f"✓ Extracted: {problem_data['ps_id']} - {problem_data['title'][:50]}... (Submissions: {problem_data.get('submission_count', 'N/A')})")
+        return kept
+
+    def extract_problems(self, soup, threshold_num: Optional[int] = None) -> List[Dict]:
+        """Extract problem records from a parsed listing page, skipping PS IDs below threshold_num."""
+        problems, _ = self.extract_listing(soup)
+        return self.filter_problems(problems, threshold_num=threshold_num)
+
     def extract_problem_data(self, modal_div, table_row=None) -> Optional[Dict]:
         """
         Extract problem data from a single modal div and its parent table row
@@ -227,15 +413,8 @@ class SIHScraper:
         if not element:
             return ""
         
-        # Get HTML content
-        html_content = str(element)
-        
-        # Replace HTML breaks with newlines
-        html_content = re.sub(r'<br\s*/?>', '\n', html_content)
-        
-        # Remove HTML tags but keep the text
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text = soup.get_text()
+        # Text with HTML breaks as newlines, read straight from the parsed tree
+        text = text_with_line_breaks(element)
         
         # Clean up multiple newlines
         text = re.sub(r'\n+', '\n\n', text)
@@ -248,8 +427,7 @@ class SIHScraper:
             to_save = problems
             if merge_existing and os.path.exists(filename):
                 try:
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        existing = json.load(f)
+                    existing = read_json(filename)
                     # Index by a stable key
                     def key_fn(item: Dict) -> str:
                         return str(item.get('ps_id') or item.get('ps_code') or item.get('title') or '')
@@ -264,8 +442,7 @@ class SIHScraper:
                     print(f"Warning: Failed to merge existing JSON: {me}. Overwriting file.")
                     to_save = problems
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(to_save, f, indent=2, ensure_ascii=False)
+            atomic_write_json(filename, to_save)
             print(f"✓ Saved {len(to_save)} problems to {filename}")
         except Exception as e:
             print(f"Error saving to JSON: {e}")
@@ -298,10 +475,10 @@ class SIHScraper:
         except Exception as e:
             print(f"Error saving to CSV: {e}")
     
-    def validate_data(self, problems: List[Dict]) -> Dict:
-        """Validate scraped data and return statistics"""
+    def validate_data(self, problems: Iterable[Dict]) -> Dict:
+        """Validate scraped data (a list or a stream of records) and return statistics"""
         stats = {
-            'total_problems': len(problems),
+            'total_problems': 0,
             'problems_with_all_fields': 0,
             'unique_organizations': set(),
             'unique_themes': set(),
@@ -313,6 +490,7 @@ class SIHScraper:
         required_fields = ['ps_id', 'title', 'description', 'organization']
         
         for problem in problems:
+            stats['total_problems'] += 1
             # Count problems with all required fields
             if all(field in problem and problem[field] for field in required_fields):
                 stats['problems_with_all_fields'] += 1
@@ -339,15 +517,22 @@ class SIHScraper:
         return stats
 
     # -------------------- Submission counts utilities --------------------
-    def fetch_submission_counts_from_listing(self, url: str) -> Dict[str, int]:
+    def fetch_submission_counts_from_listing(self, url: str, snapshot: Optional[ListingSnapshot] = None) -> Dict[str, int]:
         """Scrape the main listing page to build a map of ps_id (numeric as string) -> submission_count.
         Tries to locate header indices for 'PS Code' and 'Submissions'; falls back to positional heuristic.
+        Reuses the parsed page when a snapshot is given.
         """
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if snapshot is None:
+                snapshot = self.fetch_listing(url)
+            return snapshot.submission_counts
+        except Exception as e:
+            print(f"Error fetching submission counts: {e}")
+            return {}
 
+    def parse_submission_counts(self, soup) -> Dict[str, int]:
+        """Build the ps_id (numeric as string) -> submission_count map from a parsed listing page."""
+        try:
             counts: Dict[str, int] = {}
 
             def find_indices(table):
@@ -421,158 +606,132 @@ class SIHScraper:
             print(f"Found submission counts for {len(counts)} PS entries from listing page")
             return counts
         except Exception as e:
-            print(f"Error fetching submission counts: {e}")
+            print(f"Error parsing submission counts: {e}")
             return {}
 
-    def write_submission_counts_for_results(self, results_path: str, url: str, out_path: str = 'submission_counts.tmp.json') -> int:
+    def write_submission_counts_for_results(self, results_path: str, url: str, out_path: str = 'submission_counts.tmp.json',
+                                            snapshot: Optional[ListingSnapshot] = None) -> int:
         """Read results.json, compute submission counts for its ps_ids from listing page, and write a temp JSON file.
 
         Returns the number of entries written.
         """
         try:
-            if not os.path.exists(results_path):
+            repository = ResultsRepository.for_path(results_path)
+            if not repository.exists():
                 print(f"results file not found: {results_path}")
                 return 0
-            with open(results_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                print("results.json is not a list; skipping counts generation")
-                return 0
+            rows = repository.submission_counts()
 
-            counts_map = self.fetch_submission_counts_from_listing(url)
+            counts_map = self.fetch_submission_counts_from_listing(url, snapshot=snapshot)
             if not counts_map:
                 print("No submission counts found on listing page")
                 return 0
 
             output: Dict[str, int] = {}
-            for rec in data:
-                if not isinstance(rec, dict):
-                    continue
-                ps_id = str(rec.get('ps_id') or '').strip()
-                num = self.extract_numeric_ps_id(ps_id)
+            for ps_id, num, _ in rows:
                 if num is None:
                     continue
                 key = str(num)
                 if key in counts_map:
                     output[ps_id] = counts_map[key]
 
-            with open(out_path, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+            atomic_write_json(out_path, output)
             print(f"✓ Wrote submission counts for {len(output)} PS IDs to {out_path}")
             return len(output)
         except Exception as e:
             print(f"Error writing submission counts: {e}")
             return 0
 
-    def merge_submission_counts_into_results(self, results_path: str, url: str) -> int:
+    def merge_submission_counts_into_results(self, results_path: str, url: str,
+                                             snapshot: Optional[ListingSnapshot] = None) -> int:
         """Merge submission counts by scraping listing rows and reusing extract_row_data. Returns updated count."""
         try:
-            if not os.path.exists(results_path):
+            repository = ResultsRepository.for_path(results_path)
+            if not repository.exists():
                 print(f"results file not found: {results_path}")
                 return 0
-            with open(results_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                print("results.json is not a list; aborting merge")
-                return 0
 
-            # Build counts map by iterating listing rows and calling extract_row_data
+            # Counts come from each modal's listing row (extract_row_data); the modals are not extracted again
             try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+                if snapshot is None:
+                    snapshot = self.fetch_listing(url)
+                counts_map = snapshot.row_submission_counts
             except Exception as e:
                 print(f"Error fetching listing for merge: {e}")
                 return 0
-
-            counts_map: Dict[str, int] = {}
-            rows = soup.find_all('tr')
-            total_rows = 0
-            for row in rows:
-                tds = row.find_all('td')
-                if len(tds) < 6:
-                    continue
-                total_rows += 1
-                tmp: Dict = {}
-                # Reuse row extraction to populate ps_code and submission_count
-                try:
-                    self.extract_row_data(row, tmp)
-                except Exception:
-                    continue
-                # Derive numeric key and submission count
-                ps_code_text = tmp.get('ps_code') or self.clean_text(tds[4].get_text())
-                num = self.extract_numeric_ps_id(ps_code_text)
-                if num is None:
-                    continue
-                sub_val = tmp.get('submission_count')
-                try:
-                    sub_val = int(sub_val) if sub_val is not None else int(self.clean_text(tds[5].get_text()))
-                except Exception:
-                    sub_val = 0
-                counts_map[str(num)] = sub_val
-                print(f"↪ Row-derived PS {num} submissions={sub_val}")
+            print(f"↪ Row-derived submission counts for {len(counts_map)} PS entries")
 
             if not counts_map:
                 print("No submission counts found on listing page via rows; nothing to merge")
                 return 0
 
             updated = 0
-            for rec in data:
-                if not isinstance(rec, dict):
-                    continue
-                # Support numeric-only ps_id (e.g., "25001") or prefixed (e.g., "SIH25001")
-                ps_id_value = rec.get('ps_id')
-                ps_id = str(ps_id_value if ps_id_value is not None else '').strip()
-                num = self.extract_numeric_ps_id(ps_id)
-                if num is None:
-                    continue
+            # Numeric PS IDs match both "25001" and "SIH25001"; each changed count is a single-row write
+            for ps_id, num, current in repository.submission_counts():
                 key = str(num)
-                if key in counts_map:
-                    new_val = counts_map[key]
-                    if rec.get('submission_count') != new_val:
-                        rec['submission_count'] = new_val
-                        updated += 1
-                        print(f"✓ Updated submission_count for PS {ps_id or num}: {new_val}")
-                    else:
-                        print(f"= No change for PS {ps_id or num}: already {new_val}")
-
-            with open(results_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                if num is None or key not in counts_map:
+                    continue
+                new_val = counts_map[key]
+                if current != new_val and repository.set_submission_count(ps_id, new_val):
+                    updated += 1
+                    print(f"✓ Updated submission_count for PS {ps_id or num}: {new_val}")
+                else:
+                    print(f"= No change for PS {ps_id or num}: already {new_val}")
+            repository.flush()
             print(f"✓ Merged submission counts into results.json for {updated} records")
             return updated
         except Exception as e:
             print(f"Error merging submission counts: {e}")
             return 0
 
+    def parse_row_submission_counts(self, soup) -> Dict[str, int]:
+        """Build the ps_id -> submission_count map from listing rows via extract_row_data."""
+        counts_map: Dict[str, int] = {}
+        rows = soup.find_all('tr')
+        for row in rows:
+            tds = row.find_all('td')
+            if len(tds) < 6:
+                continue
+            tmp: Dict = {}
+            # Reuse row extraction to populate ps_code and submission_count
+            try:
+                self.extract_row_data(row, tmp)
+            except Exception:
+                continue
+            # Derive numeric key and submission count
+            ps_code_text = tmp.get('ps_code') or self.clean_text(tds[4].get_text())
+            num = self.extract_numeric_ps_id(ps_code_text)
+            if num is None:
+                continue
+            sub_val = tmp.get('submission_count')
+            try:
+                sub_val = int(sub_val) if sub_val is not None else int(self.clean_text(tds[5].get_text()))
+            except Exception:
+                sub_val = 0
+            counts_map[str(num)] = sub_val
+            print(f"↪ Row-derived PS {num} submissions={sub_val}")
+        return counts_map
+
     def normalize_ps_ids_in_results(self, results_path: str, prefix: str = 'SIH') -> int:
         """Normalize ps_id values in results.json to the format '<prefix><digits>', e.g., 'SIH25001'. Returns count updated."""
         try:
-            if not os.path.exists(results_path):
+            repository = ResultsRepository.for_path(results_path)
+            if not repository.exists():
                 print(f"results file not found: {results_path}")
                 return 0
-            with open(results_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                print("results.json is not a list; aborting normalization")
-                return 0
 
             updated = 0
-            for rec in data:
-                if not isinstance(rec, dict):
-                    continue
-                raw = rec.get('ps_id')
-                text = str(raw if raw is not None else '').strip()
-                num = self.extract_numeric_ps_id(text)
+            for ps_id, num, _ in repository.submission_counts():
                 if num is None:
                     continue
                 normalized = f"{prefix}{num}"
-                if text != normalized:
-                    rec['ps_id'] = normalized
+                if ps_id == normalized:
+                    continue
+                if repository.rename(ps_id, normalized):
                     updated += 1
-
-            if updated:
-                with open(results_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                else:
+                    print(f"Warning: {normalized} already exists; leaving {ps_id} as is")
+            repository.flush()
             print(f"✓ Normalized ps_id format for {updated} records in results.json")
             return updated
         except Exception as e:
@@ -581,33 +740,11 @@ class SIHScraper:
 
     # -------------------- Merge with server + final schema --------------------
     def _coerce_list(self, value) -> List[str]:
-        if value is None:
-            return []
-        if isinstance(value, list):
-            return [str(v).strip() for v in value if str(v).strip()]
-        if isinstance(value, str):
-            parts = [p.strip() for p in value.split(',')]
-            return [p for p in parts if p]
-        return []
+        return coerce_list(value)
 
     def normalize_to_final_schema(self, record: Dict) -> Dict:
         """Normalize any input record to the required final schema."""
-        return {
-            'ps_id': record.get('ps_id', ''),
-            'title': record.get('title', ''),
-            'summary': record.get('summary', ''),
-            'description': record.get('description', ''),
-            'difficulty': record.get('difficulty', ''),
-            'technology': self._coerce_list(record.get('technology', [])),
-            'stakeholders': self._coerce_list(record.get('stakeholders', [])),
-            'impact_area': self._coerce_list(record.get('impact_area', [])),
-            'data_resource_type': self._coerce_list(record.get('data_resource_type', [])),
-            'solution_type': record.get('solution_type', ''),
-            'organization': record.get('organization', ''),
-            'department': record.get('department', ''),
-            'category': record.get('category', ''),
-            'theme': record.get('theme', ''),
-        }
+        return to_final_schema(record)
 
     def transform_scraped_to_final(self, scraped: Dict) -> Dict:
         """Transform a scraped record to the final schema with sensible defaults."""
@@ -664,18 +801,19 @@ class SIHScraper:
         alt = record.get('ps_code') or record.get('title') or ''
         return f"alt:{alt}"
 
-    def merge_scraped_and_server(self, scraped: List[Dict], server_data) -> List[Dict]:
+    def merge_scraped_and_server(self, scraped: Iterable[Dict], server_data) -> List[Dict]:
         """Merge scraped data with server-generated data into the final schema, keyed by ps_id/code/title."""
         # Prepare server list
-        server_list: List[Dict] = []
-        if isinstance(server_data, list):
-            server_list = server_data
-        elif isinstance(server_data, dict):
+        server_list: Iterable[Dict] = []
+        if isinstance(server_data, dict):
             # allow either a single record or an envelope with 'data'
             if 'data' in server_data and isinstance(server_data['data'], list):
                 server_list = server_data['data']
             else:
                 server_list = [server_data]
+        elif server_data is not None and not isinstance(server_data, (str, bytes)):
+            # a list, or a stream of records (e.g. iter_records on an NDJSON file)
+            server_list = server_data
 
         # Index server by merge key (normalized to final schema)
         server_map: Dict[str, Dict] = {}
@@ -698,22 +836,20 @@ class SIHScraper:
         return list(merged_map.values())
 
     def save_results_json(self, records: List[Dict], filename: str = 'results.json'):
-        """Save final merged records to results.json, merging with existing to avoid duplicates."""
+        """Save final merged records to results.json, merging with existing to avoid duplicates.
+
+        Only the given records are written to the problem store; results.json is then re-exported.
+        """
         try:
-            existing: List[Dict] = []
-            if os.path.exists(filename):
-                try:
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        loaded = json.load(f)
-                        if isinstance(loaded, list):
-                            existing = loaded
-                except Exception:
-                    existing = []
-            # Merge with existing
-            combined = self.merge_scraped_and_server([], existing)
-            combined = self.merge_scraped_and_server(combined, records)
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(combined, f, indent=2, ensure_ascii=False)
+            repository = ResultsRepository.for_path(filename)
+            for record in self.merge_scraped_and_server([], records):
+                existing = repository.find(record.get('ps_id', ''))
+                if existing is not None:
+                    # New values win; fields outside the final schema (e.g. submission_count) are kept
+                    merged = self._merge_records_final(record, self.transform_scraped_to_final(existing))
+                    record = {**existing, **merged}
+                repository.upsert(record, match_ps_id=existing.get('ps_id') if existing else None)
+            repository.flush()
         except Exception as e:
             print(f"Error saving results.json: {e}")
 
@@ -723,8 +859,7 @@ class SIHScraper:
         state_file = 'scraper_state.json'
         try:
             if os.path.exists(state_file):
-                with open(state_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return read_json(state_file)
         except Exception as e:
             print(f"Warning: Failed to load scraper state: {e}")
         return {}
@@ -733,21 +868,36 @@ class SIHScraper:
         """Persist scraper state to local file."""
         state_file = 'scraper_state.json'
         try:
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
+            atomic_write_json(state_file, state)
         except Exception as e:
             print(f"Warning: Failed to save scraper state: {e}")
 
-    def get_last_scraped_id(self) -> str:
+    def save_edition_watermark(self, edition: str, last_ps_id: str):
+        """Record the highest PS ID seen for an edition, keeping the other editions' watermarks."""
+        state = self.load_scraper_state()
+        now = time.time()
+        state.setdefault('editions', {})[edition] = {'last_ps_id': last_ps_id, 'updated_at': now}
+        if edition == PRIMARY_EDITION:
+            # Top-level keys stay in place for older readers of scraper_state.json
+            state['last_ps_id'] = last_ps_id
+            state['updated_at'] = now
+        self.save_scraper_state(state)
+
+    def get_last_scraped_id(self, edition: str = PRIMARY_EDITION) -> str:
         """Return the last scraped PS ID as a string, preferring results.json; fallback to state; '0' if unknown."""
         try:
-            last_from_results = self.get_last_psid_from_results()
+            last_from_results = self.get_last_psid_from_results(edition_path(RESULTS_FILE, edition))
             if last_from_results is not None:
                 return str(last_from_results)
         except Exception:
             pass
         state = self.load_scraper_state()
-        return state.get('last_ps_id', '0')
+        edition_state = state.get('editions', {}).get(edition, {})
+        if edition_state.get('last_ps_id'):
+            return edition_state['last_ps_id']
+        if edition == PRIMARY_EDITION:
+            return state.get('last_ps_id', '0')
+        return '0'
 
     def extract_numeric_ps_id(self, value: Optional[str]) -> Optional[int]:
         """Extract the numeric portion of a PS identifier (e.g., 'SIH25001' -> 25001)."""
@@ -761,24 +911,13 @@ class SIHScraper:
         except Exception:
             return None
 
-    def get_last_psid_from_results(self) -> Optional[int]:
-        """Scan results.json and return the maximum numeric ps_id if available."""
-        filename = 'results.json'
-        if not os.path.exists(filename):
+    def get_last_psid_from_results(self, filename: str = 'results.json') -> Optional[int]:
+        """Maximum numeric ps_id in results.json (or an edition's results file), if available."""
+        repository = ResultsRepository.for_path(filename)
+        if not repository.exists():
             return None
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                return None
-            max_num: Optional[int] = None
-            for rec in data:
-                if not isinstance(rec, dict):
-                    continue
-                num = self.extract_numeric_ps_id(rec.get('ps_id') or rec.get('ps_code'))
-                if num is not None:
-                    max_num = num if max_num is None else max(max_num, num)
-            return max_num
+            return repository.max_numeric_id
         except Exception:
             return None
 
@@ -796,17 +935,38 @@ def main():
     parser.add_argument('--merge-submission-counts', action='store_true', help="Merge submission counts into results.json under 'submission_count'")
     parser.add_argument('--normalize-psids', action='store_true', help='Normalize ps_id values in results.json to SIH<number> format')
     parser.add_argument('--server-json', type=str, help='Path to server-generated JSON to merge into results.json')
+    parser.add_argument('--parser', type=str, default=None, help='HTML parser backend: selectolax, lxml, html.parser or auto (default)')
+    parser.add_argument('--cache-ttl', type=float, default=PAGE_CACHE_TTL_SEC, help='Seconds a cached listing page is used without revalidating (default: PAGE_CACHE_TTL_SEC or 0)')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the page cache and download the listing page again')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use or update the on-disk page cache')
+    parser.add_argument('--no-fingerprints', action='store_true', help='In incremental mode, re-extract every modal instead of skipping unchanged ones')
+    parser.add_argument('--workers', type=int, default=1, help='Extract problem modals on N worker processes (default: 1, serial)')
+    parser.add_argument('--no-archive', action='store_true', help='Do not archive downloaded listing pages to SNAPSHOT_ARCHIVE_DIR')
+    parser.add_argument('--replay', type=str, metavar='SNAPSHOT', help="Run offline from an archived listing snapshot (path or 'latest')")
     
     args = parser.parse_args()
     
     # Initialize scraper
-    scraper = SIHScraper()
+    scraper = SIHScraper(parser=args.parser, use_cache=not args.no_cache,
+                         cache_ttl=args.cache_ttl, force_refresh=args.refresh,
+                         use_fingerprints=not args.no_fingerprints, workers=args.workers,
+                         archive=not args.no_archive, replay=args.replay)
+    
+    if args.replay:
+        # The archived page decides the edition; every later step reads the same snapshot
+        scraper.replay = scraper.archive.resolve(args.replay, args.url)
+        args.url = scraper.archive.metadata(scraper.replay)['url']
+    
+    # Each edition (sih2024, sih2025, ...) has its own results partition and watermark
+    edition = edition_from_url(args.url)
+    results_path = edition_path(RESULTS_FILE, edition)
     
-    print(f"🚀 Starting SIH scraper for: {args.url}")
+    print(f"🚀 Starting SIH scraper for: {args.url} (edition {edition}, results in {results_path})")
+    print(f"🧩 HTML parser: {scraper.parser.name}")
     
     # Show current state
     if args.incremental:
-        last_id = scraper.get_last_scraped_id()
+        last_id = scraper.get_last_scraped_id(edition)
         if last_id != '0':
             print(f"📋 Last scraped PS ID: {last_id}")
         else:
@@ -816,16 +976,16 @@ def main():
     
     # Generate submission counts temp file and exit if requested
     if args.gen_submission_counts:
-        scraper.write_submission_counts_for_results('results.json', args.url, 'submission_counts.tmp.json')
+        scraper.write_submission_counts_for_results(results_path, args.url, 'submission_counts.tmp.json')
         return
 
     # Normalize ps_id values in results.json and exit if requested
     if args.normalize_psids:
-        scraper.normalize_ps_ids_in_results('results.json', prefix='SIH')
+        scraper.normalize_ps_ids_in_results(results_path, prefix='SIH')
         return
 
     if args.merge_submission_counts:
-        scraper.merge_submission_counts_into_results('results.json', args.url)
+        scraper.merge_submission_counts_into_results(results_path, args.url)
         return
 
     # Scrape problems
@@ -853,8 +1013,7 @@ def main():
         scraper.save_to_csv(problems, 'sih_problems.csv', merge_existing=args.merge)
         
         # Save statistics
-        with open('scraping_stats.json', 'w') as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False)
+        atomic_write_json('scraping_stats.json', stats)
         
         # Print sample problem
         if problems:
@@ -870,16 +1029,15 @@ def main():
         try:
             server_data = []
             if args.server_json and os.path.exists(args.server_json):
-                with open(args.server_json, 'r', encoding='utf-8') as f:
-                    server_data = json.load(f)
+                server_data = read_server_json(args.server_json)
             final_records = scraper.merge_scraped_and_server(problems, server_data)
-            scraper.save_results_json(final_records, 'results.json')
-            print(f"📦 results.json updated with {len(final_records)} merged records")
+            scraper.save_results_json(final_records, results_path)
+            print(f"📦 {results_path} updated with {len(final_records)} merged records")
         except Exception as e:
-            print(f"Warning: Failed to update results.json: {e}")
+            print(f"Warning: Failed to update {results_path}: {e}")
 
         # Show next run suggestion
-        state = scraper.load_scraper_state()
+        state = scraper.load_scraper_state().get('editions', {}).get(edition, {})
         if state.get('last_ps_id'):
             next_id = int(state['last_ps_id']) + 1
             print(f"\n💡 Next time, run: python scraper.py --start-id {next_id}")
@@ -915,6 +1073,19 @@ def scrape_incremental(url: str = "https://sih.gov.in/sih2025PS"):
         print("ℹ️  No new problems found since last run")
         return []
 
+def read_server_json(path: str):
+    """Server-generated records for merge_scraped_and_server: an NDJSON stream, or a JSON array decoded
+    straight into the final schema (a single record or a {'data': [...]} envelope is returned as parsed)."""
+    if is_ndjson(path):
+        return iter_records(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return decode_final_records(data)
+    except SchemaError:
+        return loads(data)
+
+
 def run_and_merge(server_json_path: str, url: str = "https://sih.gov.in/sih2025PS") -> List[Dict]:
     """Helper to run incremental scraping and merge with a server JSON into results.json."""
     scraper = SIHScraper()
@@ -922,13 +1093,13 @@ def run_and_merge(server_json_path: str, url: str = "https://sih.gov.in/sih2025P
     server_data = []
     if os.path.exists(server_json_path):
         try:
-            with open(server_json_path, 'r', encoding='utf-8') as f:
-                server_data = json.load(f)
+            server_data = read_server_json(server_json_path)
         except Exception as e:
             print(f"Warning: Could not read server JSON at {server_json_path}: {e}")
     final_records = scraper.merge_scraped_and_server(problems, server_data)
-    scraper.save_results_json(final_records, 'results.json')
-    print(f"📦 results.json updated with {len(final_records)} merged records")
+    results_path = edition_path(RESULTS_FILE, edition_from_url(url))
+    scraper.save_results_json(final_records, results_path)
+    print(f"📦 {results_path} updated with {len(final_records)} merged records")
     return final_records
 
 if __name__ == "__main__":
@@ -1,11 +1,11 @@
+import argparse
+import asyncio
 import requests
 import json
 import time
 import os
-import random
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import google.generativeai as genai
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Load environment variables from .env file
 try:
@@ -20,6 +20,47 @@ try:
 except ImportError:
     from scraper import SIHScraper  # if run directly from backend/
 
+try:
+    from .results_repository import ResultsRepository  # if run as a module
+except ImportError:
+    from results_repository import ResultsRepository  # if run directly from backend/
+
+try:
+    from .analytics_export import export_analytics  # if run as a module
+except ImportError:
+    from analytics_export import export_analytics  # if run directly from backend/
+
+try:
+    from .batch_prompting import pack_problems, parse_batch_response, strip_code_fences  # if run as a module
+    from .classification_cache import CLASSIFICATION_CACHE_DB, ClassificationCache
+    from .classification_engine import ClassificationEngine
+    from .model_pool import ModelPool
+except ImportError:
+    from batch_prompting import pack_problems, parse_batch_response, strip_code_fences  # if run directly from backend/
+    from classification_cache import CLASSIFICATION_CACHE_DB, ClassificationCache
+    from classification_engine import ClassificationEngine
+    from model_pool import ModelPool
+
+try:
+    from .rate_limiter import RateLimiter, estimate_tokens  # if run as a module
+except ImportError:
+    from rate_limiter import RateLimiter, estimate_tokens  # if run directly from backend/
+
+try:
+    from .results_writer import RESULTS_FILE  # if run as a module
+except ImportError:
+    from results_writer import RESULTS_FILE  # if run directly from backend/
+
+try:
+    from .tags import TAGS  # if run as a module
+except ImportError:
+    from tags import TAGS  # if run directly from backend/
+
+try:
+    from .editions import EDITION_URLS, DEFAULT_URL, edition_from_url, edition_path, fetch_editions  # if run as a module
+except ImportError:
+    from editions import EDITION_URLS, DEFAULT_URL, edition_from_url, edition_path, fetch_editions  # if run directly from backend/
+
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
@@ -33,6 +74,21 @@ MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
 BACKOFF_BASE = float(os.environ.get("LLM_BACKOFF_BASE", "2.0"))
 BACKOFF_INITIAL = float(os.environ.get("LLM_BACKOFF_INITIAL", "1.0"))
 JITTER_SEC = float(os.environ.get("LLM_JITTER_SEC", "0.3"))
+# Shared Gemini budget; every request, retries included, draws from it (defaults to BATCH_SIZE per BATCH_INTERVAL_SEC)
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM", str(BATCH_SIZE * 60 / BATCH_INTERVAL_SEC)))
+GEMINI_TPM = int(os.environ.get("GEMINI_TPM", "1000000"))  # 0 = no token limit
+# Classification requests in flight across the whole job, and the timeout of each
+LLM_WORKERS = int(os.environ.get("LLM_WORKERS", "10"))
+LLM_TIMEOUT_SEC = float(os.environ.get("LLM_TIMEOUT_SEC", "60"))
+# Problems per request (1 = one request each); groups are sized to the token budgets below
+LLM_BATCH_PROBLEMS = int(os.environ.get("LLM_BATCH_PROBLEMS", "8"))
+LLM_BATCH_INPUT_TOKENS = int(os.environ.get("LLM_BATCH_INPUT_TOKENS", "16000"))
+LLM_BATCH_OUTPUT_TOKENS = int(os.environ.get("LLM_BATCH_OUTPUT_TOKENS", "8192"))
+LLM_BATCH_OUTPUT_PER_PROBLEM = int(os.environ.get("LLM_BATCH_OUTPUT_PER_PROBLEM", "400"))
+# Worker processes for extracting problem modals from the listing page (1 = serial)
+SCRAPER_WORKERS = int(os.environ.get("SCRAPER_WORKERS", "1"))
+# Archive every downloaded listing page for offline replay (--replay)
+ARCHIVE_SNAPSHOTS = os.environ.get("ARCHIVE_SNAPSHOTS", "1") != "0"
 
 # Initialize Gemini
 if GEMINI_API_KEY:
@@ -40,66 +96,22 @@ if GEMINI_API_KEY:
 else:
     print("⚠️  Warning: GEMINI_API_KEY not set. Please set it in environment variables.")
 
-# -----------------------------
-# TAG SETUP (Fixed categories)
-# -----------------------------
-TAGS = {
-    "Difficulty": ["Easy", "Med", "Hard"],
-    "Technology": [
-        "Artificial Intelligence (AI)", "Machine Learning (ML)", "Deep Learning (DL)",
-        "Natural Language Processing (NLP)", "Computer Vision", "Robotics",
-        "IoT (Internet of Things)", "Blockchain", "Augmented Reality (AR)",
-        "Virtual Reality (VR)", "Frontend Dev", "Backend Dev", "Full Stack Development",
-        "Web Development", "Mobile App Development", "Game Dev", "Cloud Computing",
-        "Edge Computing", "Data Analytics", "Cybersecurity", "GIS / Remote Sensing",
-        "Embedded Systems"
-    ],
-    "Stakeholders": [
-        "Government Agencies", "NGOs", "Farmers", "Students / Teachers", "Doctors / Patients",
-        "Industry / Enterprises", "Local Communities", "Citizens", "Travelers",
-        "Law Enforcement", "Military / Defense"
-    ],
-    "Impact Area": [
-        "Cost Reduction", "Efficiency Improvement", "Accessibility", "Sustainability",
-        "Inclusivity", "Transparency", "Security", "Safety", "Awareness & Education",
-        "Productivity"
-    ],
-    "Data / Resource Type": [
-        "Open Data", "Sensor Data", "Image Data", "Video Data", "Text Data", "Audio Data",
-        "Social Media Data", "Satellite Data", "Geospatial Data", "Real-time Streaming"
-    ],
-    "Solution Type":[
-        "Mobile Solutions","Web Solutions","Mobile and Web Solutions"
-    ]
-}
+LIMITER = RateLimiter(GEMINI_RPM, GEMINI_TPM)
 
 # -----------------------------
 # PROMPT BUILDER
 # -----------------------------
-def build_prompt(problem: dict):
-    instructions = """
-You are an expert classifier. 
-Your task is to:
-1. Generate a short summary (2-3 sentences) of the problem statement.
-2. Assign tags to the problem under these fixed categories:
-
+TAG_CATEGORIES = """
 - Difficulty: Easy, Med, Hard
 - Technology: Choose one or more relevant items from the list provided.
 - Stakeholders: Choose one or more.
 - Impact Area: Choose one or more.
 - Data / Resource Type: Choose one or more.
 - Solution Type: Choose one or none.
-
-Rules:
-- Only choose tags from the provided lists.
-- Return the output strictly in JSON format.
-- If no tag is relevant in a category, return an empty list for that category (except Solution Type which must be one of the four).
-- The JSON must contain these keys: summary, difficulty, technology, stakeholders, impact_area, data_resource_type, solution_type.
-- Don't write any extra text. Only return the JSON.
-Now classify the following problem statement.
 """
 
-    problem_text = f"""
+def format_problem(problem: dict) -> str:
+    return f"""
 Problem ID: {problem.get("ps_id")}
 Title: {problem.get("title")}
 Description: {problem.get("description")}
@@ -109,132 +121,167 @@ Theme: {problem.get("theme")}
 Category: {problem.get("category")}
 """
 
+def build_prompt(problem: dict):
+    instructions = f"""
+You are an expert classifier. 
+Your task is to:
+1. Generate a short summary (2-3 sentences) of the problem statement.
+2. Assign tags to the problem under these fixed categories:
+{TAG_CATEGORIES}
+Rules:
+- Only choose tags from the provided lists.
+- Return the output strictly in JSON format.
+- If no tag is relevant in a category, return an empty list for that category (except Solution Type which must be one of the four).
+- The JSON must contain these keys: summary, difficulty, technology, stakeholders, impact_area, data_resource_type, solution_type.
+- Don't write any extra text. Only return the JSON.
+Now classify the following problem statement.
+"""
+
+    problem_text = format_problem(problem)
+
     return f"{instructions}\n{problem_text}\n\nValid Tags:\n{json.dumps(TAGS, indent=2)}\n\nOutput JSON:"
 
+def build_batch_prompt(problems: List[dict]) -> str:
+    """One prompt for several problems; the instructions and tag lists are sent once for all of them"""
+    instructions = f"""
+You are an expert classifier. 
+Your task is to classify each of the {len(problems)} problem statements below:
+1. Generate a short summary (2-3 sentences) of the problem statement.
+2. Assign tags to the problem under these fixed categories:
+{TAG_CATEGORIES}
+Rules:
+- Only choose tags from the provided lists.
+- Return the output strictly as a JSON array with exactly one object per problem statement.
+- Each object must contain "ps_id" (the Problem ID, copied exactly) and these keys: summary, difficulty, technology, stakeholders, impact_area, data_resource_type, solution_type.
+- If no tag is relevant in a category, return an empty list for that category (except Solution Type which must be one of the four).
+- Classify every problem independently of the others.
+- Don't write any extra text. Only return the JSON array.
+Now classify the following problem statements.
+"""
+
+    problems_text = "\n".join(format_problem(problem) for problem in problems)
+
+    return f"{instructions}\n{problems_text}\n\nValid Tags:\n{json.dumps(TAGS, indent=2)}\n\nOutput JSON array:"
+
 # -----------------------------
 # CALL GEMINI API
 # -----------------------------
-def classify_problem(problem: dict, model: str = MODEL):
-    """Classify a single problem using Gemini API"""
+GENERATION_CONFIG = dict(temperature=0.2, max_output_tokens=1024)
+BATCH_GENERATION_CONFIG = dict(GENERATION_CONFIG, max_output_tokens=LLM_BATCH_OUTPUT_TOKENS)
+
+def new_model(model: str, **generation_config):
+    return genai.GenerativeModel(model, generation_config=genai.types.GenerationConfig(**generation_config))
+
+# Model handles (with their generation config) are built once per process and shared by all requests;
+# they all use genai's default client, so its connections are reused
+MODELS = ModelPool(new_model)
+
+# Every classification job in the process (one per edition) runs on this event loop: genai caches its
+# async gRPC client, and MODELS keeps handles holding it, bound to the loop they were first used on
+CLASSIFICATION_LOOP = asyncio.new_event_loop()
+
+def parse_classification(problem: dict, response):
+    """Classification JSON from a Gemini response, with the problem's ps_id attached (None if empty)"""
+    if not response.text:
+        print(f"Empty response from Gemini for problem {problem.get('ps_id')}")
+        return None
+        
+    # Some models wrap in code fences → extract clean JSON
+    output_text = strip_code_fences(response.text)
+
+    output_json = json.loads(output_text)
+    
+    # Attach ps_id for easy mapping
+    output_json["ps_id"] = problem.get("ps_id")
+    return output_json
+
+async def classify_problem_async(problem: dict, model: str = MODEL):
+    """Classify a single problem with the async Gemini client (the timeout covers the request, not the rate limit wait)"""
     try:
-        model_instance = genai.GenerativeModel(model)
+        model_instance = MODELS.get(model, **GENERATION_CONFIG)
         prompt = build_prompt(problem)
         
-        response = model_instance.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.2,
-                max_output_tokens=1024,
-            )
-        )
-        
-        if not response.text:
-            print(f"Empty response from Gemini for problem {problem.get('ps_id')}")
-            return None
-            
-        output_text = response.text.strip()
-        
-        # Some models wrap in code fences → extract clean JSON
-        if "```" in output_text:
-            if "```json" in output_text:
-                output_text = output_text.split("```json")[-1].split("```")[0].strip()
-            else:
-                output_text = output_text.split("```")[-2].strip()
-
-        output_json = json.loads(output_text)
-        
-        # Attach ps_id for easy mapping
-        output_json["ps_id"] = problem.get("ps_id")
-        return output_json
+        await LIMITER.acquire_async(estimate_tokens(prompt))
+        response = await asyncio.wait_for(model_instance.generate_content_async(prompt), timeout=LLM_TIMEOUT_SEC)
+        return parse_classification(problem, response)
 
+    except asyncio.TimeoutError:
+        print(f"⏱️  Gemini did not answer within {LLM_TIMEOUT_SEC:g}s for problem {problem.get('ps_id')}")
+        return None
     except Exception as e:
         print(f"Error classifying problem {problem.get('ps_id')}: {e}")
         return None
 
-def classify_batch(problems: List[dict], model: str = MODEL) -> List[dict]:
-    """Classify a batch of problems concurrently using Gemini API"""
-    results = []
-    
-    def classify_single(problem):
-        return classify_problem(problem, model)
-    
-    # Use ThreadPoolExecutor for concurrent requests within the batch
-    with ThreadPoolExecutor(max_workers=min(10, len(problems))) as executor:
-        future_to_problem = {executor.submit(classify_single, problem): problem for problem in problems}
+async def classify_batch_async(problems: List[dict], model: str = MODEL) -> Tuple[List[Dict], List[Dict]]:
+    """Classify several problems in one request; returns (classifications, problems to retry one by one)"""
+    try:
+        model_instance = MODELS.get(model, **BATCH_GENERATION_CONFIG)
+        prompt = build_batch_prompt(problems)
         
-        for future in as_completed(future_to_problem):
-            problem = future_to_problem[future]
-            try:
-                result = future.result()
-                if result is not None:
-                    results.append(result)
-                else:
-                    print(f"⚠️  Failed to classify problem {problem.get('ps_id')}")
-            except Exception as e:
-                print(f"⚠️  Exception classifying problem {problem.get('ps_id')}: {e}")
-    
-    return results
+        await LIMITER.acquire_async(estimate_tokens(prompt))
+        response = await asyncio.wait_for(model_instance.generate_content_async(prompt), timeout=LLM_TIMEOUT_SEC)
+        results, missing = parse_batch_response(response.text, problems)
+        if missing:
+            print(f"✂️  {len(missing)}/{len(problems)} problems missing or invalid in the batched answer; retrying them one by one")
+        return results, missing
+
+    except asyncio.TimeoutError:
+        print(f"⏱️  Gemini did not answer within {LLM_TIMEOUT_SEC:g}s for a batch of {len(problems)} problems")
+    except Exception as e:
+        print(f"Error classifying a batch of {len(problems)} problems: {e}")
+    return [], list(problems)
+
+def pack_prompt_batches(problems: List[Dict]) -> List[List[Dict]]:
+    """Group problems into requests that fit the batched prompt's token budgets (LLM_BATCH_* settings)"""
+    return pack_problems(
+        problems,
+        item_tokens=lambda problem: estimate_tokens(format_problem(problem)),
+        overhead_tokens=estimate_tokens(build_batch_prompt([])),
+        input_budget=LLM_BATCH_INPUT_TOKENS,
+        output_per_item=LLM_BATCH_OUTPUT_PER_PROBLEM,
+        output_budget=LLM_BATCH_OUTPUT_TOKENS,
+        max_items=LLM_BATCH_PROBLEMS,
+    )
 
 # -----------------------------
-# Batch processing and retry helpers
+# Job-wide async classification
 # -----------------------------
-def classify_with_retries(problem: Dict, model: str = MODEL, max_retries: int = MAX_RETRIES) -> Dict:
-    """Classify a single problem with retries (fallback for individual problems)"""
-    for attempt in range(max(1, int(max_retries))):
-        result = classify_problem(problem, model=model)
-        if result is not None:
-            return result
-        # Backoff before retrying
-        sleep_time = BACKOFF_INITIAL * (BACKOFF_BASE ** attempt) + random.uniform(0, JITTER_SEC)
-        sleep_time = min(sleep_time, 30.0)
-        print(f"⏳ Retry {attempt + 1}/{max_retries} after {sleep_time:.2f}s due to previous error")
-        time.sleep(sleep_time)
-    return None
-
-def classify_batch_with_retries(problems: List[Dict], model: str = MODEL, max_retries: int = MAX_RETRIES) -> List[Dict]:
-    """Classify a batch of problems with retries"""
-    for attempt in range(max(1, int(max_retries))):
-        results = classify_batch(problems, model=model)
-        if len(results) >= len(problems) * 0.8:  # Success if at least 80% classified
-            return results
-        
-        # Retry failed problems
-        classified_ids = {r.get("ps_id") for r in results}
-        failed_problems = [p for p in problems if p.get("ps_id") not in classified_ids]
-        
-        if not failed_problems:
-            return results
-            
-        sleep_time = BACKOFF_INITIAL * (BACKOFF_BASE ** attempt) + random.uniform(0, JITTER_SEC)
-        sleep_time = min(sleep_time, 30.0)
-        print(f"⏳ Batch retry {attempt + 1}/{max_retries} after {sleep_time:.2f}s for {len(failed_problems)} failed problems")
-        time.sleep(sleep_time)
-        problems = failed_problems  # Only retry the failed ones
-    
-    return results if 'results' in locals() else []
-
 def process_problems_in_batches(problems: List[Dict], model: str = MODEL) -> List[Dict]:
-    """Process problems in batches respecting Gemini rate limits"""
-    all_results = []
-    total_batches = (len(problems) + BATCH_SIZE - 1) // BATCH_SIZE
-    
-    for i in range(0, len(problems), BATCH_SIZE):
-        batch_num = (i // BATCH_SIZE) + 1
-        batch = problems[i:i + BATCH_SIZE]
-        
-        print(f"🔄 Processing batch {batch_num}/{total_batches} ({len(batch)} problems)...")
-        
-        batch_results = classify_batch_with_retries(batch, model=model)
-        all_results.extend(batch_results)
-        
-        print(f"✅ Batch {batch_num} completed: {len(batch_results)}/{len(batch)} problems classified successfully")
-        
-        # Wait between batches (except for the last batch)
-        if i + BATCH_SIZE < len(problems):
-            print(f"⏳ Waiting {BATCH_INTERVAL_SEC} seconds before next batch...")
-            time.sleep(BATCH_INTERVAL_SEC)
-    
-    return all_results
+    """Classify all problems with at most LLM_WORKERS requests in flight, paced by the shared rate limiter.
+
+    With LLM_BATCH_PROBLEMS > 1 several problems share each request; problems
+    the batched answer leaves out or gets wrong are retried one by one.
+    Problems already in the classification cache (same prompt fields, model
+    and tag vocabulary) are answered from it without a request, and new
+    classifications are added to it.
+    Ctrl-C cancels the outstanding requests; the classifications that already finished are returned.
+    """
+    cache = ClassificationCache(CLASSIFICATION_CACHE_DB, model=model, tags=TAGS) if CLASSIFICATION_CACHE_DB else None
+    cached: List[Dict] = []
+    if cache is not None:
+        cached, problems = cache.lookup(problems)
+        print(f"🗄️  Classification cache: {cache.hits} hits, {cache.misses} misses")
+        if not problems:
+            cache.close()
+            return cached
+    engine = ClassificationEngine(
+        lambda problem: classify_problem_async(problem, model=model),
+        classify_batch=lambda batch: classify_batch_async(batch, model=model),
+        concurrency=LLM_WORKERS,
+        max_retries=MAX_RETRIES,
+        backoff_initial=BACKOFF_INITIAL,
+        backoff_base=BACKOFF_BASE,
+        jitter=JITTER_SEC,
+        progress_every=BATCH_SIZE,
+    )
+    batches = pack_prompt_batches(problems) if LLM_BATCH_PROBLEMS > 1 else None
+    if batches:
+        print(f"📦 {len(problems)} problems packed into {len(batches)} requests (up to {LLM_BATCH_PROBLEMS} per request)")
+    classifications = engine.run_sync(problems, batches=batches, loop=CLASSIFICATION_LOOP)
+    if cache is not None:
+        cache.store(problems, classifications)
+        cache.close()
+    return cached + classifications
 
 # -----------------------------
 # ORCHESTRATION: Run scraper, classify, and write results.json
@@ -259,27 +306,40 @@ def build_final_record_from_classification(problem: Dict, tags: Dict) -> Dict:
         "submission_count": problem.get("submission_count", 0),
     }
 
-def run_pipeline(url: str = "https://sih.gov.in/sih2025PS") -> List[Dict]:
-    """Complete pipeline: Scrape new problems, classify them, and save to results.json."""
+def run_pipeline(url: str = DEFAULT_URL, snapshot=None, scraper: SIHScraper = None) -> List[Dict]:
+    """Complete pipeline: Scrape new problems, classify them, and save to the edition's results file."""
     
-    print("🚀 Starting SIH Problem Classification Pipeline")
+    # Every edition keeps its own results file (results.json for the primary edition)
+    results_path = edition_path(RESULTS_FILE, edition_from_url(url))
+    print(f"🚀 Starting SIH Problem Classification Pipeline ({url})")
     print("=" * 60)
     
-    # Step 1: Scrape new problems
-    scraper = SIHScraper()
+    # Step 1: Fetch and parse the listing page once, then scrape new problems from it
+    scraper = scraper or SIHScraper(workers=SCRAPER_WORKERS, archive=ARCHIVE_SNAPSHOTS)
     print("🔎 Scraping new problems from SIH website...")
-    problems = scraper.scrape_sih_problems(url, incremental=True)
+    if snapshot is None:
+        try:
+            snapshot = scraper.fetch_listing(url)
+        except requests.RequestException as e:
+            print(f"❌ Error fetching {url}: {e}")
+            return []
+    problems = scraper.scrape_sih_problems(url, incremental=True, snapshot=snapshot)
     
     if not problems:
+        # Same snapshot, no extra download: still refresh submission counts of known problems
+        if scraper.merge_submission_counts_into_results(results_path, url, snapshot=snapshot):
+            # Refreshed counts are rewritten in the analytics dataset too
+            export_analytics(ResultsRepository.for_path(results_path).stream(), edition_from_url(url))
+        # results.json is the shipped file (copied to the frontend): fold in any pending journal
+        ResultsRepository.for_path(results_path).flush(compact=True)
         print("ℹ️  No new problems found. All up to date!")
         return []
 
     print(f"📋 Found {len(problems)} new problems to classify")
-    print(f"📊 Batch configuration: {BATCH_SIZE} problems per batch, {BATCH_INTERVAL_SEC}s between batches")
+    print(f"📊 Rate limit: {GEMINI_RPM:g} requests/min, {GEMINI_TPM} tokens/min, {LLM_WORKERS} concurrent requests")
     
-    # Estimate total time
-    estimated_batches = (len(problems) + BATCH_SIZE - 1) // BATCH_SIZE
-    estimated_time = (estimated_batches - 1) * BATCH_INTERVAL_SEC / 60  # in minutes
+    # Estimate total time (requests are spaced evenly at GEMINI_RPM)
+    estimated_time = (len(problems) - 1) / GEMINI_RPM  # in minutes
     print(f"⏱️  Estimated completion time: ~{estimated_time:.1f} minutes")
     print("=" * 60)
     
@@ -306,35 +366,36 @@ def run_pipeline(url: str = "https://sih.gov.in/sih2025PS") -> List[Dict]:
     print(f"🏁 Classification completed in {elapsed_time:.2f} minutes")
     print(f"📈 Success rate: {len(server_records)}/{len(problems)} ({len(server_records)/len(problems)*100:.1f}%)")
 
-    # Step 4: Merge with existing results.json
-    print("💾 Saving to results.json...")
+    # Step 4: Merge with existing results file
+    print(f"💾 Saving to {results_path}...")
     try:
-        # Load existing results if present
-        existing_results = []
-        if os.path.exists('results.json'):
-            with open('results.json', 'r', encoding='utf-8') as f:
-                existing_results = json.load(f)
-                if not isinstance(existing_results, list):
-                    existing_results = []
+        # Loaded once for the whole run (the incremental scrape already read it)
+        repository = ResultsRepository.for_path(results_path)
+        existing_count = len(repository)
         
-        # Create a map by ps_id for merging
-        existing_by_id = {r.get('ps_id'): r for r in existing_results if isinstance(r, dict) and r.get('ps_id')}
+        # Refresh submission counts of existing problems from the same listing snapshot (one row each)
+        refreshed = 0
+        counts_map = snapshot.row_submission_counts
+        for ps_id, num, current in repository.submission_counts():
+            if num is not None and str(num) in counts_map and current != counts_map[str(num)]:
+                refreshed += repository.set_submission_count(ps_id, counts_map[str(num)])
         
         # Add new records (they will overwrite if ps_id already exists)
         for record in server_records:
-            ps_id = record.get('ps_id')
-            if ps_id:
-                existing_by_id[ps_id] = record
-        
-        # Convert back to list and save
-        final_results = list(existing_by_id.values())
+            if record.get('ps_id'):
+                repository.upsert(record)
         
-        with open('results.json', 'w', encoding='utf-8') as f:
-            json.dump(final_results, f, indent=2, ensure_ascii=False)
+        # One write per run; results.json stays the exported artifact, so no journal is left behind
+        repository.flush(compact=True)
+        final_results = repository.all()
         
-        print(f"✅ Successfully saved {len(final_results)} total problems to results.json")
+        print(f"✅ Successfully saved {len(final_results)} total problems to {results_path}")
         print(f"   📊 {len(server_records)} new problems added")
-        print(f"   📊 {len(existing_results)} existing problems")
+        print(f"   📊 {existing_count} existing problems")
+        print(f"   📊 {refreshed} submission counts refreshed")
+        
+        # Step 5: Columnar copy for analytics (new problems appended, changed ones rewritten)
+        export_analytics(final_results, edition_from_url(url))
         
         return final_results
         
@@ -343,8 +404,39 @@ def run_pipeline(url: str = "https://sih.gov.in/sih2025PS") -> List[Dict]:
         return server_records
 
 
+def run_all_editions(urls: List[str] = EDITION_URLS) -> Dict[str, List[Dict]]:
+    """Run the pipeline for several SIH editions.
+
+    Listing pages are downloaded concurrently; classification then runs one
+    edition at a time since all editions share the same Gemini rate limit.
+    """
+    scraper = SIHScraper(workers=SCRAPER_WORKERS, archive=ARCHIVE_SNAPSHOTS)
+    snapshots = fetch_editions(scraper, urls)
+    results = {}
+    for url in urls:
+        if url in snapshots:
+            results[url] = run_pipeline(url, snapshot=snapshots[url], scraper=scraper)
+    return results
+
+
+def run_replay(snapshot_spec: str, url: str = DEFAULT_URL) -> List[Dict]:
+    """Run the pipeline on an archived listing snapshot instead of the live site.
+
+    Only the listing page is replayed; new problems are still classified with Gemini.
+    """
+    scraper = SIHScraper(workers=SCRAPER_WORKERS, replay=snapshot_spec)
+    scraper.replay = scraper.archive.resolve(snapshot_spec, url)
+    snapshot = scraper.fetch_listing(url)
+    return run_pipeline(snapshot.url, snapshot=snapshot, scraper=scraper)
+
+
 def main():
     """Main function to run the complete pipeline."""
+    parser = argparse.ArgumentParser(description='Scrape, classify and save SIH problem statements')
+    parser.add_argument('--replay', type=str, metavar='SNAPSHOT',
+                        help="Use an archived listing snapshot (path or 'latest') instead of downloading the page")
+    args = parser.parse_args()
+    
     # Check if API key is set
     if not GEMINI_API_KEY:
         print("❌ Error: GEMINI_API_KEY environment variable not set!")
@@ -353,7 +445,17 @@ def main():
         return
     
     try:
-        results = run_pipeline()
+        if args.replay:
+            results = run_replay(args.replay, EDITION_URLS[0] if EDITION_URLS else DEFAULT_URL)
+            print(f"\n📊 Replay finished: {len(results)} problems")
+            return
+        
+        if len(EDITION_URLS) > 1:
+            for url, results in run_all_editions(EDITION_URLS).items():
+                print(f"📊 {edition_from_url(url)}: {len(results)} problems")
+            return
+        
+        results = run_pipeline(EDITION_URLS[0] if EDITION_URLS else DEFAULT_URL)
         if results:
             print(f"\n🎉 Pipeline completed successfully!")
             print(f"📊 Total problems in results.json: {len(results)}")
@@ -0,0 +1,121 @@
+import glob
+import gzip
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from .editions import edition_from_url  # if run as a module
+    from .json_codec import dumps, read_json
+    from .page_cache import CachedPage
+    from .results_writer import atomic_write_bytes
+except ImportError:
+    from editions import edition_from_url  # if run directly from backend/
+    from json_codec import dumps, read_json
+    from page_cache import CachedPage
+    from results_writer import atomic_write_bytes
+
+# Where downloaded listing pages are archived for offline replay
+SNAPSHOT_ARCHIVE_DIR = os.environ.get("SNAPSHOT_ARCHIVE_DIR", "snapshots")
+
+
+class SnapshotArchive:
+    """
+    Compressed, timestamped copies of every downloaded listing page.
+
+    Each snapshot is stored as <edition>_<YYYYmmdd_HHMMSS>.html.zst (or .html.gz
+    when the zstandard package is not installed) next to a small .json file
+    with its URL, fetch time and SHA-256. A page identical to the edition's
+    latest snapshot is not archived again. Archived pages can be replayed
+    through the scrapers with --replay, without any network access.
+    """
+
+    def __init__(self, archive_dir: str = SNAPSHOT_ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+
+    def snapshots(self, edition: Optional[str] = None) -> List[str]:
+        """Metadata files of the archived snapshots (oldest first), optionally for one edition."""
+        pattern = f"{edition}_*.json" if edition else "*.json"
+        return sorted(glob.glob(os.path.join(self.archive_dir, pattern)))
+
+    def latest(self, edition: str) -> Optional[str]:
+        snapshots = self.snapshots(edition)
+        return snapshots[-1] if snapshots else None
+
+    def save(self, url: str, content: bytes, fetched_at: Optional[float] = None) -> Optional[str]:
+        """Archive a downloaded page; returns the metadata path, or None if it was already archived."""
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        edition = edition_from_url(url)
+        sha256 = hashlib.sha256(content).hexdigest()
+        try:
+            latest = self.latest(edition)
+            if latest and self._read_meta(latest).get('sha256') == sha256:
+                return None
+
+            os.makedirs(self.archive_dir, exist_ok=True)
+            base = os.path.join(self.archive_dir, f"{edition}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(fetched_at))}")
+            if zstandard is not None:
+                codec, data = 'zstd', zstandard.ZstdCompressor(level=10).compress(content)
+                body_path = f"{base}.html.zst"
+            else:
+                codec, data = 'gzip', gzip.compress(content, compresslevel=9)
+                body_path = f"{base}.html.gz"
+            atomic_write_bytes(body_path, data)
+            atomic_write_bytes(f"{base}.json", dumps({
+                'url': url,
+                'fetched_at': fetched_at,
+                'sha256': sha256,
+                'size': len(content),
+                'codec': codec,
+                'file': os.path.basename(body_path),
+            }))
+            print(f"🗄️  Archived listing snapshot: {body_path} ({len(data) / 1024:.0f} KB, {codec})")
+            return f"{base}.json"
+        except Exception as e:
+            print(f"Warning: Failed to archive snapshot of {url}: {e}")
+            return None
+
+    def _read_meta(self, meta_path: str) -> Dict:
+        return read_json(meta_path)
+
+    def metadata(self, spec: str, url: Optional[str] = None) -> Dict:
+        """URL, fetch time and checksum of an archived snapshot, without decompressing it."""
+        return self._read_meta(self.resolve(spec, url))
+
+    def resolve(self, spec: str, url: Optional[str] = None) -> str:
+        """Metadata path for a --replay argument: 'latest', a snapshot's .json or its compressed page."""
+        if spec == 'latest':
+            edition = edition_from_url(url) if url else None
+            snapshots = self.snapshots(edition)
+            if not snapshots:
+                raise FileNotFoundError(f"No archived snapshots in {self.archive_dir}" + (f" for {edition}" if edition else ""))
+            return snapshots[-1]
+        for suffix in ('.html.zst', '.html.gz'):
+            if spec.endswith(suffix):
+                return spec[:-len(suffix)] + '.json'
+        return spec
+
+    def load(self, spec: str, url: Optional[str] = None) -> CachedPage:
+        """Read an archived page back; the result carries the original URL and fetch time."""
+        meta_path = self.resolve(spec, url)
+        meta = self._read_meta(meta_path)
+        with open(os.path.join(os.path.dirname(meta_path), meta['file']), 'rb') as f:
+            data = f.read()
+        if meta.get('codec') == 'zstd':
+            if zstandard is None:
+                raise RuntimeError(f"{meta['file']} is zstd-compressed; install zstandard to replay it")
+            content = zstandard.ZstdDecompressor().decompress(data, max_output_size=meta.get('size') or 0)
+        else:
+            content = gzip.decompress(data)
+        page = CachedPage(meta['url'], content, meta.get('fetched_at', 0), 'replayed')
+        if meta.get('sha256') and page.sha256 != meta['sha256']:
+            raise ValueError(f"Snapshot {meta['file']} is corrupt (SHA-256 mismatch)")
+        print(f"⏪ Replaying snapshot {meta['file']} of {page.url} "
+              f"(fetched {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(page.fetched_at))})")
+        return page
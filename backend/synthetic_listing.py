@@ -0,0 +1,111 @@
+import argparse
+import html
+import json
+import os
+import random
+from typing import Dict, Iterator, List, Optional
+
+# Listing table columns, in the order the live page renders them (the last one holds the modal)
+LISTING_HEADERS = ['S.No.', 'Organization', 'Problem Statement Title', 'Category', 'PS Code',
+                   'Submitted Idea(s) Count', 'Theme', 'View']
+
+_WORDS = ('system platform data citizens farmers monitoring real-time portal mobile dashboard '
+          'analytics village district health water energy waste traffic students rural digital '
+          'secure transparent automated detection prediction network sensor satellite').split()
+
+
+def _fallback_corpus(rng: random.Random, size: int = 50) -> List[Dict]:
+    """Made-up records for when no results.json is available to borrow realistic text from."""
+    def sentence(n):
+        return ' '.join(rng.choice(_WORDS) for _ in range(n)).capitalize() + '.'
+    return [{
+        'title': sentence(8)[:-1],
+        'description': '\n\n'.join(' '.join(sentence(14) for _ in range(4)) for _ in range(3)),
+        'organization': f"Ministry of {sentence(2)[:-1]}",
+        'department': f"Department of {sentence(2)[:-1]}",
+        'category': rng.choice(['Software', 'Hardware']),
+        'theme': rng.choice(['Smart Automation', 'MedTech / BioTech / HealthTech', 'Agriculture, FoodTech & Rural Development']),
+    } for _ in range(size)]
+
+
+def load_corpus(path: Optional[str], rng: random.Random) -> List[Dict]:
+    """Problem records whose text is reused for the synthetic modals."""
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            records = [r for r in json.load(f) if isinstance(r, dict) and r.get('title')]
+        if records:
+            return records
+    return _fallback_corpus(rng)
+
+
+def _description_html(text: str, rng: random.Random) -> str:
+    """Description with the line-break markup variations seen on the live site."""
+    escaped = html.escape(text, quote=False)
+    br = rng.choice(['<br>', '<br/>', '<br />'])
+    return escaped.replace('\n\n', br + br).replace('\n', br)
+
+
+def problem_row(index: int, ps_num: int, record: Dict, submissions: int, rng: random.Random) -> str:
+    """One listing row; its ViewProblemStatement modal is nested in the trailing View cell."""
+    esc = lambda value: html.escape(str(value or ''))
+    modal_id = f"ViewProblemStatement{index}"
+    modal = f'''<div class="modal fade" id="{modal_id}" tabindex="-1" role="dialog"><div class="modal-dialog modal-lg"><div class="modal-content">
+<div class="modal-header"><h4 class="modal-title">Problem Statement</h4></div><div class="modal-body">
+<table id="settings" class="table table-bordered">
+<tr><th>Problem Statement ID</th><td><div class="style-2">{ps_num}</div></td></tr>
+<tr><th>Problem Statement Title</th><td><div class="style-2">{esc(record.get('title'))}</div></td></tr>
+<tr><th>Description</th><td><div class="style-2">{_description_html(str(record.get('description') or ''), rng)}</div></td></tr>
+<tr><th>Organization</th><td>{esc(record.get('organization'))}</td></tr>
+<tr><th>Department</th><td>{esc(record.get('department'))}</td></tr>
+<tr><th>Category</th><td>{esc(record.get('category'))}</td></tr>
+<tr><th>Theme</th><td>{esc(record.get('theme'))}</td></tr>
+<tr><th>Youtube Link</th><td><a href="https://youtu.be/sih{ps_num}" target="_blank">Link</a></td></tr>
+<tr><th>Dataset Link</th><td><a href="https://sih.gov.in/dataset/{ps_num}" target="_blank">Link</a></td></tr>
+<tr><th>Contact info</th><td><a href="mailto:ps{ps_num}@gov.in">ps{ps_num}@gov.in</a></td></tr>
+</table></div><div class="modal-footer"><button type="button" class="btn btn-default" data-dismiss="modal">Close</button></div></div></div></div>'''
+    return (f'<tr><td>{index}</td><td>{esc(record.get("organization"))}</td>'
+            f'<td><a href="#" data-toggle="modal" data-target="#{modal_id}">{esc(record.get("title"))}</a></td>'
+            f'<td>{esc(record.get("category"))}</td><td>SIH{ps_num}</td><td>{submissions}</td><td>{esc(record.get("theme"))}</td>'
+            f'<td><button type="button" class="btn btn-info" data-toggle="modal" data-target="#{modal_id}">View</button>{modal}</td></tr>')
+
+
+def generate_listing(n: int, corpus: List[Dict], seed: int = 0, first_ps_id: int = 25001) -> Iterator[str]:
+    """Yield the listing page in chunks so 100k-problem pages never sit in memory as one string."""
+    rng = random.Random(seed)
+    head = ''.join(f'<th>{h}</th>' for h in LISTING_HEADERS)
+    yield ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Smart India Hackathon 2025</title>'
+           '<script>var rowTemplate = "<tr><td></td></tr>";</script></head><body>'
+           '<nav class="navbar"><ul><li><a href="/">Home</a></li><li><a href="/sih2025PS">Problem Statements</a></li></ul></nav>'
+           f'<div class="container"><table id="dataTablePS" class="table table-striped"><thead><tr>{head}</tr></thead><tbody>\n')
+    for i in range(n):
+        # Submission counts are skewed: most problems get a few ideas, a handful get hundreds
+        submissions = min(int(rng.paretovariate(1.2)) - 1, 999)
+        yield problem_row(i + 1, first_ps_id + i, corpus[i % len(corpus)], submissions, rng) + '\n'
+    yield '</tbody></table></div><footer class="footer"><p>Ministry of Education</p></footer></body></html>'
+
+
+def write_listing(path: str, n: int, corpus: List[Dict], seed: int = 0) -> int:
+    """Write a synthetic listing page with n problems; returns its size in bytes."""
+    size = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in generate_listing(n, corpus, seed=seed):
+            size += len(chunk.encode('utf-8'))
+            f.write(chunk)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic SIH listing page with N problem statements')
+    parser.add_argument('count', type=int, help='Number of problems (e.g. 1000, 10000, 100000)')
+    parser.add_argument('output', help='HTML file to write')
+    parser.add_argument('--corpus', type=str, default='results.json', help='Records whose text is reused (made-up text if missing)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same page)')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, random.Random(args.seed))
+    size = write_listing(args.output, args.count, corpus, seed=args.seed)
+    print(f"💾 Wrote {args.count} problems ({size / (1024 * 1024):.1f} MB) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
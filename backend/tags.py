@@ -0,0 +1,171 @@
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .results_repository import ResultsRepository  # if run as a module
+except ImportError:
+    from results_repository import ResultsRepository  # if run directly from backend/
+
+# Fixed tag vocabulary the classifier chooses from (sent to Gemini with every prompt)
+TAGS = {
+    "Difficulty": ["Easy", "Med", "Hard"],
+    "Technology": [
+        "Artificial Intelligence (AI)", "Machine Learning (ML)", "Deep Learning (DL)",
+        "Natural Language Processing (NLP)", "Computer Vision", "Robotics",
+        "IoT (Internet of Things)", "Blockchain", "Augmented Reality (AR)",
+        "Virtual Reality (VR)", "Frontend Dev", "Backend Dev", "Full Stack Development",
+        "Web Development", "Mobile App Development", "Game Dev", "Cloud Computing",
+        "Edge Computing", "Data Analytics", "Cybersecurity", "GIS / Remote Sensing",
+        "Embedded Systems"
+    ],
+    "Stakeholders": [
+        "Government Agencies", "NGOs", "Farmers", "Students / Teachers", "Doctors / Patients",
+        "Industry / Enterprises", "Local Communities", "Citizens", "Travelers",
+        "Law Enforcement", "Military / Defense"
+    ],
+    "Impact Area": [
+        "Cost Reduction", "Efficiency Improvement", "Accessibility", "Sustainability",
+        "Inclusivity", "Transparency", "Security", "Safety", "Awareness & Education",
+        "Productivity"
+    ],
+    "Data / Resource Type": [
+        "Open Data", "Sensor Data", "Image Data", "Video Data", "Text Data", "Audio Data",
+        "Social Media Data", "Satellite Data", "Geospatial Data", "Real-time Streaming"
+    ],
+    "Solution Type":[
+        "Mobile Solutions","Web Solutions","Mobile and Web Solutions"
+    ]
+}
+
+# Record field that holds each TAGS category (Difficulty and Solution Type are single values)
+TAG_CATEGORY_FIELDS = {
+    "Difficulty": "difficulty",
+    "Technology": "technology",
+    "Stakeholders": "stakeholders",
+    "Impact Area": "impact_area",
+    "Data / Resource Type": "data_resource_type",
+    "Solution Type": "solution_type",
+}
+
+
+class TagCodec:
+    """
+    Bit positions for the TAGS vocabulary.
+
+    Every (category, tag) pair gets one bit, so all the tags of a record fit
+    in a single int and tag queries become bitwise ops. Values outside the
+    vocabulary are ignored when encoding.
+    """
+
+    def __init__(self, tags: Dict[str, List[str]] = TAGS):
+        # bit position -> (category, tag)
+        self.tags: List[Tuple[str, str]] = [(category, tag) for category, names in tags.items() for tag in names]
+        self._bits: Dict[Tuple[str, str], int] = {pair: 1 << i for i, pair in enumerate(self.tags)}
+        self._by_name: Dict[str, int] = {}
+        for (category, tag), bit in self._bits.items():
+            # A name used in two categories matches either
+            self._by_name[tag] = self._by_name.get(tag, 0) | bit
+        self.category_masks: Dict[str, int] = {
+            category: sum(self._bits[(category, tag)] for tag in names) for category, names in tags.items()}
+
+    def bit(self, tag: str, category: Optional[str] = None) -> int:
+        try:
+            return self._bits[(category, tag)] if category else self._by_name[tag]
+        except KeyError:
+            raise KeyError(f"Unknown tag: {tag}" + (f" in {category}" if category else "")) from None
+
+    def mask(self, tags: Iterable[str]) -> int:
+        """OR of the bits of the given tag names."""
+        mask = 0
+        for tag in tags:
+            mask |= self.bit(tag)
+        return mask
+
+    def encode(self, record: Dict) -> int:
+        """All TAGS values of a final-schema record as one bitmask."""
+        mask = 0
+        for category, field in TAG_CATEGORY_FIELDS.items():
+            values = record.get(field)
+            for value in (values if isinstance(values, (list, tuple)) else [values]):
+                mask |= self._bits.get((category, value), 0)
+        return mask
+
+    def decode(self, mask: int) -> Dict[str, List[str]]:
+        """Tag names set in a mask, by record field."""
+        decoded: Dict[str, List[str]] = {field: [] for field in TAG_CATEGORY_FIELDS.values()}
+        for position in _set_bits(mask):
+            category, tag = self.tags[position]
+            decoded[TAG_CATEGORY_FIELDS[category]].append(tag)
+        return decoded
+
+
+def _set_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class TagIndex:
+    """
+    Tag bitmasks of a list of records, for filtering and facet counts.
+
+    A query has all_tags (the record must have every one) and any_tags (the
+    record must have at least one, like the frontend's filterByTags); either
+    may be empty.
+    """
+
+    def __init__(self, records: Iterable[Dict], codec: Optional[TagCodec] = None):
+        self.codec = codec or TagCodec()
+        self.records = list(records)
+        self.masks = [self.codec.encode(r) for r in self.records]
+
+    def _matching(self, all_tags: Iterable[str], any_tags: Iterable[str]) -> Iterator[int]:
+        """Indexes of matching records."""
+        all_mask, any_mask = self.codec.mask(all_tags), self.codec.mask(any_tags)
+        for i, mask in enumerate(self.masks):
+            if mask & all_mask == all_mask and (not any_mask or mask & any_mask):
+                yield i
+
+    def filter(self, all_tags: Iterable[str] = (), any_tags: Iterable[str] = ()) -> List[Dict]:
+        return [self.records[i] for i in self._matching(all_tags, any_tags)]
+
+    def count(self, all_tags: Iterable[str] = (), any_tags: Iterable[str] = ()) -> int:
+        return sum(1 for _ in self._matching(all_tags, any_tags))
+
+    def facet_counts(self, all_tags: Iterable[str] = (), any_tags: Iterable[str] = ()) -> Dict[str, Dict[str, int]]:
+        """Matching records per tag, by category, counted in one pass over the matches."""
+        per_bit = [0] * len(self.codec.tags)
+        for i in self._matching(all_tags, any_tags):
+            for position in _set_bits(self.masks[i]):
+                per_bit[position] += 1
+        counts: Dict[str, Dict[str, int]] = {category: {} for category in TAG_CATEGORY_FIELDS}
+        for (category, tag), n in zip(self.codec.tags, per_bit):
+            counts.setdefault(category, {})[tag] = n
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Filter results.json by tags and show per-tag counts')
+    parser.add_argument('results_file', nargs='?', default='results.json')
+    parser.add_argument('--all', dest='all_tags', action='append', default=[], metavar='TAG', help='Required tag (repeatable)')
+    parser.add_argument('--any', dest='any_tags', action='append', default=[], metavar='TAG', help='At least one of these tags (repeatable)')
+    args = parser.parse_args()
+
+    index = TagIndex(ResultsRepository.for_path(args.results_file).all())
+    try:
+        facets = index.facet_counts(args.all_tags, args.any_tags)
+        matches = index.count(args.all_tags, args.any_tags)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return
+    print(f"🔎 {matches} of {len(index.records)} problems match")
+    for category, counts in facets.items():
+        print(f"\n{category}")
+        for tag, n in sorted(counts.items(), key=lambda item: -item[1]):
+            if n:
+                print(f"   {n:>5}  {tag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,37 @@
 import requests
-from bs4 import BeautifulSoup
-import json
 import re
-import time
 import os
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import argparse
 
+try:
+    from .html_parsers import get_parser_backend  # if run as a module
+    from .snapshot_archive import SNAPSHOT_ARCHIVE_DIR, SnapshotArchive
+    from .results_repository import ResultsRepository
+    from .results_writer import RESULTS_FILE
+    from .backup_store import BackupStore
+except ImportError:
+    from html_parsers import get_parser_backend  # if run directly from backend/
+    from snapshot_archive import SNAPSHOT_ARCHIVE_DIR, SnapshotArchive
+    from results_repository import ResultsRepository
+    from results_writer import RESULTS_FILE
+    from backup_store import BackupStore
+
 class SubmissionUpdater:
     """
     Class to update submission counts in results.json by scraping from SIH website
     """
     
-    def __init__(self):
+    def __init__(self, parser: Optional[str] = None, archive: bool = True, replay: Optional[str] = None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # HTML parser backend shared with SIHScraper (selectolax, lxml or html.parser)
+        self.parser = get_parser_backend(parser)
+        # Downloaded listing pages are archived; replay reads one back instead of the live site
+        self.archive = SnapshotArchive(SNAPSHOT_ARCHIVE_DIR) if archive or replay else None
+        self.replay = replay
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -66,17 +81,25 @@ class SubmissionUpdater:
         except ValueError:
             return 0
     
-    def scrape_submission_counts(self, url: str = "https://sih.gov.in/sih2025PS") -> Dict[str, int]:
+    def scrape_submission_counts(self, url: str = "https://sih.gov.in/sih2025PS", snapshot=None) -> Dict[str, int]:
         """
         Scrape submission counts from the SIH website listing page
         Returns a dictionary mapping PS ID to submission count
+        A ListingSnapshot already fetched by SIHScraper can be passed to reuse its parsed page.
         """
         try:
-            print(f"🌐 Fetching submission counts from: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if snapshot is not None:
+                print(f"📄 Reading submission counts from shared snapshot of: {snapshot.url}")
+                soup = snapshot.document
+            elif self.replay:
+                soup = self.parser.parse(self.archive.load(self.replay, url).content)
+            else:
+                print(f"🌐 Fetching submission counts from: {url}")
+                response = self.session.get(url, timeout=30)
+                response.raise_for_status()
+                if self.archive is not None:
+                    self.archive.save(url, response.content)
+                soup = self.parser.parse(response.content)
             submission_counts = {}
             
             # Method 1: Try to find table headers and use them to identify columns
@@ -210,18 +233,14 @@ class SubmissionUpdater:
             return {}
     
     def load_results_json(self, file_path: str = "results.json") -> List[Dict]:
-        """Load the results.json file"""
+        """Load the results.json file (read once per process; see ResultsRepository)"""
         try:
-            if not os.path.exists(file_path):
+            repository = ResultsRepository.for_path(file_path)
+            if not repository.exists():
                 print(f"❌ Results file not found: {file_path}")
                 return []
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                print(f"❌ Results file is not a list: {file_path}")
-                return []
+            data = repository.all()
             
             print(f"📂 Loaded {len(data)} records from {file_path}")
             return data
@@ -230,12 +249,37 @@ class SubmissionUpdater:
             print(f"❌ Error loading results file: {e}")
             return []
     
-    def save_results_json(self, data: List[Dict], file_path: str = "results.json") -> bool:
-        """Save the updated data back to results.json"""
+    def iter_results_json(self, file_path: str = RESULTS_FILE) -> Iterator[Dict]:
+        """Stream the records of a results file (JSON or NDJSON) without loading them all"""
+        return ResultsRepository.for_path(file_path).stream()
+    
+    def save_results_json(self, data: Iterable[Dict], file_path: str = "results.json") -> bool:
+        """Save the updated data back to results.json (only records that changed are written to the store)"""
+        try:
+            repository = ResultsRepository.for_path(file_path)
+            for record in data:
+                if isinstance(record, dict):
+                    repository.upsert(record)
+            changed = repository.flush()
+            
+            print(f"🗃️  {changed} changed records written to the problem store")
+            print(f"💾 Successfully saved updated data to {file_path}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error saving results file: {e}")
+            return False
+    
+    def save_submission_counts(self, records: Iterable[Dict], file_path: str = RESULTS_FILE) -> bool:
+        """Write only the submission counts of the given records (one small journal entry each)"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            repository = ResultsRepository.for_path(file_path)
+            for record in records:
+                if isinstance(record, dict) and record.get('ps_id'):
+                    repository.set_submission_count(record['ps_id'], record.get('submission_count', 0))
+            changed = repository.flush()
             
+            print(f"🗃️  {changed} changed records written to the problem store")
             print(f"💾 Successfully saved updated data to {file_path}")
             return True
             
@@ -245,16 +289,19 @@ class SubmissionUpdater:
     
     def update_submission_counts(self, 
                                submission_counts: Dict[str, int], 
-                               results_data: List[Dict],
-                               force_update: bool = False) -> tuple[int, int]:
+                               results_data: Iterable[Dict],
+                               force_update: bool = False,
+                               updated: Optional[List[Dict]] = None) -> tuple[int, int]:
         """
-        Update submission counts in results data
+        Update submission counts in results data (a list or a stream of records)
+        Updated records are also appended to `updated` if given
         Returns (updated_count, total_count)
         """
         updated_count = 0
-        total_count = len(results_data)
+        total_count = 0
         
         for record in results_data:
+            total_count += 1
             if not isinstance(record, dict):
                 continue
             
@@ -276,6 +323,8 @@ class SubmissionUpdater:
                 if force_update or current_count != new_count:
                     record['submission_count'] = new_count
                     updated_count += 1
+                    if updated is not None:
+                        updated.append(record)
                     
                     status_emoji = "🔄" if current_count != new_count else "✓"
                     print(f"   {status_emoji} PS {ps_id}: {current_count} → {new_count}")
@@ -287,20 +336,21 @@ class SubmissionUpdater:
         return updated_count, total_count
     
     def create_backup(self, file_path: str = "results.json") -> str:
-        """Create a backup of the results file before updating"""
+        """Back up the results file before updating (deduplicated; see backup_store.py)
+        Returns the backup's content hash
+        """
         try:
-            if not os.path.exists(file_path):
+            repository = ResultsRepository.for_path(file_path)
+            if not repository.exists():
                 return ""
+            # Backed up from the records this run loads anyway, so the file is not read twice
+            entry = BackupStore().create(repository.all(), source=os.path.basename(file_path))
             
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{file_path}.backup_{timestamp}"
-            
-            with open(file_path, 'r', encoding='utf-8') as src:
-                with open(backup_path, 'w', encoding='utf-8') as dst:
-                    dst.write(src.read())
-            
-            print(f"💾 Created backup: {backup_path}")
-            return backup_path
+            if entry['kind'] == 'unchanged':
+                print(f"💾 Backup {entry['sha256'][:12]} already holds this version of {file_path}")
+            else:
+                print(f"💾 Created backup {entry['sha256'][:12]} ({entry['kind']}, {entry['stored_bytes'] / 1024:.1f} KB)")
+            return entry['sha256']
             
         except Exception as e:
             print(f"⚠️  Warning: Could not create backup: {e}")
@@ -308,10 +358,11 @@ class SubmissionUpdater:
     
     def run_update(self, 
                    url: str = "https://sih.gov.in/sih2025PS",
-                   results_file: str = "results.json",
+                   results_file: str = RESULTS_FILE,
                    create_backup: bool = True,
                    force_update: bool = False,
-                   dry_run: bool = False) -> bool:
+                   dry_run: bool = False,
+                   snapshot=None) -> bool:
         """
         Main method to run the submission count update process
         """
@@ -322,13 +373,12 @@ class SubmissionUpdater:
         if create_backup and not dry_run:
             self.create_backup(results_file)
         
-        # Load current results
-        results_data = self.load_results_json(results_file)
-        if not results_data:
+        if not ResultsRepository.for_path(results_file).exists():
+            print(f"❌ Results file not found: {results_file}")
             return False
         
         # Scrape submission counts from website
-        submission_counts = self.scrape_submission_counts(url)
+        submission_counts = self.scrape_submission_counts(url, snapshot=snapshot)
         if not submission_counts:
             print("❌ No submission counts found. Update aborted.")
             return False
@@ -336,9 +386,10 @@ class SubmissionUpdater:
         print(f"\n📊 Updating submission counts...")
         print("-" * 40)
         
-        # Update the data
+        # Update the data as it streams past; only the updated records are kept
+        updated_records: List[Dict] = []
         updated_count, total_count = self.update_submission_counts(
-            submission_counts, results_data, force_update
+            submission_counts, self.iter_results_json(results_file), force_update, updated=updated_records
         )
         
         print("-" * 40)
@@ -346,7 +397,7 @@ class SubmissionUpdater:
         
         # Save updated data (unless dry run)
         if not dry_run:
-            if self.save_results_json(results_data, results_file):
+            if self.save_submission_counts(updated_records, results_file):
                 print("✅ Submission count update completed successfully!")
                 return True
             else:
@@ -356,13 +407,13 @@ class SubmissionUpdater:
             print("🔍 Dry run completed - no files were modified")
             return True
     
-    def generate_report(self, results_file: str = "results.json") -> None:
-        """Generate a summary report of submission counts"""
-        results_data = self.load_results_json(results_file)
-        if not results_data:
+    def generate_report(self, results_file: str = RESULTS_FILE) -> None:
+        """Generate a summary report of submission counts (streams the results file)"""
+        if not ResultsRepository.for_path(results_file).exists():
+            print(f"❌ Results file not found: {results_file}")
             return
         
-        total_problems = len(results_data)
+        total_problems = 0
         problems_with_submissions = 0
         total_submissions = 0
         max_submissions = 0
@@ -370,10 +421,11 @@ class SubmissionUpdater:
         
         submission_distribution = {}
         
-        for record in results_data:
+        for record in self.iter_results_json(results_file):
             if not isinstance(record, dict):
                 continue
             
+            total_problems += 1
             submission_count = record.get('submission_count', 0)
             ps_id = record.get('ps_id', 'Unknown')
             
@@ -399,6 +451,9 @@ class SubmissionUpdater:
             
             submission_distribution[range_key] = submission_distribution.get(range_key, 0) + 1
         
+        if not total_problems:
+            return
+        
         print("\n" + "=" * 60)
         print("📊 SUBMISSION COUNTS REPORT")
         print("=" * 60)
@@ -427,8 +482,8 @@ def main():
     
     parser.add_argument('--url', type=str, default='https://sih.gov.in/sih2025PS',
                        help='SIH website URL to scrape from')
-    parser.add_argument('--results-file', type=str, default='results.json',
-                       help='Path to results.json file to update')
+    parser.add_argument('--results-file', type=str, default=RESULTS_FILE,
+                       help='Path to results.json (or results.ndjson) file to update')
     parser.add_argument('--no-backup', action='store_true',
                        help='Skip creating backup before update')
     parser.add_argument('--force', action='store_true',
@@ -437,10 +492,16 @@ def main():
                        help='Show what would be updated without making changes')
     parser.add_argument('--report', action='store_true',
                        help='Generate summary report of submission counts')
+    parser.add_argument('--parser', type=str, default=None,
+                       help='HTML parser backend: selectolax, lxml, html.parser or auto (default)')
+    parser.add_argument('--no-archive', action='store_true',
+                       help='Do not archive the downloaded listing page to SNAPSHOT_ARCHIVE_DIR')
+    parser.add_argument('--replay', type=str, metavar='SNAPSHOT',
+                       help="Read submission counts offline from an archived listing snapshot (path or 'latest')")
     
     args = parser.parse_args()
     
-    updater = SubmissionUpdater()
+    updater = SubmissionUpdater(parser=args.parser, archive=not args.no_archive, replay=args.replay)
     
     if args.report:
         updater.generate_report(args.results_file)